@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark for the bookkeeping of BaseGraphModule.batch_request.
+
+Graph is replaced by an in-memory $batch endpoint that throttles every tenth
+sub-request once, the time per sub-request should stay flat as the number of
+sub-requests grows.
+
+Run from the repository root: python benchmarks/bench_batch_bookkeeping.py
+"""
+
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.IntuneCD.intunecdlib.BaseGraphModule import BaseGraphModule  # noqa: E402
+
+
+class FakeGraph:
+    """In-memory $batch endpoint, throttles every tenth sub-request once."""
+
+    def __init__(self):
+        self.throttled = set()
+
+    def __call__(self, endpoint, method="GET", data=None, **kwargs):
+        responses = []
+        for req in json.loads(data)["requests"]:
+            if req["id"] % 10 == 0 and req["id"] not in self.throttled:
+                self.throttled.add(req["id"])
+                responses.append({"id": str(req["id"]), "status": 429, "headers": {}})
+            else:
+                responses.append(
+                    {"id": str(req["id"]), "status": 200, "headers": {}, "body": {}}
+                )
+        return {"responses": responses}
+
+
+def run(count: int) -> float:
+    module = BaseGraphModule()
+    module.token = {"access_token": "token"}
+    ids = [str(i) for i in range(count)]
+    with patch.object(module, "make_graph_request", side_effect=FakeGraph()), patch(
+        "src.IntuneCD.intunecdlib.BaseGraphModule.get_governor"
+    ):
+        start = time.perf_counter()
+        responses = module.batch_request(ids, "objects/", "/assignments")
+        elapsed = time.perf_counter() - start
+    assert len(responses) == count
+    return elapsed
+
+
+def main():
+    print(f"{'sub-requests':>12} {'seconds':>10} {'us/request':>12}")
+    for count in (1000, 5000, 10000, 25000, 50000):
+        elapsed = run(count)
+        print(f"{count:>12} {elapsed:>10.3f} {elapsed / count * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark of the native diff engine against DeepDiff.
+
+Compares Settings Catalog and device configuration policies with edited copies
+the way update modules compare the repository to Intune, and checks that both
+engines produce the same change records.
+
+Run from the repository root: python benchmarks/bench_diff_engine.py
+"""
+
+import copy
+import os
+import sys
+import time
+
+from deepdiff import DeepDiff
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.IntuneCD.intunecdlib.BaseUpdateModule import BaseUpdateModule  # noqa: E402
+from src.IntuneCD.intunecdlib.diff_engine import native_diff  # noqa: E402
+
+
+def make_settings_catalog(count: int) -> dict:
+    return {
+        "name": "Policy",
+        "description": "",
+        "platforms": "windows10",
+        "technologies": "mdm",
+        "roleScopeTagIds": ["0"],
+        "settings": [
+            {
+                "id": str(i),
+                "settingInstance": {
+                    "@odata.type": "#microsoft.graph.deviceManagementConfigurationChoiceSettingInstance",
+                    "settingDefinitionId": f"setting_{i}",
+                    "settingInstanceTemplateReference": None,
+                    "choiceSettingValue": {
+                        "value": f"setting_{i}_1",
+                        "children": [
+                            {
+                                "@odata.type": "#microsoft.graph.deviceManagementConfigurationSimpleSettingInstance",
+                                "settingDefinitionId": f"setting_{i}_child",
+                                "simpleSettingValue": {
+                                    "@odata.type": "#microsoft.graph.deviceManagementConfigurationIntegerSettingValue",
+                                    "value": i,
+                                },
+                            }
+                        ]
+                        if i % 3 == 0
+                        else [],
+                    },
+                },
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def make_device_configuration(count: int) -> dict:
+    return {
+        "@odata.type": "#microsoft.graph.windows10CustomConfiguration",
+        "displayName": "Configuration",
+        "description": None,
+        "version": 1,
+        "omaSettings": [
+            {
+                "@odata.type": "#microsoft.graph.omaSettingInteger",
+                "displayName": f"Setting {i}",
+                "omaUri": f"./Device/Vendor/MSFT/Policy/Config/Area/Setting{i}",
+                "value": i,
+                "isReadOnly": False,
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def edit_settings_catalog(policy: dict) -> dict:
+    """Reorders the settings, changes, retypes, removes and adds settings"""
+    settings = policy["settings"]
+    settings.reverse()
+    settings[0]["settingInstance"]["choiceSettingValue"]["value"] = "changed"
+    settings[1]["settingInstance"]["settingInstanceTemplateReference"] = {"id": "1"}
+    settings[2]["settingInstance"]["choiceSettingValue"]["children"] = []
+    del settings[3]
+    settings.append({"id": "new", "settingInstance": {"settingDefinitionId": "new"}})
+    policy["description"] = "changed"
+    policy["roleScopeTagIds"] = ["0", "1"]
+    return policy
+
+
+def edit_device_configuration(policy: dict) -> dict:
+    """Reorders the settings, changes values and types of settings"""
+    settings = policy["omaSettings"]
+    settings.reverse()
+    settings[0]["value"] = "1"
+    settings[1]["value"] = -1
+    settings[2]["isReadOnly"] = True
+    settings[3] = "invalid"
+    policy["version"] = 2
+    return policy
+
+
+def get_records(module: BaseUpdateModule, diff) -> list:
+    return sorted(
+        str({k: v for k, v in record.items() if k != "change_date"})
+        for record in module._process_diffs(diff)
+    )
+
+
+def run(make, edit, count: int) -> tuple:
+    intune = make(count)
+    repo = edit(copy.deepcopy(intune))
+    module = BaseUpdateModule()
+    module.name = "Policy"
+    module.config_type = "Benchmark"
+    module.log = lambda **kwargs: None
+
+    start = time.perf_counter()
+    deep = DeepDiff(intune, repo, ignore_order=True)
+    deep_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    native = native_diff(intune, repo)
+    native_elapsed = time.perf_counter() - start
+
+    assert get_records(module, native) == get_records(module, deep)
+    return deep_elapsed, native_elapsed
+
+
+def main():
+    print(
+        f"{'policy':>22} {'settings':>8} {'deepdiff s':>12} {'native s':>10} {'speedup':>8}"
+    )
+    for make, edit in (
+        (make_settings_catalog, edit_settings_catalog),
+        (make_device_configuration, edit_device_configuration),
+    ):
+        name = make.__name__.replace("make_", "")
+        for count in (100, 500, 1000, 2500):
+            deep_elapsed, native_elapsed = run(make, edit, count)
+            print(
+                f"{name:>22} {count:>8} {deep_elapsed:>12.3f} {native_elapsed:>10.3f} "
+                f"{deep_elapsed / native_elapsed:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
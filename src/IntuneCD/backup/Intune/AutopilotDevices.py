@@ -27,28 +27,41 @@ class AutopilotDevicesBackupModule(BaseBackupModule):
         self.has_assignments = False
 
     def main(self) -> None:
-        """The main method to backup the Autopilot Devices"""
-        try:
-            self.graph_data = self.make_graph_request(
-                endpoint=self.endpoint + self.CONFIG_ENDPOINT
-            )
-        except Exception as e:
-            self.log(
-                tag="error",
-                msg=f"Error getting Autopilot Device data from {self.endpoint + self.CONFIG_ENDPOINT}: {e}",
-            )
-            return None
-
-        self.log(msg="Backing up Autopilot Devices")
-
-        try:
-            self.process_data(
-                data=self.graph_data["value"],
-                filetype=self.filetype,
-                path=self.path,
-                name_key="id",
-                log_message=None,
-            )
-        except Exception as e:
-            self.log(tag="error", msg=f"Error processing Autopilot Device data: {e}")
-            return None
+        """The main method to backup the Autopilot Devices
+
+        Tenants can have a large number of Autopilot Devices, the pages are
+        processed as they are received instead of collecting every page first.
+        """
+        pages = self.iter_graph_pages(endpoint=self.endpoint + self.CONFIG_ENDPOINT)
+        logged = False
+
+        while True:
+            try:
+                page = next(pages, None)
+            except Exception as e:
+                self.log(
+                    tag="error",
+                    msg=f"Error getting Autopilot Device data from {self.endpoint + self.CONFIG_ENDPOINT}: {e}",
+                )
+                return None
+
+            if page is None:
+                return None
+
+            if not logged:
+                self.log(msg="Backing up Autopilot Devices")
+                logged = True
+
+            try:
+                self.process_data(
+                    data=page["value"],
+                    filetype=self.filetype,
+                    path=self.path,
+                    name_key="id",
+                    log_message=None,
+                )
+            except Exception as e:
+                self.log(
+                    tag="error", msg=f"Error processing Autopilot Device data: {e}"
+                )
+                return None
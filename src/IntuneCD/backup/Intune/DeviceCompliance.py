@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 from ...intunecdlib.BaseBackupModule import BaseBackupModule
+from ...intunecdlib.directory_cache import get_directory_cache
+
+# Template ID of scheduled actions without a notification template
+NO_NOTIFICATION_TEMPLATE = "00000000-0000-0000-0000-000000000000"
 
 
 class DeviceComplianceBackupModule(BaseBackupModule):
@@ -91,29 +95,49 @@ class DeviceComplianceBackupModule(BaseBackupModule):
                 data = data[key]
         return data["simpleSettingValue"]["value"]
 
-    def _get_notification_template(self, rule: dict[str, any]) -> dict[str, any]:
-        """Gets the notification template for a rule
+    def _get_detection_scripts(self) -> dict[str, any]:
+        """Gets the reusable settings used as detection scripts
+
+        Returns:
+            dict[str, any]: The reusable settings keyed by ID
+        """
+        scripts = get_directory_cache().get_reusable_settings_by_name(self)
+        return {script["id"]: script for script in scripts.values()}
+
+    def _get_notification_template_ids(self, data: list) -> list:
+        """Gets the notification template IDs used by the scheduled actions of the policies
 
         Args:
-            rule (dict[str, any]): The rule to get the notification template for
+            data (list): The policies with their scheduled actions
 
         Returns:
-            dict[str, any]: The notification template
+            list: The distinct notification template IDs
+        """
+        template_ids = {}
+        for item in data:
+            for rule in item.get("scheduledActionsForRule", []):
+                for action in rule.get("scheduledActionConfigurations", []):
+                    template_id = action.get("notificationTemplateId")
+                    if template_id and template_id != NO_NOTIFICATION_TEMPLATE:
+                        template_ids[template_id] = None
+
+        return list(template_ids)
+
+    def _get_notification_template(
+        self, rule: dict[str, any], templates: dict[str, any]
+    ) -> None:
+        """Sets the notification template name of the scheduled actions of a rule
+
+        Args:
+            rule (dict[str, any]): The rule to set the notification template names for
+            templates (dict[str, any]): The notification templates keyed by ID
         """
         for action in rule["scheduledActionConfigurations"]:
-            if (
-                action.get("notificationTemplateId")
-                != "00000000-0000-0000-0000-000000000000"
-            ):
-                notification_template = self.make_graph_request(
-                    self.endpoint
-                    + "/beta/deviceManagement/notificationMessageTemplates/"
-                    + action["notificationTemplateId"]
-                )
-                if notification_template:
-                    action["notificationTemplateName"] = notification_template[
-                        "displayName"
-                    ]
+            notification_template = templates.get(action.get("notificationTemplateId"))
+            if notification_template:
+                action["notificationTemplateName"] = notification_template[
+                    "displayName"
+                ]
 
     def main(self) -> dict[str, any]:
         """The main method to backup the Device Compliance Policies
@@ -135,6 +159,14 @@ class DeviceComplianceBackupModule(BaseBackupModule):
             )
             return None
 
+        # Get the scheduled actions of all policies with batch requests
+        item_ids = [item["id"] for item in self.graph_data["value"]]
+        action_responses = self.batch_request_by_key(
+            item_ids,
+            "deviceManagement/compliancePolicies/",
+            "/scheduledActionsForRule?$expand=scheduledActionConfigurations",
+        )
+
         for item in self.graph_data["value"]:
             # Is the policy a Linux discovery script?
             if self._check_linux_discovery_script(item):
@@ -144,33 +176,38 @@ class DeviceComplianceBackupModule(BaseBackupModule):
                     detection_script_id = self._get_value_from_path(
                         item, detection_script_id_path
                     )
-                    # get the script name
-                    detection_script = self.make_graph_request(
-                        endpoint=self.endpoint
-                        + "/beta/deviceManagement/reusablePolicySettings/",
-                        params={"$filter": f"id eq '{detection_script_id}'"},
+                    # get the script name, the reusable settings are requested once per run
+                    detection_script = self._get_detection_scripts().get(
+                        detection_script_id
                     )
-                    if detection_script["value"]:
-                        item["detectionScriptName"] = detection_script["value"][0][
-                            "displayName"
-                        ]
+                    if detection_script:
+                        item["detectionScriptName"] = detection_script["displayName"]
                     else:
                         item["detectionScriptName"] = None
 
-            # get scheduledActionsForRule
-            scheduledActionsForRule = self.make_graph_request(
-                endpoint=f"{self.endpoint + self.CONFIG_ENDPOINT}/{item['id']}/scheduledActionsForRule",
-                params={"$expand": "scheduledActionConfigurations"},
+            scheduled_actions = action_responses.get(item["id"])
+            if scheduled_actions is None:
+                self.log(
+                    tag="warning",
+                    msg=f"Could not get the scheduled actions of Compliance Policy {item.get('name')}",
+                )
+                scheduled_actions = {}
+            item["scheduledActionsForRule"] = scheduled_actions.get("value", [])
+
+        # Notification templates are requested once per run and shared by all policies
+        template_ids = self._get_notification_template_ids(self.graph_data["value"])
+        templates = {}
+        if template_ids:
+            templates = get_directory_cache().get_notification_templates(
+                self, template_ids
             )
-            item["scheduledActionsForRule"] = scheduledActionsForRule["value"]
-
-            for action in item["scheduledActionsForRule"]:
-                self.remove_keys(action)
-                self._get_notification_template(action)
-            for config in item["scheduledActionsForRule"][0][
-                "scheduledActionConfigurations"
-            ]:
-                self.remove_keys(config)
+
+        for item in self.graph_data["value"]:
+            for rule in item["scheduledActionsForRule"]:
+                self.remove_keys(rule)
+                self._get_notification_template(rule, templates)
+                for config in rule["scheduledActionConfigurations"]:
+                    self.remove_keys(config)
 
         try:
             self.results = self.process_data(
@@ -51,6 +51,18 @@ class DeviceConfigurationBackupModule(BaseBackupModule):
         ]
         custom_windows_odata = ["#microsoft.graph.windows10CustomConfiguration"]
 
+        # Resolve the encrypted OMA settings of all custom Windows profiles at once
+        oma_values = {}
+        if not self.ignore_oma_settings:
+            oma_values = self.batch_oma_settings(
+                [
+                    item
+                    for item in self.graph_data["value"]
+                    if item["@odata.type"] in custom_windows_odata
+                ],
+                "deviceManagement/deviceConfigurations/",
+            )
+
         for item in self.graph_data["value"]:
             if item["@odata.type"] in custom_apple_odata:
                 decoded = self.decode_base64(item["payload"])
@@ -86,15 +98,19 @@ class DeviceConfigurationBackupModule(BaseBackupModule):
                             decoded_oma["omaUri"] = setting["omaUri"]
                             decoded_oma["isEncrypted"] = False
                             decoded_oma["secretReferenceValueId"] = None
-                            oma_value = self.make_graph_request(
-                                endpoint=self.endpoint
-                                + self.CONFIG_ENDPOINT
-                                + "/"
-                                + item["id"]
-                                + "/getOmaSettingPlainTextValue(secretReferenceValueId='"
-                                + setting["secretReferenceValueId"]
-                                + "')"
+                            oma_value = oma_values.get(
+                                setting["secretReferenceValueId"]
                             )
+                            if oma_value is None:
+                                oma_value = self.make_graph_request(
+                                    endpoint=self.endpoint
+                                    + self.CONFIG_ENDPOINT
+                                    + "/"
+                                    + item["id"]
+                                    + "/getOmaSettingPlainTextValue(secretReferenceValueId='"
+                                    + setting["secretReferenceValueId"]
+                                    + "')"
+                                )
                             decoded_oma["value"] = oma_value
                             omas.append(decoded_oma)
                         else:
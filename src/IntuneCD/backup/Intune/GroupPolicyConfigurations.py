@@ -7,10 +7,12 @@ class GroupPolicyConfigurationsBackupModule(BaseBackupModule):
 
     Attributes:
         CONFIG_ENDPOINT (str): The endpoint to get the data from
+        BATCH_ENDPOINT (str): The endpoint of the batch requests for definition and presentation values
         LOG_MESSAGE (str): The message to log when backing up the data
     """
 
     CONFIG_ENDPOINT = "/beta/deviceManagement/groupPolicyConfigurations"
+    BATCH_ENDPOINT = "deviceManagement/groupPolicyConfigurations/"
     LOG_MESSAGE = "Backing up Device Configuration: "
 
     def __init__(self, *args, **kwargs):
@@ -43,22 +45,55 @@ class GroupPolicyConfigurationsBackupModule(BaseBackupModule):
             )
             return None
 
-        for item in self.graph_data["value"]:
-            definition_endpoint = f"{self.endpoint}{self.CONFIG_ENDPOINT}/{item['id']}/definitionValues?$expand=definition"
-            # Get definitions
-            definitions = self.make_graph_request(endpoint=definition_endpoint)
+        # Get the definition values of all changed configurations, then the
+        # presentation values of all definition values, with batch requests
+        changed_items = self.get_changed_items(self.graph_data["value"])
+        item_ids = [item["id"] for item in changed_items]
+        definition_responses = self.batch_request_by_key(
+            item_ids, self.BATCH_ENDPOINT, "/definitionValues?$expand=definition"
+        )
 
-            if definitions:
-                item["definitionValues"] = definitions["value"]
-                for definition in item["definitionValues"]:
-                    presentation_endpoint = (
-                        f"{self.endpoint}{self.CONFIG_ENDPOINT}/{item['id']}/definitionValues/{definition['id']}/"
-                        f"presentationValues?$expand=presentation"
-                    )
-                    presentation = self.make_graph_request(
-                        endpoint=presentation_endpoint
-                    )
-                    definition["presentationValues"] = presentation["value"]
+        # Configurations missing values are not written, an incomplete backup
+        # would remove the missing values on the next update
+        failed = set()
+        definition_values = {}
+        for item in changed_items:
+            definitions = definition_responses.get(item["id"])
+            if definitions is None:
+                self.log(
+                    tag="error",
+                    msg=f"Could not get the definition values of Group Policy Configuration {item.get('displayName')}",
+                )
+                failed.add(item["id"])
+                continue
+            item["definitionValues"] = definitions.get("value", [])
+            for definition in item["definitionValues"]:
+                definition_values[
+                    f"{item['id']}/definitionValues/{definition['id']}"
+                ] = definition
+
+        presentation_responses = {}
+        if definition_values:
+            presentation_responses = self.batch_request_by_key(
+                list(definition_values),
+                self.BATCH_ENDPOINT,
+                "/presentationValues?$expand=presentation",
+            )
+        for key, definition in definition_values.items():
+            presentation = presentation_responses.get(key)
+            if presentation is None:
+                self.log(
+                    tag="error",
+                    msg=f"Could not get the presentation values of definition value {key}",
+                )
+                failed.add(key.split("/", 1)[0])
+                continue
+            definition["presentationValues"] = presentation.get("value", [])
+
+        if failed:
+            self.graph_data["value"] = [
+                item for item in self.graph_data["value"] if item["id"] not in failed
+            ]
 
         try:
             self.results = self.process_data(
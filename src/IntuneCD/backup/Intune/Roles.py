@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from ...intunecdlib.BaseBackupModule import BaseBackupModule
+from ...intunecdlib.directory_cache import get_directory_cache
 
 
 class RolesBackupModule(BaseBackupModule):
@@ -33,26 +34,16 @@ class RolesBackupModule(BaseBackupModule):
         Returns:
             list: The group names
         """
-        groups = []
-
-        for group in item:
-            try:
-                group_name = self.make_graph_request(
-                    endpoint=f"https://graph.microsoft.com/beta/groups/{group}",
-                    params={"$select": "displayName"},
-                )
-            except Exception as e:
-                self.log(
-                    tag="error",
-                    msg=f"Error getting group data from {self.endpoint + self.CONFIG_ENDPOINT}: {e}",
-                )
-                return None
-
-            if group_name:
-                group_name = group_name["displayName"]
-                groups.append(group_name)
+        try:
+            groups = get_directory_cache().get_groups(self, item)
+        except Exception as e:
+            self.log(
+                tag="error",
+                msg=f"Error getting group data from {self.endpoint + self.CONFIG_ENDPOINT}: {e}",
+            )
+            return None
 
-        return groups
+        return [groups[group]["displayName"] for group in item if group in groups]
 
     def main(self) -> dict[str, any]:
         """The main method to backup the Roles
@@ -55,9 +55,13 @@ class SettingsCatalogBackupModule(BaseBackupModule):
         # As we need to process each item individually, get the audit data up front
         if self.audit:
             self.audit_data = self.make_audit_request(self.audit_filter)
-        # Get the settings for each policy using batch request
+        # Get the settings for each changed policy using batch request
+        changed_items = self.get_changed_items(self.graph_data["value"])
+        changed_ids = [item["id"] for item in changed_items]
         policy_responses = self.batch_request(
-            item_ids, "deviceManagement/configurationPolicies/", "/settings?&top=1000"
+            changed_ids,
+            "deviceManagement/configurationPolicies/",
+            "/settings?&top=1000",
         )
 
         for item in self.graph_data["value"]:
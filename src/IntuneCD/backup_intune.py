@@ -44,8 +44,11 @@ def backup_intune(
     Imports all the backup functions dynamically and runs them in parallel.
     """
 
+    from .intunecdlib.directory_cache import reset_directory_cache
     from .intunecdlib.process_scope_tags import ProcessScopeTags
 
+    # Groups, filters and scope tags are shared by all modules of the run
+    reset_directory_cache()
     process_scope_tags = ProcessScopeTags(token)
 
     if "ScopeTags" not in exclude:
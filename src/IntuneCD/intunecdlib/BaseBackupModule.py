@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
+import os
 import re
 
+from .backup_state import get_backup_state
 from .BaseGraphModule import BaseGraphModule
+from .fingerprint import fingerprint
 from .process_audit_data import ProcessAuditData
 from .process_scope_tags import ProcessScopeTags
 
@@ -202,6 +205,92 @@ class BaseBackupModule(BaseGraphModule):
             ]
         )
 
+    def _get_state_fingerprint(self, assignments: list) -> str:
+        """Gets the fingerprint of the object data that does not move its watermark
+
+        Args:
+            assignments (list): The assignments of the object
+
+        Returns:
+            str: The fingerprint of the assignments and scope tags
+        """
+        return fingerprint({"assignments": assignments, "scopeTags": self.scope_tags})
+
+    def _get_unchanged_outputs(self, data: dict, path: str, assignments: list) -> list:
+        """Gets the outputs of an object that did not change since the previous backup
+
+        Args:
+            data (dict): The object returned by Graph
+            path (str): The path the backup files are saved to
+            assignments (list): The assignments of the object
+
+        Returns:
+            list: The outputs of the object, None when it has to be written
+        """
+        state = get_backup_state()
+        if state is None:
+            return None
+        outputs = state.get_outputs(
+            type(self).__name__, data, self._get_state_fingerprint(assignments)
+        )
+        if not outputs or not all(
+            os.path.exists(f"{path}{output}.{self.filetype}") for output in outputs
+        ):
+            return None
+
+        return outputs
+
+    def _get_assignments(self, data: dict, assignment_responses: dict) -> list:
+        """Gets the assignments of an object from the batched responses
+
+        Args:
+            data (dict): The object to get the assignments for
+            assignment_responses (dict): The responses to use for assignments
+
+        Returns:
+            list: The assignments of the object
+        """
+        if not assignment_responses:
+            return []
+
+        return self.get_object_assignment(data["id"], assignment_responses)
+
+    def get_changed_items(self, data: list) -> list:
+        """Gets the objects that changed since the previous incremental backup.
+
+        Used by modules with detail requests per object, so details are only
+        requested for changed objects. Assignments are requested for all objects
+        as they do not move the watermark.
+
+        Args:
+            data (list): The objects returned by Graph
+
+        Returns:
+            list: The objects that have to be written, all objects when the backup is not incremental
+        """
+        if get_backup_state() is None:
+            return data
+
+        if "assignments" not in self.exclude:
+            if (
+                getattr(self, "has_assignments", True) is not False
+                and self.assignment_responses is None
+            ):
+                self.assignment_responses = self.batch_assignment(
+                    data, self.assignment_endpoint, self.assignment_extra_url
+                )
+
+        return [
+            item
+            for item in data
+            if self._get_unchanged_outputs(
+                item,
+                self.path,
+                self._get_assignments(item, self.assignment_responses),
+            )
+            is None
+        ]
+
     def _process_single_item(
         self,
         data: dict,
@@ -241,6 +330,17 @@ class BaseBackupModule(BaseGraphModule):
             if not match:
                 return self.results
 
+        assignments = self._get_assignments(data, assignment_responses)
+        state = get_backup_state()
+        if state is not None:
+            outputs = self._get_unchanged_outputs(data, path, assignments)
+            if outputs is not None:
+                state.keep(type(self).__name__, data)
+                return {"config_count": 1, "outputs": outputs}
+            item_id = data.get("id")
+            watermark = state.get_watermark(data)
+            state_fingerprint = self._get_state_fingerprint(assignments)
+
         if log_message:
             self.log(msg=log_message + data[f"{name_key}"])
 
@@ -265,10 +365,8 @@ class BaseBackupModule(BaseGraphModule):
                 msg=f"Error appending id to filename for {self.filename}, {e}",
             )
 
-        if assignment_responses:
-            assignments = self.get_object_assignment(data["id"], assignment_responses)
-            if assignments:
-                data["assignments"] = assignments
+        if assignments:
+            data["assignments"] = assignments
 
         if hasattr(self, "scope_tags") and self.scope_tags:
             data = self.process_scope_tag.get_scope_tags_name(data, self.scope_tags)
@@ -278,6 +376,14 @@ class BaseBackupModule(BaseGraphModule):
             data = self.remove_keys(data)
 
         self.save_to_file(data, filetype, path, self.filename)
+        if state is not None:
+            state.record(
+                type(self).__name__,
+                item_id,
+                watermark,
+                state_fingerprint,
+                self.filename,
+            )
 
         if self.audit_data:
             self._get_audit_data(audit_compare_info, audit_data)
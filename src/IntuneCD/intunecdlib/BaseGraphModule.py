@@ -2,19 +2,33 @@
 import datetime
 import json
 import os
+import re
 import time
 import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from uuid import uuid4
 
 import requests
 from deepdiff import DeepDiff
 
+from .change_plan import get_change_plan
+from .directory_cache import get_directory_cache
+from .graph_session import get_session
 from .IntuneCDBase import IntuneCDBase
+from .throttle import get_governor
+
+NEXT_LINK_PREFIX = re.compile(r"^https://graph\.microsoft\.com/(beta|v1\.0)/")
+# Seconds to pause before retrying throttled sub-requests without a Retry-After header
+BATCH_RETRY_WAIT = 20
 
 
 class BaseGraphModule(IntuneCDBase):
     """Base class for the Graph API, used to make requests to the Microsoft Graph API."""
 
+    # Maximum number of $batch requests in flight per batch_request call
+    batch_window = 4
+
     def make_graph_request(
         self,
         endpoint: str,
@@ -25,6 +39,110 @@ class BaseGraphModule(IntuneCDBase):
     ) -> dict:
         """A function to make a request to the Microsoft Graph API."""
 
+        if (
+            method != "GET"
+            and self.report
+            and endpoint != "https://graph.microsoft.com/beta/$batch"
+        ):
+            return self._report_request(endpoint, params, method, status_code, data)
+
+        if method != "GET":
+            return self._graph_request(endpoint, params, method, status_code, data)
+
+        json_data = None
+        for page in self.iter_graph_pages(endpoint, params, status_code):
+            if json_data is None:
+                json_data = page
+            else:
+                json_data["value"].extend(page.get("value", []))
+
+        return json_data
+
+    def _report_request(
+        self,
+        endpoint: str,
+        params: dict = None,
+        method: str = "GET",
+        status_code: int = 200,
+        data: dict = None,
+    ) -> dict:
+        """Skips a write in report mode, the write is recorded when a change plan is written.
+
+        Args:
+            endpoint (str): The endpoint of the write
+            params (dict, optional): The query parameters to use. Defaults to None.
+            method (str, optional): The HTTP method to use. Defaults to "GET".
+            status_code (int, optional): The expected status code. Defaults to 200.
+            data (dict, optional): The data to send. Defaults to None.
+
+        Returns:
+            dict: The response of the recorded write, empty when no plan is written
+        """
+        self.log(
+            msg=f"Running in report mode, not making Graph {method.upper()} request to {endpoint}"
+        )
+        plan = get_change_plan()
+        if plan is None:
+            return {}
+
+        return plan.record(self, method, endpoint, params, data, status_code)
+
+    def iter_graph_pages(
+        self, endpoint: str, params: dict = None, status_code: int = 200
+    ):
+        """Iterate over the pages of a GET request, following @odata.nextLink one page at a time.
+
+        Args:
+            endpoint (str): The endpoint to make the request to
+            params (dict, optional): The query parameters to use. Defaults to None.
+            status_code (int, optional): The expected status code. Defaults to 200.
+
+        Yields:
+            dict: The response of each page, without the @odata.nextLink
+        """
+        while endpoint:
+            page = self._graph_request(endpoint, params, "GET", status_code)
+            endpoint = page.pop("@odata.nextLink", None)
+            # The next link already contains the query parameters
+            params = None
+            yield page
+
+    def iter_graph_items(
+        self, endpoint: str, params: dict = None, status_code: int = 200
+    ):
+        """Iterate over the items of a GET request, only one page is held in memory at a time.
+
+        Args:
+            endpoint (str): The endpoint to make the request to
+            params (dict, optional): The query parameters to use. Defaults to None.
+            status_code (int, optional): The expected status code. Defaults to 200.
+
+        Yields:
+            dict: Each item of the collection
+        """
+        for page in self.iter_graph_pages(endpoint, params, status_code):
+            yield from page.get("value", [])
+
+    def _graph_request(
+        self,
+        endpoint: str,
+        params: dict = None,
+        method: str = "GET",
+        status_code: int = 200,
+        data: dict = None,
+    ) -> dict:
+        """Make a single request to the Microsoft Graph API, retrying transient errors.
+
+        Args:
+            endpoint (str): The endpoint to make the request to
+            params (dict, optional): The query parameters to use. Defaults to None.
+            method (str, optional): The HTTP method to use. Defaults to "GET".
+            status_code (int, optional): The expected status code. Defaults to 200.
+            data (dict, optional): The data to send. Defaults to None.
+
+        Returns:
+            dict: The response of the request, paged responses are not followed
+        """
         retry_codes = [504, 502, 503, 429]
         max_retries = 5
         retry_count = 0
@@ -34,27 +152,19 @@ class BaseGraphModule(IntuneCDBase):
             "Authorization": f"Bearer {self.token['access_token']}",
         }
 
-        if (
-            method != "GET"
-            and self.report
-            and endpoint != "https://graph.microsoft.com/beta/$batch"
-        ):
-            self.log(
-                msg=f"Running in report mode, not making Graph {method.upper()} request to {endpoint}"
-            )
-            return {}
-
+        governor = get_governor()
         while retry_count < max_retries:
             response = None  # Ensure response is defined even on exception
             try:
-                response = requests.request(
-                    method=method,
-                    url=endpoint,
-                    headers=headers,
-                    params=params,
-                    timeout=120,
-                    data=data,
-                )
+                with governor.slot():
+                    response = get_session().request(
+                        method=method,
+                        url=endpoint,
+                        headers=headers,
+                        params=params,
+                        timeout=120,
+                        data=data,
+                    )
 
                 # Handle transient errors (5xx and 429)
                 if response.status_code in retry_codes:
@@ -75,7 +185,14 @@ class BaseGraphModule(IntuneCDBase):
                         self.log(
                             msg=f"Hit Graph throttling (429), retrying in {wait_time} seconds"
                         )
-                        time.sleep(wait_time)
+                        # Pause all threads, the next acquire waits for the pause to end
+                        governor.on_throttle(wait_time)
+
+                    elif response.status_code == 503:
+                        self.log(
+                            msg=f"Encountered {response.status_code}, retrying in {wait_time} seconds..."
+                        )
+                        governor.on_throttle(wait_time)
 
                     else:
                         self.log(
@@ -90,6 +207,7 @@ class BaseGraphModule(IntuneCDBase):
 
                 # Break on success or non-retryable status
                 if response.status_code == status_code:
+                    governor.on_success()
                     break
 
                 self.log(
@@ -115,16 +233,6 @@ class BaseGraphModule(IntuneCDBase):
                 f"Request failed after {max_retries} retries with {response.status_code if response else 'no response'} - {response.text if response else 'no response'}"
             )
 
-        # Handle JSON response
-        if method == "GET" and response.text:
-            json_data = json.loads(response.text)
-            if "@odata.nextLink" in json_data:
-                record = self.make_graph_request(
-                    method=method, endpoint=json_data["@odata.nextLink"]
-                )
-                json_data["value"].extend(record["value"])
-            return json_data
-
         return json.loads(response.text) if response.text else {}
 
     def make_audit_request(self, audit_filter: str):
@@ -219,44 +327,45 @@ class BaseGraphModule(IntuneCDBase):
 
     def handle_responses(
         self,
-        initial_request_data: list,
         request_data: list,
-        responses: list,
-        retry_pool: list,
-    ) -> tuple:
+        responses: dict,
+        failed: set,
+    ) -> int:
         """Handle the responses from the batch request.
 
         Args:
-            initial_request_data (list): List of initial requests
-            request_data (list): List of responses from the batch request
-            responses (list): List of responses from the batch request
-            retry_pool (list): List of failed requests
+            request_data (list): List of sub-responses from the batch request
+            responses (dict): Response bodies keyed by request id
+            failed (set): Ids of the requests that were throttled and should be retried
 
         Returns:
-            tuple: Tuple containing the responses, retry pool and wait time
+            int: The longest Retry-After of the throttled sub-responses, BATCH_RETRY_WAIT when they have none
         """
         wait_time = 0
+        throttled = False
         for resp in request_data:
-            failed_batch_requests = []
+            req_id = int(resp["id"])
             if resp["status"] == 200:
-                responses.append(resp["body"])
-                retry_pool = [req for req in retry_pool if req["id"] != int(resp["id"])]
+                responses[req_id] = resp["body"]
+                failed.discard(req_id)
             elif resp["status"] in [429, 503]:
-                if initial_request_data:
-                    failed_batch_requests = [
-                        i
-                        for i in initial_request_data
-                        if i["id"] == int(resp["id"]) and i not in retry_pool
-                    ]
-                retry_pool += failed_batch_requests
+                throttled = True
+                failed.add(req_id)
+            else:
+                failed.discard(req_id)
 
-            retry_after = resp["headers"].get("Retry-After")
+            retry_after = resp.get("headers", {}).get("Retry-After")
             wait_time = max(
                 wait_time,
                 int(retry_after) if retry_after and retry_after.isdigit() else 0,
             )
 
-        return responses, retry_pool, wait_time
+        if throttled:
+            # Pause all requests before the throttled sub-requests are sent again
+            wait_time = wait_time or BATCH_RETRY_WAIT
+            get_governor().on_throttle(wait_time)
+
+        return wait_time
 
     def create_batch_list(self, data: list, batch_count: int) -> list:
         """Create a list of batches from the data.
@@ -270,184 +379,184 @@ class BaseGraphModule(IntuneCDBase):
         """
         return [data[i : i + batch_count] for i in range(0, len(data), batch_count)]
 
-    def process_batch(
-        self,
-        batch: list,
-        batch_id: str,
-        method: str,
-        url: str,
-        extra_url: str,
-        initial_request_data: list,
-        responses: list,
-        retry_pool: list,
-    ) -> tuple:
-        """Process the batch request.
+    def process_batch(self, batch: list) -> list:
+        """Post a single $batch request.
 
         Args:
-            batch (list): List of objects
-            batch_id (str): ID for the batch request
-            method (str): HTTP method to use
-            url (str): MS graph endpoint for the object
-            extra_url (str): Used if anything extra is needed for the url such as /assignments or ?$filter
-            self.token (str): OAuth self.token used for authentication
-            initial_request_data (list): List of initial requests
-            responses (list): List of responses from the batch request
-            retry_pool (list): List of failed requests
+            batch (list): List of sub-requests to send
 
         Returns:
-            tuple: Tuple containing the batch ID, responses, retry pool and wait time
+            list: List of sub-responses sorted by id
         """
-        query_data, batch_id = self.create_batch_request(
-            batch, batch_id, method, url, extra_url
-        )
-        json_data = json.dumps(query_data)
         request = self.make_graph_request(
             method="POST",
             endpoint="https://graph.microsoft.com/beta/$batch",
-            data=json_data,
-        )
-        request_data = sorted(request["responses"], key=lambda item: item.get("id"))
-        initial_request_data += query_data["requests"]
-        responses, retry_pool, wait_time = self.handle_responses(
-            initial_request_data, request_data, responses, retry_pool
+            data=json.dumps({"requests": batch}),
         )
-        return batch_id, responses, retry_pool, wait_time
+        return sorted(request["responses"], key=lambda item: int(item.get("id")))
 
-    def retry_failed_requests(
-        self,
-        retry_pool: list,
-        wait_time: int,
-        max_retries: int,
-        max_wait_time: int,
-        initial_request_data: list,
-        responses: list,
-        batch_count: int,
-    ) -> tuple:
-        """Retry failed requests.
+    def _get_batch_url(self, next_link: str) -> str:
+        """Get the url relative to the Graph version, as used by sub-requests of a $batch request.
 
         Args:
-            retry_pool (list): List of failed requests
-            wait_time (int): Time to wait before retrying
-            max_retries (int): Maximum number of retries
-            max_wait_time (int): Maximum time to wait before retrying
-            self.token (str): OAuth self.token used for authentication
-            initial_request_data (list): List of initial requests
-            responses (list): List of responses from the batch request
-            batch_count (int): Number of objects to include in each batch
+            next_link (str): The absolute @odata.nextLink
 
         Returns:
-            list: List of responses from the batch request
+            str: The relative url
         """
-        retry_count = 0
-        failed_retry_requests = []
-        while retry_count < max_retries and retry_pool:
-            self.log(
-                function="retry_failed_requests",
-                msg=f"Retrying failed requests, retry pool count: {str(len(retry_pool))}",
-            )
-            if wait_time > 0:
-                self.log(
-                    function="retry_failed_requests",
-                    msg=f"Sleeping for {str(wait_time)} seconds...",
-                )
-                time.sleep(wait_time)
-                wait_time = min(wait_time * 2, max_wait_time)
-            else:
-                self.log(
-                    function="retry_failed_requests",
-                    msg="No wait time in headers, sleeping for 20 seconds...",
-                )
-                time.sleep(20)
-            batch_list = [
-                retry_pool[i : i + batch_count]
-                for i in range(0, len(retry_pool), batch_count)
-            ]
-            for batch in batch_list:
-                batch_data = {"requests": list(batch)}
-                json_data = json.dumps(batch_data)
-                request = self.make_graph_request(
-                    method="POST",
-                    endpoint="https://graph.microsoft.com/beta/$batch",
-                    data=json_data,
-                )
-                request_data = sorted(
-                    request["responses"], key=lambda item: item.get("id")
-                )
-                responses, retry_pool, _ = self.handle_responses(
-                    initial_request_data, request_data, responses, retry_pool
-                )
-                failed_retry_requests = [
-                    r for r in request["responses"] if r["status"] != 200
-                ]
-            retry_count += 1
-            self.log(
-                function="retry_failed_requests", msg=f"Retry count: {str(retry_count)}"
-            )
-            if retry_pool and retry_count == max_retries:
-                break
-        self.log(
-            function="retry_failed_requests",
-            msg=f"Failed requests after {str(retry_count)} retries: {str(len(failed_retry_requests))}",
-        )
-        return responses
+        return NEXT_LINK_PREFIX.sub("", next_link)
+
+    def _merge_page(self, req_id: int, responses: dict, page_of: dict) -> str:
+        """Merge a page into the response of the first page and get the link to the next page.
+
+        Args:
+            req_id (int): The id of the request
+            responses (dict): Response bodies keyed by request id
+            page_of (dict): Id of the first page keyed by the id of follow-up requests
+
+        Returns:
+            str: The @odata.nextLink of the page, None if it is the last page
+        """
+        body = responses.get(req_id)
+        if not isinstance(body, dict):
+            return None
+
+        next_link = body.pop("@odata.nextLink", None)
+        if req_id in page_of:
+            responses.pop(req_id)
+            first_page = responses[page_of[req_id]]
+            first_page.setdefault("value", []).extend(body.get("value", []))
+
+        return next_link
 
     def batch_request(
         self, data: list, url: str, extra_url: str, method: str = "GET"
     ) -> list:
         """Batch request to the Graph API.
 
+        The batches are sent concurrently with at most batch_window batches in flight.
+        Throttled sub-requests are put back in the queue and sent with the remaining
+        batches once the throttle governor allows it. Sub-responses with an
+        @odata.nextLink get their remaining pages fetched in follow-up batches and
+        merged into the value of the first page.
+
         Args:
             data (list): List of objects
             url (str): MS graph endpoint for the object
             extra_url (str): Used if anything extra is needed for the url such as /assignments or ?$filter
-            self.token (str): OAuth self.token used for authentication
             method (str): HTTP method to use
 
         Returns:
-            list: List of responses from the batch request
+            list: List of responses from the batch request, in the same order as data
         """
-        responses = []
-        batch_id = 1
-        batch_count = 20
-        retry_pool = []
-        wait_time = 0
-        initial_request_data = []
+        return list(self.batch_responses(data, url, extra_url, method).values())
 
-        batch_list = self.create_batch_list(data, batch_count)
-        for batch in batch_list:
-            batch_id, responses, retry_pool, wait_time = self.process_batch(
-                batch,
-                batch_id,
-                method,
-                url,
-                extra_url,
-                initial_request_data,
-                responses,
-                retry_pool,
-            )
+    def batch_request_by_key(
+        self, data: list, url: str, extra_url: str, method: str = "GET"
+    ) -> dict:
+        """Batch request to the Graph API, keying the responses by the object they were requested for.
+
+        Args:
+            data (list): List of objects
+            url (str): MS graph endpoint for the object
+            extra_url (str): Used if anything extra is needed for the url such as /assignments or ?$filter
+            method (str): HTTP method to use
 
+        Returns:
+            dict: Responses from the batch request keyed by the object in data
+        """
+        responses = self.batch_responses(data, url, extra_url, method)
+        return {data[req_id - 1]: body for req_id, body in responses.items()}
+
+    def batch_responses(
+        self, data: list, url: str, extra_url: str, method: str = "GET"
+    ) -> dict:
+        """Sends the batch requests and keys the successful responses by request id.
+
+        The request id of an object is its position in data, starting at 1.
+
+        Args:
+            data (list): List of objects
+            url (str): MS graph endpoint for the object
+            extra_url (str): Used if anything extra is needed for the url such as /assignments or ?$filter
+            method (str): HTTP method to use
+
+        Returns:
+            dict: Response bodies keyed by request id, in request id order
+        """
+        responses = {}
+        batch_count = 20
         max_retries = 10
-        max_wait_time = 60
-        if retry_pool:
-            responses = self.retry_failed_requests(
-                retry_pool,
-                wait_time,
-                max_retries,
-                max_wait_time,
-                initial_request_data,
-                responses,
-                batch_count,
+        retry_counts = {}
+        failed = set()
+
+        query_data, next_id = self.create_batch_request(data, 1, method, url, extra_url)
+        requests_by_id = {req["id"]: req for req in query_data["requests"]}
+        page_of = {}
+        queue = deque(self.create_batch_list(query_data["requests"], batch_count))
+
+        with ThreadPoolExecutor(max_workers=self.batch_window) as executor:
+            in_flight = {}
+            while queue or in_flight:
+                while queue and len(in_flight) < self.batch_window:
+                    batch = queue.popleft()
+                    in_flight[executor.submit(self.process_batch, batch)] = batch
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = in_flight.pop(future)
+                    wait_time = self.handle_responses(
+                        future.result(), responses, failed
+                    )
+
+                    retry = []
+                    pages = []
+                    for req in batch:
+                        if req["id"] not in failed:
+                            next_link = self._merge_page(req["id"], responses, page_of)
+                            if next_link:
+                                page_of[next_id] = page_of.get(req["id"], req["id"])
+                                requests_by_id[next_id] = {
+                                    "id": next_id,
+                                    "method": "GET",
+                                    "url": self._get_batch_url(next_link),
+                                }
+                                pages.append(requests_by_id[next_id])
+                                next_id += 1
+                            continue
+                        retry_counts[req["id"]] = retry_counts.get(req["id"], 0) + 1
+                        if retry_counts[req["id"]] <= max_retries:
+                            retry.append(requests_by_id[req["id"]])
+                    if retry:
+                        self.log(
+                            function="batch_request",
+                            msg=f"Retrying {len(retry)} throttled requests in {wait_time} seconds",
+                        )
+                    if retry or pages:
+                        queue.extend(self.create_batch_list(retry + pages, batch_count))
+
+        if failed:
+            self.log(
+                tag="error",
+                msg=f"{len(failed)} batch requests were still throttled after {max_retries} retries, "
+                f"their responses are missing: {', '.join(sorted(requests_by_id[req_id]['url'] for req_id in failed))}",
             )
+            if any(req_id in page_of for req_id in failed):
+                self.log(
+                    tag="warning",
+                    msg="Not all pages could be fetched, some batch responses are incomplete",
+                )
 
-        return responses
+        return {
+            req_id: responses[req_id]
+            for req_id in requests_by_id
+            if req_id in responses
+        }
 
     def get_group_names(self, responses: list, group_ids: list) -> None:
         """get all group names."""
-        group_responses = self.batch_request(
-            group_ids,
-            "groups/",
-            "?$select=displayName,id,groupTypes,membershipRule",
-        )
+        # Groups are cached for the run, each group is only requested once
+        groups = get_directory_cache().get_groups(self, group_ids)
         for value in responses:
             if value is None or "value" not in value:
                 continue
@@ -456,44 +565,45 @@ class BaseGraphModule(IntuneCDBase):
                 if "groupId" not in val["target"]:
                     continue
 
-                for g_id in group_responses:
-                    if g_id.get("id") == val["target"]["groupId"]:
-                        val["target"]["groupName"] = g_id.get("displayName", "")
-                        if "DynamicMembership" in g_id.get("groupTypes", []):
-                            val["target"]["groupType"] = "DynamicMembership"
-                            val["target"]["membershipRule"] = g_id.get(
-                                "membershipRule", None
-                            )
-                        else:
-                            val["target"]["groupType"] = "StaticMembership"
-                        break
-
-    def get_filter_name(self, val: dict, filter_responses: list) -> None:
-        """Get the name of the filter."""
-        for f_id in filter_responses:
-            if f_id["id"] == val["target"]["deviceAndAppManagementAssignmentFilterId"]:
-                val["target"]["deviceAndAppManagementAssignmentFilterId"] = f_id[
-                    "displayName"
-                ]
-                break
+                g_id = groups.get(val["target"]["groupId"])
+                if g_id is None:
+                    continue
+
+                val["target"]["groupName"] = g_id.get("displayName", "")
+                if "DynamicMembership" in g_id.get("groupTypes", []):
+                    val["target"]["groupType"] = "DynamicMembership"
+                    val["target"]["membershipRule"] = g_id.get("membershipRule", None)
+                else:
+                    val["target"]["groupType"] = "StaticMembership"
+
+    def get_filter_name(self, val: dict, filter_responses: dict) -> None:
+        """Get the name of the filter.
+
+        Args:
+            val (dict): The assignment to set the filter name on
+            filter_responses (dict): The filters keyed by ID, a list of filters is also accepted
+        """
+        if not isinstance(filter_responses, dict):
+            filter_responses = {f_id["id"]: f_id for f_id in filter_responses}
+        f_id = filter_responses.get(
+            val["target"]["deviceAndAppManagementAssignmentFilterId"]
+        )
+        if f_id is not None:
+            val["target"]["deviceAndAppManagementAssignmentFilterId"] = f_id[
+                "displayName"
+            ]
 
     def get_filter_names(self, responses: list, filter_ids: list) -> None:
         """Get all filter names."""
-        filter_ids = [
-            i for i in filter_ids if i != "00000000-0000-0000-0000-000000000000"
-        ]
-        filter_responses = self.batch_request(
-            filter_ids,
-            "deviceManagement/assignmentFilters/",
-            "?$select=displayName",
-        )
+        # All filters are requested once for the run and shared by all modules
+        filters = get_directory_cache().get_filters_by_id(self)
         for value in responses:
             if value["value"]:
                 for val in value["value"]:
                     if "deviceAndAppManagementAssignmentFilterId" in val["target"]:
-                        self.get_filter_name(val, filter_responses)
+                        self.get_filter_name(val, filters)
 
-    def batch_assignment(self, data: list, url: str, extra_url: str) -> list:
+    def batch_assignment(self, data: list, url: str, extra_url: str) -> dict:
         """
         Batch request to the Graph API.
 
@@ -502,10 +612,10 @@ class BaseGraphModule(IntuneCDBase):
         :param extra_url: Used if anything extra is needed for the url such as /assignments or ?$filter
         :param self.token: OAuth self.token used for authentication
         :param app_protection: By default False, set to true when getting assignments for APP to get the platform
-        :return: List of responses from the batch request
+        :return: Responses from the batch request keyed by object ID
         """
 
-        data_ids = []
+        object_ids = {}
         group_ids = []
         filter_ids = []
 
@@ -516,45 +626,48 @@ class BaseGraphModule(IntuneCDBase):
                     a_id["@odata.type"]
                     == "#microsoft.graph.mdmWindowsInformationProtectionPolicy"
                 ):
-                    data_ids.append(
+                    object_ids[
                         f"mdmWindowsInformationProtectionPolicies/{a_id['id']}"
-                    )
+                    ] = a_id["id"]
                 if (
                     a_id["@odata.type"]
                     == "#microsoft.graph.windowsInformationProtectionPolicy"
                 ):
-                    data_ids.append(
+                    object_ids[
                         f"windowsInformationProtectionPolicies/{a_id['id']}"
-                    )
+                    ] = a_id["id"]
                 else:
-                    data_ids.append(
+                    object_ids[
                         f"{str(a_id['@odata.type']).split('.')[2]}s/{a_id['id']}"
-                    )
+                    ] = a_id["id"]
         # Else, just add the objects ID to the list
         else:
             for a_id in data:
-                data_ids.append(a_id["id"])
+                object_ids[a_id["id"]] = a_id["id"]
         # If we have any IDs, batch request the assignments
-        if data_ids:
-            responses = self.batch_request(data_ids, url, extra_url)
+        if object_ids:
+            responses = self.batch_request_by_key(list(object_ids), url, extra_url)
             if not responses:
                 return
 
+            # Index the responses by object ID, the key of the sub-request
+            responses = {
+                object_ids[data_id]: value for data_id, value in responses.items()
+            }
+
             if extra_url == "?$expand=assignments":
-                response_values = []
-                for value in responses:
-                    if value:
-                        response_values.append(
-                            {
-                                "value": value["assignments"],
-                                "@odata.context": value["assignments@odata.context"],
-                            }
-                        )
-                responses = response_values
+                responses = {
+                    object_id: {
+                        "value": value["assignments"],
+                        "@odata.context": value["assignments@odata.context"],
+                    }
+                    for object_id, value in responses.items()
+                    if value
+                }
 
             group_ids = [
                 val
-                for list in responses
+                for list in responses.values()
                 if list and "value" in list
                 for val in list["value"]
                 for keys, val in val.items()
@@ -564,7 +677,7 @@ class BaseGraphModule(IntuneCDBase):
             ]
             filter_ids = [
                 val
-                for list in responses
+                for list in responses.values()
                 if list and "value" in list
                 for val in list["value"]
                 for keys, val in val.items()
@@ -576,11 +689,11 @@ class BaseGraphModule(IntuneCDBase):
 
             # Batch get name of the groups
             if group_ids:
-                self.get_group_names(responses, group_ids)
+                self.get_group_names(list(responses.values()), group_ids)
 
             # Batch get name of the Filters
             if filter_ids:
-                self.get_filter_names(responses, filter_ids)
+                self.get_filter_names(list(responses.values()), filter_ids)
 
             return responses
 
@@ -660,24 +773,56 @@ class BaseGraphModule(IntuneCDBase):
 
         return intent_values
 
-    def get_object_assignment(self, data_id: str, responses: list) -> list:
+    def batch_oma_settings(self, data: list, url: str) -> dict:
+        """Gets the plain text values of the encrypted OMA settings with batch requests.
+
+        Args:
+            data (list): The configurations with OMA settings
+            url (str): MS graph endpoint of the configurations
+
+        Returns:
+            dict: The getOmaSettingPlainTextValue responses keyed by secretReferenceValueId
+        """
+        secret_ids = {}
+        for item in data:
+            for setting in item.get("omaSettings") or []:
+                secret_id = setting.get("secretReferenceValueId")
+                if setting.get("isEncrypted") and secret_id:
+                    secret_ids[
+                        f"{item['id']}/getOmaSettingPlainTextValue"
+                        f"(secretReferenceValueId='{secret_id}')"
+                    ] = secret_id
+        if not secret_ids:
+            return {}
+
+        responses = self.batch_request_by_key(list(secret_ids), url, "")
+
+        return {secret_ids[key]: value for key, value in responses.items()}
+
+    def get_object_assignment(self, data_id: str, responses: dict) -> list:
         """
         Get the object assignment for the object ID.
 
         :param data_id: Id of the object to get the assignment for
-        :param responses: List of responses from the batch request
+        :param responses: Responses from batch_assignment keyed by object ID, a list of responses is also accepted
         :return: List of assignments for the object
         """
         if not responses:
             return []
         remove_keys = {"id", "groupId", "sourceId"}
-        assignments_list = [
-            val
-            for list in responses
-            if list and "value" in list
-            if data_id in list["@odata.context"]
-            for val in list["value"]
-        ]
+        if isinstance(responses, dict):
+            response = responses.get(data_id)
+            assignments_list = (
+                list(response["value"]) if response and "value" in response else []
+            )
+        else:
+            assignments_list = [
+                val
+                for list in responses
+                if list and "value" in list
+                if data_id in list["@odata.context"]
+                for val in list["value"]
+            ]
         for value in assignments_list:
             for k in remove_keys:
                 value.pop(k, None)
@@ -780,23 +925,18 @@ class BaseGraphModule(IntuneCDBase):
         if not diff:
             return None
 
+        directory_cache = get_directory_cache()
         for val in repo_data:
             # Request group id based on group name
             if "groupName" in val["target"]:
-                request = self.make_graph_request(
-                    endpoint="https://graph.microsoft.com/beta/groups",
-                    params={
-                        "$filter": "displayName eq "
-                        + "'"
-                        + val["target"]["groupName"]
-                        + "'"
-                    },
+                group = directory_cache.get_group_by_name(
+                    self, val["target"]["groupName"]
                 )
-                if request["value"]:
+                if group:
                     val["target"].pop("groupName")
                     val["target"].pop("groupType", None)
                     val["target"].pop("membershipRule", None)
-                    val["target"]["groupId"] = request["value"][0]["id"]
+                    val["target"]["groupId"] = group["id"]
                 else:
                     if create_groups:
                         group_data = {
@@ -813,30 +953,30 @@ class BaseGraphModule(IntuneCDBase):
                             ]
                             group_data["membershipRuleProcessingState"] = "On"
 
-                        request = self.make_graph_request(
-                            endpoint="https://graph.microsoft.com/beta/groups",
-                            data=json.dumps(group_data),
-                            status_code=201,
-                            method="POST",
+                        # Items updated in parallel can miss the same group, it is created once
+                        request = directory_cache.create_group(
+                            group_data["displayName"],
+                            lambda group_data=group_data: self.make_graph_request(
+                                endpoint="https://graph.microsoft.com/beta/groups",
+                                data=json.dumps(group_data),
+                                status_code=201,
+                                method="POST",
+                            ),
                         )
                         val["target"].pop("groupName")
                         val["target"].pop("groupType", None)
                         val["target"].pop("membershipRule", None)
                         val["target"]["groupId"] = request["id"]
 
-            # Request filter id based on filter name
+            # Get filter id based on filter name
             if "deviceAndAppManagementAssignmentFilterId" in val["target"]:
-                filters = self.make_graph_request(
-                    endpoint="https://graph.microsoft.com/beta/deviceManagement/assignmentFilters",
+                intune_filter = directory_cache.get_filters_by_name(self).get(
+                    val["target"]["deviceAndAppManagementAssignmentFilterId"]
                 )
-                for intune_filter in filters["value"]:
-                    if (
-                        val["target"]["deviceAndAppManagementAssignmentFilterId"]
-                        == intune_filter["displayName"]
-                    ):
-                        val["target"][
-                            "deviceAndAppManagementAssignmentFilterId"
-                        ] = intune_filter["id"]
+                if intune_filter:
+                    val["target"][
+                        "deviceAndAppManagementAssignmentFilterId"
+                    ] = intune_filter["id"]
 
                 # If filter is None, remove keys
                 if val["target"]["deviceAndAppManagementAssignmentFilterId"] is None:
@@ -898,7 +1038,7 @@ class BaseGraphModule(IntuneCDBase):
         }
 
         if params:
-            response = requests.request(
+            response = get_session().request(
                 method,
                 f"{BASE_URL}{endpoint}",
                 headers=header,
@@ -907,7 +1047,7 @@ class BaseGraphModule(IntuneCDBase):
                 timeout=120,
             )
         else:
-            response = requests.request(
+            response = get_session().request(
                 method, f"{BASE_URL}{endpoint}", headers=header, data=data, timeout=120
             )
 
@@ -3,17 +3,50 @@ import json
 import os
 import plistlib
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from deepdiff import DeepDiff
 
 from .BaseGraphModule import BaseGraphModule
+from .change_plan import get_change_plan, get_object_version
+from .diff_engine import DiffPath, get_diff_engine, native_diff
+from .fingerprint import fingerprint
 from .process_scope_tags import ProcessScopeTags
+from .repo_changes import RepoChanges
+from .write_batcher import WriteBatcher
+
+
+@dataclass
+class UpdateItem:
+    """The state of a single item updated by process_update.
+
+    Items updated in parallel each get their own UpdateItem, the module itself
+    holds this state when items are updated one at a time.
+    """
+
+    name: str = None
+    match_info: dict = None
+    downstream_object: dict = None
+    downstream_id: str = None
+    create_request: dict = None
+    write_id: int = None
+    plan_object: dict = None
+    diffs: list = field(default_factory=list)
+    diff_count: int = 0
+    count: int = 0
 
 
 class BaseUpdateModule(BaseGraphModule):
     """This class is the base class for all update modules. It contains methods for updating downstream data."""
 
+    # Modules that only keep item state in an UpdateItem can update items in parallel
+    parallel_items = False
+    # Modules using process_items can send updates and assignments as $batch requests
+    batch_writes = False
+
     def __init__(
         self,
         token: str = None,
@@ -26,6 +59,8 @@ class BaseUpdateModule(BaseGraphModule):
         remove: bool = False,
         azure_token: str = None,
         handle_assignment: bool = False,
+        item_workers: int = 1,
+        repo_changes: RepoChanges = None,
     ):
         """Initializes the BaseBackupModule class
 
@@ -39,6 +74,8 @@ class BaseUpdateModule(BaseGraphModule):
             report (bool, optional): If a report should be created, defaults to False.
             remove (bool, optional): If the data should be removed, defaults to False.
             azure_token (str, optional): The Azure token to use, defaults to None.
+            item_workers (int, optional): The number of items updated in parallel, defaults to 1.
+            repo_changes (RepoChanges, optional): Only update the changed files of the repository, defaults to None.
         """
         self.endpoint = "https://graph.microsoft.com"
         # Variables set from the update run
@@ -52,6 +89,8 @@ class BaseUpdateModule(BaseGraphModule):
         self.report = report
         self.remove = remove
         self.handle_assignment = handle_assignment
+        self.item_workers = max(int(item_workers or 1), 1)
+        self.repo_changes = repo_changes
         # Default variables, can be overridden in child classes
         self.assignment_endpoint = None
         self.assignment_extra_url = None
@@ -78,26 +117,40 @@ class BaseUpdateModule(BaseGraphModule):
         self.diff_summary = []
         self.diffs = []
         self.diff_count = 0
+        self.write_id = None
+        self.plan_object = None
+        self.write_errors = []
+        # Indexes of the downstream data used by get_match_data
+        self._match_indexes = {}
+        self._matched_ids = set()
+        self._match_lock = threading.Lock()
+        self.write_batcher = WriteBatcher(self)
 
     def get_diffs(
-        self, repo_data: dict, intune_data: dict, exclude_paths: list = None
+        self,
+        repo_data: dict,
+        intune_data: dict,
+        exclude_paths: list = None,
+        item: UpdateItem = None,
     ) -> list:
         """Gets the differences between the data and the memory data
 
         Args:
             repo_data (dict): The data to compare
             intune_data (dict): The memory data to compare
+            item (UpdateItem, optional): The item being updated, defaults to the module.
 
         Returns:
             list: The differences between the data and the memory data
         """
+        state = self if item is None else item
         diffs = []
         diff = self._get_deep_diff(repo_data, intune_data, exclude_paths)
         if diff:
-            diffs = self._process_diffs(diff)
+            diffs = self._process_diffs(diff, item)
         else:
             if self.notify is True:
-                self.log(msg=f"No changes found for {self.config_type}: {self.name}")
+                self.log(msg=f"No changes found for {self.config_type}: {state.name}")
         return diffs
 
     def _get_deep_diff(
@@ -114,6 +167,20 @@ class BaseUpdateModule(BaseGraphModule):
             dict[str, any]: The deep diff between the data and the intune data
         """
         if isinstance(repo_data, (list, dict)):
+            # Most configurations are unchanged, skip DeepDiff when the content is equal
+            repo_fingerprint = fingerprint(repo_data, exclude_paths)
+            if repo_fingerprint is not None and repo_fingerprint == fingerprint(
+                intune_data, exclude_paths
+            ):
+                return {}
+
+            if get_diff_engine() == "native":
+                try:
+                    return native_diff(intune_data, repo_data, exclude_paths)
+                except TypeError:
+                    # Data that is not JSON, such as dates loaded from YAML
+                    pass
+
             if exclude_paths:
                 return DeepDiff(
                     intune_data,
@@ -125,32 +192,36 @@ class BaseUpdateModule(BaseGraphModule):
             return DeepDiff(intune_data, repo_data, ignore_order=True)
 
         if isinstance(repo_data, str):
+            if repo_data == intune_data:
+                return {}
             return DeepDiff(intune_data, repo_data)
 
-    def _process_diffs(self, diff: dict) -> list:
+    def _process_diffs(self, diff: dict, item: UpdateItem = None) -> list:
         """Processes the differences between the data and the intune data
 
         Args:
             diff (dict): The differences between the data and the intune data
+            item (UpdateItem, optional): The item being updated, defaults to the module.
 
         Returns:
             list: The differences between the data and the intune data
         """
         diffs = []
         if "values_changed" in diff:
-            diffs.extend(self._process_value_changes(diff))
+            diffs.extend(self._process_value_changes(diff, item))
         if "iterable_item_added" in diff or "iterable_item_removed" in diff:
-            diffs.extend(self._process_iterable_changes(diff))
+            diffs.extend(self._process_iterable_changes(diff, item))
         if "type_changes" in diff:
-            diffs.extend(self._process_type_changes(diff))
+            diffs.extend(self._process_type_changes(diff, item))
 
         return diffs
 
-    def _process_value_changes(self, diff: dict) -> list:
+    def _process_value_changes(self, diff: dict, item: UpdateItem = None) -> list:
         """Processes the value changes
 
         Args:
             diff (dict): The differences between the data and the intune data
+            item (UpdateItem, optional): The item being updated, defaults to the module.
 
         Returns:
             list: The differences between the data and the intune data
@@ -159,15 +230,16 @@ class BaseUpdateModule(BaseGraphModule):
         for key, value in diff["values_changed"].items():
             vals = self._get_diff_values(key, value)
             diffs.append(vals)
-        self._log_diffs(diffs, "values changed")
+        self._log_diffs(diffs, "values changed", item)
 
         return diffs
 
-    def _process_iterable_changes(self, diff: dict) -> list:
+    def _process_iterable_changes(self, diff: dict, item: UpdateItem = None) -> list:
         """Processes the iterable changes
 
         Args:
             diff (dict): The differences between the data and the intune data
+            item (UpdateItem, optional): The item being updated, defaults to the module.
 
         Returns:
             list: The differences between the data and the intune data
@@ -175,6 +247,8 @@ class BaseUpdateModule(BaseGraphModule):
         diffs = []
 
         def get_setting(key: str) -> str:
+            if isinstance(key, DiffPath):
+                return str(key.parts[0]) if key.parts else key
             setting = re.search("\\[(.*)\\]", key)
             return setting[1].split("[")[0] if setting else key
 
@@ -202,15 +276,16 @@ class BaseUpdateModule(BaseGraphModule):
                 vals = set_vals(setting, "", old_val)
                 diffs.append(vals)
 
-        self._log_diffs(diffs, "list changes")
+        self._log_diffs(diffs, "list changes", item)
 
         return diffs
 
-    def _process_type_changes(self, diff: dict) -> list:
+    def _process_type_changes(self, diff: dict, item: UpdateItem = None) -> list:
         """Processes the type changes
 
         Args:
             diff (dict): The differences between the data and the intune data
+            item (UpdateItem, optional): The item being updated, defaults to the module.
 
         Returns:
             list: The differences between the data and the intune data
@@ -219,7 +294,7 @@ class BaseUpdateModule(BaseGraphModule):
         for key, value in diff["type_changes"].items():
             vals = self._get_diff_values(key, value)
             diffs.append(vals)
-            self._log_diffs(diffs, "type changed")
+            self._log_diffs(diffs, "type changed", item)
         return diffs
 
     def _get_diff_values(self, key: str, value: dict) -> dict:
@@ -234,9 +309,12 @@ class BaseUpdateModule(BaseGraphModule):
         """
         max_length = 100
         vals = {}
-        setting = re.search("\\[(.*)\\]", key)
-        if setting:
-            setting = setting.group(1).split("[")[-1]
+        if isinstance(key, DiffPath):
+            setting = key.parts[-1] if key.parts else None
+        else:
+            setting = re.search("\\[(.*)\\]", key)
+            if setting:
+                setting = setting.group(1).split("[")[-1]
         vals["setting"] = str(setting).replace("'", "").replace('"', "")
         vals["new_val"] = (
             str(value["new_value"]).replace("'", "").replace('"', "")[:max_length]
@@ -247,17 +325,21 @@ class BaseUpdateModule(BaseGraphModule):
         vals["change_date"] = str(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         return vals
 
-    def _log_diffs(self, diffs: list, change_type: str) -> None:
+    def _log_diffs(
+        self, diffs: list, change_type: str, item: UpdateItem = None
+    ) -> None:
         """Logs the differences
 
         Args:
             diffs (list): The differences to log
             change_type (str): The type of change
+            item (UpdateItem, optional): The item being updated, defaults to the module.
         """
+        state = self if item is None else item
         if diffs and not self.message:
-            if self.name:
+            if state.name:
                 self.log(
-                    msg=f"Updating {self.config_type}: {self.name}, {change_type}:"
+                    msg=f"Updating {self.config_type}: {state.name}, {change_type}:"
                 )
             else:
                 self.log(msg=f"Updating {self.config_type}, {change_type}:")
@@ -274,8 +356,8 @@ class BaseUpdateModule(BaseGraphModule):
             diffs = [self.message]
             self.log(msg=self.message)
         elif self.notify:
-            self.log(msg=f"No changes found for {self.config_type}: {self.name}")
-        self.count = len(diffs)
+            self.log(msg=f"No changes found for {self.config_type}: {state.name}")
+        state.count = len(diffs)
 
     def get_downstream_data(self, endpoint: str) -> dict:
         """Gets the memory data
@@ -297,10 +379,19 @@ class BaseUpdateModule(BaseGraphModule):
             self.log(tag="error", msg=f"Failed to get Intune data: {e}")
             return None
 
+        plan = get_change_plan()
+        if plan is not None and isinstance(intune_data, dict):
+            plan.add_objects(self.endpoint + endpoint, intune_data.get("value", []))
+
         return intune_data
 
     def update_downstream_data(
-        self, config_endpoint: str, method: str, status_code: int, data: dict
+        self,
+        config_endpoint: str,
+        method: str,
+        status_code: int,
+        data: dict,
+        item: UpdateItem = None,
     ) -> None:
         """Updates the Intune data
 
@@ -309,8 +400,20 @@ class BaseUpdateModule(BaseGraphModule):
             method (str): The method to use
             status_code (int): The status code to expect
             data (dict): The data to use
+            item (UpdateItem, optional): The item being updated, defaults to the module.
         """
+        state = self if item is None else item
         data.pop("assignments", None)
+        if self.batch_writes and not self.azure_update and not self.params:
+            state.write_id = self.write_batcher.add(
+                method,
+                config_endpoint,
+                data,
+                on_response=self._get_write_callback("update", state.name, state.diffs),
+            )
+            if state.write_id is not None:
+                return
+
         request_data = json.dumps(data)
         if self.azure_update:
             self.make_azure_request(
@@ -340,7 +443,7 @@ class BaseUpdateModule(BaseGraphModule):
             status_code (int): The status code to expect
         """
         if self.remove:
-            for item in downstream_data:
+            for item in self.get_unmatched_data(downstream_data):
                 if "displayName" in item:
                     config_name = item["displayName"]
                 elif "name" in item:
@@ -352,9 +455,20 @@ class BaseUpdateModule(BaseGraphModule):
                     )
 
                 self.log(msg=f"Removing {self.config_type}: {config_name}")
+                endpoint = self.endpoint + config_endpoint + item["id"]
+                self.plan_object = get_object_version(endpoint, item, config_name)
+                write_id = None
+                if not self.params:
+                    write_id = self.write_batcher.add(
+                        "DELETE",
+                        endpoint,
+                        on_response=self._get_write_callback("remove", config_name),
+                    )
+                if write_id is not None:
+                    continue
                 try:
                     self.make_graph_request(
-                        endpoint=self.endpoint + config_endpoint + item["id"],
+                        endpoint=endpoint,
                         params=self.params,
                         method="DELETE",
                         status_code=self.remove_status_code,
@@ -364,8 +478,15 @@ class BaseUpdateModule(BaseGraphModule):
                         msg=f"Failed to remove {self.config_type} {config_name}: {e}"
                     )
 
+            self.plan_object = None
+            self.flush_writes()
+
     def create_downstream_data(
-        self, config_endpoint: str, data: dict, repo_assignments: dict
+        self,
+        config_endpoint: str,
+        data: dict,
+        repo_assignments: dict,
+        item: UpdateItem = None,
     ) -> None:
         """Creates the Intune data
 
@@ -373,18 +494,22 @@ class BaseUpdateModule(BaseGraphModule):
             config_endpoint (str): The endpoint to use
             data (dict): The data to use
             repo_assignments (dict): The repository assignments to use
+            item (UpdateItem, optional): The item being updated, defaults to the module.
         """
-        self.log(msg=f"{self.config_type} {self.name} not found, creating: {self.name}")
+        state = self if item is None else item
+        self.log(
+            msg=f"{self.config_type} {state.name} not found, creating: {state.name}"
+        )
         data.pop("assignments", None)
         request_data = json.dumps(data)
-        self.create_request = self.make_graph_request(
+        state.create_request = self.make_graph_request(
             endpoint=self.endpoint + config_endpoint,
             params=self.params,
             data=request_data,
             method="POST",
             status_code=self.post_status_code,
         )
-        self.log(msg=f"Created with id: {self.create_request['id']}")
+        self.log(msg=f"Created with id: {state.create_request['id']}")
 
         if self.handle_assignment:
             if self.config_type == "Windows Enrollment Profile":
@@ -392,16 +517,63 @@ class BaseUpdateModule(BaseGraphModule):
                     repo_assignments,
                     [],
                     self.assignment_key,
-                    self.create_request["id"],
+                    state.create_request["id"],
                 )
             else:
                 self.handle_assignments(
-                    repo_assignments, [], self.assignment_key, self.create_request["id"]
+                    repo_assignments,
+                    [],
+                    self.assignment_key,
+                    state.create_request["id"],
+                    item,
                 )
 
+    def _get_match_value(self, value):
+        """Gets a hashable value to use as part of a match key
+
+        Args:
+            value: The value of a match info key
+
+        Returns:
+            The value, lists and dicts are returned as a sorted JSON string
+        """
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, sort_keys=True)
+        return value
+
+    def _get_match_index(self, intune_data: list, keys: tuple) -> dict:
+        """Gets the index of the intune data for the match info keys
+
+        The index is built once per list and rebuilt when the length of the list changes.
+
+        Args:
+            intune_data (list): The intune data
+            keys (tuple): The match info keys
+
+        Returns:
+            dict: The positions of the items keyed by the values of the match info keys
+        """
+        cache_key = (id(intune_data), keys)
+        cached = self._match_indexes.get(cache_key)
+        if cached is not None and cached[0] is intune_data:
+            if cached[1] == len(intune_data):
+                return cached[2]
+
+        index = {}
+        for position, item in enumerate(intune_data):
+            match_key = tuple(self._get_match_value(item.get(key)) for key in keys)
+            index.setdefault(match_key, []).append(position)
+        # Keep a reference to the list so its id is not reused while the index exists
+        self._match_indexes[cache_key] = (intune_data, len(intune_data), index)
+
+        return index
+
     def get_match_data(self, intune_data: dict, match_info: dict) -> tuple:
         """Gets the matching data
 
+        Matched items are marked as consumed instead of being removed from
+        intune_data, get_unmatched_data returns the items left for removal.
+
         Args:
             intune_data (dict): The intune data
             match_info (dict): The match info from the repository
@@ -409,20 +581,41 @@ class BaseUpdateModule(BaseGraphModule):
         Returns:
             tuple: The matching data
         """
-        config_match_count = len(match_info)
-        intune_item = None
-        intune_id = None
-        for item in intune_data:
-            match_count = 0  # Reset match_count for each item
-            for key, value in match_info.items():
-                if item.get(key) == value:
-                    match_count += 1
-            if match_count == config_match_count:
-                intune_data.remove(item)
-                intune_item = dict(item)
-                intune_id = item["id"]
-                break  # Exit the loop once a match is found
-        return intune_item, intune_id
+        keys = tuple(match_info)
+        match_key = tuple(self._get_match_value(match_info[key]) for key in keys)
+        with self._match_lock:
+            positions = self._get_match_index(intune_data, keys).get(match_key, [])
+            for position in positions:
+                item = intune_data[position]
+                if item["id"] in self._matched_ids:
+                    continue
+                self._matched_ids.add(item["id"])
+                return dict(item), item["id"]
+
+        return None, None
+
+    def get_unmatched_data(self, intune_data: list) -> list:
+        """Gets the intune data that was not matched to the repository data
+
+        Args:
+            intune_data (list): The intune data
+
+        Returns:
+            list: The items not returned by get_match_data
+        """
+        unmatched = [
+            item for item in intune_data if item.get("id") not in self._matched_ids
+        ]
+        # With --since only the changed files were compared, remove deleted ones only
+        if self.repo_changes is not None:
+            deleted = self.repo_changes.deleted_names(self.path)
+            unmatched = [
+                item
+                for item in unmatched
+                if item.get("displayName", item.get("name")) in deleted
+            ]
+
+        return unmatched
 
     def handle_assignments(
         self,
@@ -430,6 +623,7 @@ class BaseUpdateModule(BaseGraphModule):
         intune_assignments: dict,
         assignment_key: str,
         intune_id: str,
+        item: UpdateItem = None,
     ) -> None:
         """Handles the assignments
 
@@ -437,7 +631,9 @@ class BaseUpdateModule(BaseGraphModule):
             repo_assignments (dict): The repository assignments to use
             intune_assignments (dict): The intune assignments to compare
             intune_id (str): The intune configuration id to use
+            item (UpdateItem, optional): The item being updated, defaults to the module.
         """
+        state = self if item is None else item
         intune_assignment_data = self.get_object_assignment(
             intune_id, intune_assignments
         )
@@ -446,6 +642,20 @@ class BaseUpdateModule(BaseGraphModule):
         )
         if assignment_update is not None:
             request_data = {assignment_key: assignment_update}
+            if self.batch_writes:
+                write_id = self.write_batcher.add(
+                    "POST",
+                    self.endpoint
+                    + "/beta"
+                    + self.assignment_endpoint
+                    + intune_id
+                    + self.assignment_extra_url,
+                    request_data,
+                    depends_on=state.write_id,
+                    on_response=self._get_write_callback("assign", state.name),
+                )
+                if write_id is not None:
+                    return
             self.make_graph_request(
                 endpoint=self.endpoint
                 + "/beta"
@@ -495,15 +705,31 @@ class BaseUpdateModule(BaseGraphModule):
         """Checks if a path exists
 
         Args:
-            path (str, optional): Path to check, defaults to None.
+            path (str, optional): Path to check, defaults to the module path.
 
         Returns:
-            bool: If the path exists
+            bool: If the path exists, False for the module path when nothing in it changed
         """
         if path is None:
             path = self.path
+            # Modules without changes since the given revision are skipped
+            if self.repo_changes is not None and not self.repo_changes.touches(path):
+                return False
         return os.path.exists(path)
 
+    def list_repo_files(self) -> list:
+        """Lists the files of the module path to update
+
+        Returns:
+            list: The names of the files, only the changed ones when running with --since
+        """
+        if self.repo_changes is not None:
+            filenames = self.repo_changes.files_in(self.path)
+            if filenames is not None:
+                return filenames
+
+        return os.listdir(self.path)
+
     def load_repo_data(self, filename: str) -> dict:
         """Loads the repository data
 
@@ -519,8 +745,7 @@ class BaseUpdateModule(BaseGraphModule):
         if repo_file is False:
             return None
 
-        with open(repo_file, encoding="utf-8") as f:
-            repo_data = self.load_file(filename, f)
+        repo_data = self.load_repo_file(repo_file)
 
         if self.scope_tags:
             repo_data = ProcessScopeTags().get_scope_tags_id(repo_data, self.scope_tags)
@@ -581,20 +806,112 @@ class BaseUpdateModule(BaseGraphModule):
             "count": diff_count,
         }
 
-    def update_diff_data(self, diffs: list) -> None:
+    def update_diff_data(self, diffs: list, item: UpdateItem = None) -> None:
         """Updates the diff data"""
-        self.diff_count += len(diffs)
-        self.diffs.extend(diffs)
+        state = self if item is None else item
+        state.diff_count += len(diffs)
+        state.diffs.extend(diffs)
 
-    def reset_diffs_and_count(self) -> None:
+    def reset_diffs_and_count(self, item: UpdateItem = None) -> None:
         """Resets the diffs and count for the diff data"""
-        self.diffs = []
-        self.diff_count = 0
+        state = self if item is None else item
+        state.diffs = []
+        state.diff_count = 0
 
-    def set_diff_data(self, diff_data: dict) -> None:
+    def set_diff_data(self, diff_data: dict, item: UpdateItem = None) -> None:
         """Sets the diff data for the config"""
-        diff_data["diffs"] = self.diffs
-        diff_data["count"] = self.diff_count
+        state = self if item is None else item
+        diff_data["diffs"] = state.diffs
+        diff_data["count"] = state.diff_count
+
+    def process_items(self, filenames: list, update_item) -> None:
+        """Updates the items of the module and adds their diff data to the diff summary
+
+        Items are updated by item_workers threads when the module sets parallel_items,
+        each with its own UpdateItem. Items updated one at a time use the module
+        as their UpdateItem. The diff data is added in the order of filenames.
+
+        Args:
+            filenames (list): The filenames of the items in the repository
+            update_item: Called with a filename and the UpdateItem to use, returns the diff data of the item or None
+        """
+        workers = min(self.item_workers, len(filenames)) if self.parallel_items else 1
+        # The change plan records the object being updated from the module
+        if workers > 1 and get_change_plan() is None:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="intunecd-item"
+            ) as executor:
+                results = list(
+                    executor.map(
+                        lambda filename: update_item(filename, UpdateItem()), filenames
+                    )
+                )
+        else:
+            results = [update_item(filename, self) for filename in filenames]
+
+        self.diff_summary.extend(diff_data for diff_data in results if diff_data)
+        self.flush_writes()
+
+    def flush_writes(self) -> None:
+        """Sends the queued writes, failed updates and assignments stop the run with EXIT_ON_ERROR"""
+        self.write_batcher.flush()
+        errors = [error for error in self.write_errors if error["action"] != "remove"]
+        self.write_errors = []
+        if errors and os.getenv("EXIT_ON_ERROR"):
+            self.log(
+                tag="error",
+                msg=f"{len(errors)} batched writes of {self.config_type} failed",
+            )
+
+    def _get_write_callback(self, action: str, name: str, diffs: list = None):
+        """Gets the callback reporting the result of a batched write
+
+        Args:
+            action (str): The kind of write, update, assign or remove
+            name (str): The name of the configuration
+            diffs (list, optional): The diff records of the write, defaults to None.
+
+        Returns:
+            The callback, called with the status and body of the sub-response
+        """
+
+        def on_response(status: int, body: dict) -> None:
+            if 200 <= status < 300:
+                return
+            error = body
+            if isinstance(body, dict):
+                error = body.get("error", {}).get("message", body)
+            error = f"{status} - {error}"
+            # Failures are raised by flush_writes once all writes were sent
+            self.log(
+                tag="info" if action == "remove" else "warning",
+                msg=f"Failed to {action} {self.config_type} {name}: {error}",
+            )
+            self.write_errors.append({"action": action, "name": name, "error": error})
+            for diff in diffs or []:
+                diff["error"] = error
+            # Failures without diffs of their own are added to the summary
+            if not diffs:
+                self.diff_summary.append(
+                    {
+                        "type": self.config_type,
+                        "name": name,
+                        "diffs": [
+                            {
+                                "setting": action,
+                                "new_val": "",
+                                "old_val": "",
+                                "change_date": str(
+                                    datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                                ),
+                                "error": error,
+                            }
+                        ],
+                        "count": 0,
+                    }
+                )
+
+        return on_response
 
     def process_update(
         self,
@@ -606,7 +923,8 @@ class BaseUpdateModule(BaseGraphModule):
         update_data: dict = None,
         create_data: dict = None,
         repo_assignments: dict = None,
-    ) -> None:
+        item: UpdateItem = None,
+    ) -> UpdateItem:
         """Processes the update for the downstream data.
 
         Args:
@@ -618,18 +936,32 @@ class BaseUpdateModule(BaseGraphModule):
             update_data (dict, optional): The data to use for the update, defaults to None.
             create_data (dict, optional): The data to use for the create, defaults to None.
             repo_assignments (dict, optional): The repository assignments to use, defaults to None.
+            item (UpdateItem, optional): The item being updated, defaults to the module.
+
+        Returns:
+            UpdateItem: The state of the updated item
         """
+        state = self if item is None else item
         if repo_assignments is None:
             repo_assignments = repo_data.get("assignments", {})
+        state.write_id = None
+        state.plan_object = None
         if self.get_match is False:
-            self.downstream_object = downstream_data
-            self.downstream_id = downstream_data.get("id", "")
+            state.downstream_object = downstream_data
+            state.downstream_id = downstream_data.get("id", "")
         else:
-            self.downstream_object, self.downstream_id = self.get_match_data(
-                downstream_data, self.match_info
+            state.downstream_object, state.downstream_id = self.get_match_data(
+                downstream_data, state.match_info
+            )
+        if state.downstream_object and self.url_append_id:
+            # Version of the object before the update, checked when a change plan is applied
+            state.plan_object = get_object_version(
+                self.endpoint + config_endpoint + state.downstream_id,
+                state.downstream_object,
+                state.name,
             )
 
-        if self.downstream_object:
+        if state.downstream_object:
             # if self.notify:
             #
             # Temporarily remove scheduledActionsForRule from the data if it exists
@@ -638,24 +970,24 @@ class BaseUpdateModule(BaseGraphModule):
                 repo_scheduled_actions = repo_data["scheduledActionsForRule"]
                 repo_data.pop("scheduledActionsForRule")
 
-            self.downstream_object = self.remove_keys(self.downstream_object)
+            state.downstream_object = self.remove_keys(state.downstream_object)
 
             def _add_schedule_action():
                 if repo_scheduled_actions:
                     repo_data["scheduledActionsForRule"] = repo_scheduled_actions
 
             diffs = self.get_diffs(
-                repo_data, self.downstream_object, self.exclude_paths
+                repo_data, state.downstream_object, self.exclude_paths, item
             )
             if diffs:
                 if update_data:
                     data = update_data
                 else:
                     data = repo_data
-                self.update_diff_data(diffs)
+                self.update_diff_data(diffs, item)
 
                 if self.url_append_id:
-                    config_endpoint = config_endpoint + self.downstream_id
+                    config_endpoint = config_endpoint + state.downstream_id
                 if self.azure_update:
                     pass
                 else:
@@ -666,6 +998,7 @@ class BaseUpdateModule(BaseGraphModule):
                     method=method,
                     status_code=status_code,
                     data=data,
+                    item=item,
                 )
 
                 # Add scheduledActionsForRule back to the data if it was removed
@@ -677,14 +1010,15 @@ class BaseUpdateModule(BaseGraphModule):
                         repo_assignments,
                         self.downstream_assignments,
                         self.assignment_key,
-                        self.downstream_id,
+                        state.downstream_id,
                     )
                 else:
                     self.handle_assignments(
                         repo_assignments,
                         self.downstream_assignments,
                         self.assignment_key,
-                        self.downstream_id,
+                        state.downstream_id,
+                        item,
                     )
 
                 # Add scheduledActionsForRule back to the data if it was removed
@@ -693,9 +1027,12 @@ class BaseUpdateModule(BaseGraphModule):
         else:
             data = create_data if create_data else repo_data
             if self.create_config:
-                self.diff_count += 1
+                state.diff_count += 1
                 self.create_downstream_data(
                     config_endpoint=config_endpoint,
                     data=data,
                     repo_assignments=repo_assignments,
+                    item=item,
                 )
+
+        return state
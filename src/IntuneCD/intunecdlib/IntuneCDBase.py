@@ -7,6 +7,8 @@ import time
 
 import yaml
 
+from .parse_cache import get_parse_cache
+
 
 class IntuneCDBase:
     """IntuneCDBase is the base class for the IntuneCD library."""
@@ -118,6 +120,16 @@ class IntuneCDBase:
 
         return repo_data
 
+    def load_repo_file(self, path: str):
+        """
+        This function loads a JSON or YAML file through the parse cache, the file is
+        only parsed again when it changed since it was last loaded.
+        :param path: The path of the file.
+        :return: The dictionary.
+        """
+
+        return get_parse_cache().load(path)
+
     def check_file(self, configpath: str, filename: str):
         """
         Check if file is YAML or JSON, if true return the file, if not return False.
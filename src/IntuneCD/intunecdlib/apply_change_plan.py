@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the class used to execute a change plan written with --plan.
+"""
+
+import json
+
+from .BaseGraphModule import BaseGraphModule
+from .change_plan import PLACEHOLDER, VERSION_FIELDS, ChangePlan
+from .write_batcher import BATCH_PREFIX, WriteBatcher
+
+
+class ApplyChangePlan(BaseGraphModule):
+    """Executes the operations of a change plan without reading the tenant again."""
+
+    def __init__(self, token: str = None):
+        """Initializes the ApplyChangePlan class"""
+        self.token = token
+        self.report = False
+        self.config_type = "Change plan"
+
+    def _get_changed_objects(self, operations: list) -> set:
+        """Gets the endpoints of the objects changed since the plan was written.
+
+        The objects are read in $batch requests, only objects with a recorded
+        version are checked.
+
+        Args:
+            operations (list): The operations of the plan
+
+        Returns:
+            set: The endpoints of the changed or removed objects
+        """
+        objects = {}
+        for operation in operations:
+            target = operation.get("object") or {}
+            endpoint = target.get("endpoint")
+            if endpoint and endpoint.startswith(BATCH_PREFIX):
+                if any(field in target for field in VERSION_FIELDS):
+                    objects[endpoint[len(BATCH_PREFIX) :]] = target
+        if not objects:
+            return set()
+
+        responses = self.batch_request_by_key(list(objects), "", "")
+        changed = set()
+        for path, target in objects.items():
+            current = responses.get(path)
+            if current is None or any(
+                current.get(field) != target[field]
+                for field in VERSION_FIELDS
+                if field in target
+            ):
+                changed.add(target["endpoint"])
+
+        return changed
+
+    def _replace_placeholders(self, value, ids: dict):
+        """Replaces the $plan:<operation id> placeholders with the created ids"""
+        text = json.dumps(value)
+
+        def replace(match):
+            if int(match[1]) not in ids:
+                raise KeyError(f"operation {match[1]} did not create an object")
+            return ids[int(match[1])]
+
+        return json.loads(PLACEHOLDER.sub(replace, text))
+
+    def apply(self, plan: ChangePlan) -> dict:
+        """Executes the operations of the plan.
+
+        Operations on objects changed since the plan was written are skipped.
+        Operations whose result is used by later operations run one at a time
+        after the queued operations are sent, the others are sent as $batch
+        requests. Operations on the same object depend on the previous one so
+        they run in the order of the plan.
+
+        Args:
+            plan (ChangePlan): The plan to execute
+
+        Returns:
+            dict: The number of applied, failed and skipped operations
+        """
+        counts = {"applied": 0, "failed": 0, "skipped": 0}
+        changed = self._get_changed_objects(plan.operations)
+        referenced = {
+            int(operation_id)
+            for operation in plan.operations
+            for operation_id in PLACEHOLDER.findall(
+                json.dumps(
+                    [operation["endpoint"], operation.get("params"), operation["data"]]
+                )
+            )
+        }
+        ids = {}
+        batcher = WriteBatcher(self)
+        # The last queued write of each object
+        last_writes = {}
+
+        def on_response(operation):
+            def callback(status, body):
+                if 200 <= status < 300:
+                    counts["applied"] += 1
+                    return
+                counts["failed"] += 1
+                self.log(
+                    tag="error",
+                    msg=f"Failed to apply {operation['method']} for {operation['type']} {operation['name']}: {status} - {body}",
+                )
+
+            return callback
+
+        for operation in plan.operations:
+            target = operation.get("object") or {}
+            if target.get("endpoint") in changed:
+                counts["skipped"] += 1
+                self.log(
+                    tag="warning",
+                    msg=f"{operation['type']} {operation['name']} changed since the plan was written, skipping {operation['method']}",
+                )
+                continue
+
+            try:
+                endpoint = self._replace_placeholders(operation["endpoint"], ids)
+                params = self._replace_placeholders(operation.get("params"), ids)
+                data = self._replace_placeholders(operation["data"], ids)
+            except KeyError as e:
+                counts["failed"] += 1
+                self.log(
+                    tag="error",
+                    msg=f"Could not apply {operation['type']} {operation['name']}: {e}",
+                )
+                continue
+
+            object_endpoint = target.get("endpoint") or endpoint
+            if operation["id"] not in referenced and not params:
+                write_id = batcher.add(
+                    operation["method"],
+                    endpoint,
+                    data,
+                    depends_on=last_writes.get(object_endpoint),
+                    on_response=on_response(operation),
+                )
+                if write_id is not None:
+                    last_writes[object_endpoint] = write_id
+                    continue
+
+            # Earlier operations are sent first to keep the order of the plan
+            batcher.flush()
+            last_writes = {}
+            try:
+                response = self.make_graph_request(
+                    endpoint=endpoint,
+                    params=params,
+                    method=operation["method"],
+                    status_code=operation["status_code"],
+                    data=json.dumps(data) if data is not None else None,
+                )
+            except Exception as e:
+                counts["failed"] += 1
+                self.log(
+                    tag="error",
+                    msg=f"Failed to apply {operation['method']} for {operation['type']} {operation['name']}: {e}",
+                )
+                continue
+
+            counts["applied"] += 1
+            if response and response.get("id"):
+                ids[operation["id"]] = response["id"]
+
+        batcher.flush()
+
+        return counts
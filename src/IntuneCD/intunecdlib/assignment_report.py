@@ -24,10 +24,9 @@ class AssignmentReport(BaseBackupModule):
         if not file_check:
             return
 
-        with open(os.path.join(path, name), "r", encoding="utf-8") as f:
-            data = self.load_file(name, f)
-            if not isinstance(data, dict) or not data.get("assignments"):
-                return
+        data = self.load_repo_file(os.path.join(path, name))
+        if not isinstance(data, dict) or not data.get("assignments"):
+            return
 
         for assignment in data["assignments"]:
             if not assignment["target"].get("groupName"):
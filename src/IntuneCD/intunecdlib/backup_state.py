@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the state of the previous backup used by backup --incremental.
+"""
+
+import json
+import os
+import threading
+
+# Stored in the root of the backup, JSON files in the root are never archived
+STATE_FILE = ".intunecd_backup_state.json"
+# Bumped when the format of the state file changes
+STATE_FORMAT = 1
+
+_lock = threading.Lock()
+_state = None
+
+
+class BackupState:
+    """The objects written by the previous backup keyed by endpoint and object id.
+
+    The device management endpoints do not support delta queries, every object
+    keeps the lastModifiedDateTime it had when it was written as a watermark
+    instead. Assignments and scope tag names do not move the watermark, so they
+    are stored as a fingerprint next to it. An object is unchanged when both
+    match and the files it was written to still exist. The state of the previous
+    backup is discarded when it was made with different options.
+    """
+
+    def __init__(self, path: str, options: dict = None):
+        """Initializes the BackupState class
+
+        Args:
+            path (str): The path of the backup
+            options (dict, optional): The options of the backup that change the written files. Defaults to None.
+        """
+        self.file = os.path.join(path, STATE_FILE)
+        self.options = options or {}
+        self._previous = self._read()
+        self._current = {}
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        """Reads the state of the previous backup, empty when missing or outdated"""
+        try:
+            with open(self.file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("format") != STATE_FORMAT
+            or data.get("options") != self.options
+        ):
+            return {}
+
+        return data.get("endpoints", {})
+
+    @staticmethod
+    def get_watermark(data: dict) -> str:
+        """Gets the watermark of an object.
+
+        Args:
+            data (dict): The object returned by Graph
+
+        Returns:
+            str: The lastModifiedDateTime of the object, None when it has none
+        """
+        if not isinstance(data, dict) or not data.get("id"):
+            return None
+
+        return data.get("lastModifiedDateTime")
+
+    def get_outputs(self, endpoint: str, data: dict, fingerprint: str) -> list:
+        """Gets the outputs of an object that did not change since the previous backup.
+
+        Args:
+            endpoint (str): The endpoint the object belongs to
+            data (dict): The object returned by Graph
+            fingerprint (str): The fingerprint of the assignments and scope tags of the object
+
+        Returns:
+            list: The outputs written by the previous backup, None when the object has to be written
+        """
+        watermark = self.get_watermark(data)
+        if not watermark:
+            return None
+        entry = self._previous.get(endpoint, {}).get(data["id"])
+        if (
+            not entry
+            or entry.get("watermark") != watermark
+            or entry.get("fingerprint") != fingerprint
+        ):
+            return None
+
+        return list(entry.get("outputs", []))
+
+    def keep(self, endpoint: str, data: dict) -> None:
+        """Keeps the entry of an unchanged object for the next backup.
+
+        Args:
+            endpoint (str): The endpoint the object belongs to
+            data (dict): The object returned by Graph
+        """
+        entry = self._previous.get(endpoint, {}).get(data["id"])
+        with self._lock:
+            self._current.setdefault(endpoint, {})[data["id"]] = entry
+
+    def record(
+        self, endpoint: str, item_id: str, watermark: str, fingerprint: str, output
+    ) -> None:
+        """Records a written object.
+
+        Args:
+            endpoint (str): The endpoint the object belongs to
+            item_id (str): The id of the object
+            watermark (str): The lastModifiedDateTime of the object
+            fingerprint (str): The fingerprint of the assignments and scope tags of the object
+            output (str): The name of the written file without extension
+        """
+        if not item_id or not watermark:
+            return
+        with self._lock:
+            entries = self._current.setdefault(endpoint, {})
+            entry = entries.get(item_id)
+            if (
+                not entry
+                or entry["watermark"] != watermark
+                or entry["fingerprint"] != fingerprint
+            ):
+                entry = {"watermark": watermark, "fingerprint": fingerprint}
+                entry["outputs"] = []
+                entries[item_id] = entry
+            if output not in entry["outputs"]:
+                entry["outputs"].append(output)
+
+    def save(self) -> None:
+        """Writes the state of this backup, objects that were not seen are dropped."""
+        with self._lock:
+            data = {
+                "format": STATE_FORMAT,
+                "options": self.options,
+                "endpoints": self._current,
+            }
+        temp_file = f"{self.file}.{os.getpid()}"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, sort_keys=True)
+            os.replace(temp_file, self.file)
+        except OSError:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+def configure_backup_state(state: BackupState = None) -> BackupState:
+    """Configures the state used by all backup modules.
+
+    Args:
+        state (BackupState, optional): The state of an incremental backup, None writes all objects. Defaults to None.
+
+    Returns:
+        BackupState: The configured state
+    """
+    global _state
+
+    with _lock:
+        _state = state
+
+    return _state
+
+
+def get_backup_state() -> BackupState:
+    """Gets the state of the incremental backup.
+
+    Returns:
+        BackupState: The state, None when the backup is not incremental
+    """
+    with _lock:
+        return _state
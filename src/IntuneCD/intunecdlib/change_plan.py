@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the change plan written with --plan and executed with --apply.
+"""
+
+import datetime
+import gzip
+import json
+import re
+import threading
+
+PLAN_FORMAT = 1
+# Fields of a Graph object that change when the object is modified
+VERSION_FIELDS = ("@odata.etag", "version", "lastModifiedDateTime")
+PLACEHOLDER = re.compile(r"\$plan:(\d+)")
+
+_lock = threading.Lock()
+_plan = None
+
+
+def get_object_version(endpoint: str, data: dict, name: str = None) -> dict:
+    """Gets the version of a Graph object, used to detect changes made after the plan was written.
+
+    Args:
+        endpoint (str): The endpoint of the object
+        data (dict): The object as returned by Graph
+        name (str, optional): The name of the object. Defaults to None.
+
+    Returns:
+        dict: The endpoint, name and version fields of the object
+    """
+    version = {"endpoint": endpoint, "name": name}
+    for field in VERSION_FIELDS:
+        if data.get(field) is not None:
+            version[field] = data[field]
+
+    return version
+
+
+class ChangePlan:
+    """The writes an update would make, recorded in report mode.
+
+    The response of a recorded POST gets the id $plan:<operation id>, later
+    operations using that id have it replaced when the plan is applied.
+    """
+
+    def __init__(self, operations: list = None, created: str = None):
+        """Initializes the ChangePlan class
+
+        Args:
+            operations (list, optional): The recorded operations. Defaults to None.
+            created (str, optional): When the plan was written. Defaults to None.
+        """
+        self.operations = operations or []
+        self.created = (
+            created or datetime.datetime.now(datetime.timezone.utc).isoformat()
+        )
+        # Versions of the objects read while the plan is written, keyed by endpoint
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def add_objects(self, endpoint: str, objects: list) -> None:
+        """Adds the versions of objects read from Graph, used for writes made outside process_update.
+
+        Args:
+            endpoint (str): The endpoint the objects were read from
+            objects (list): The objects as returned by Graph
+        """
+        versions = {}
+        for data in objects:
+            if isinstance(data, dict) and data.get("id"):
+                object_endpoint = endpoint.split("?")[0].rstrip("/") + "/" + data["id"]
+                versions[object_endpoint] = get_object_version(
+                    object_endpoint, data, data.get("displayName", data.get("name"))
+                )
+        with self._lock:
+            self.objects.update(versions)
+
+    def _get_target(self, module, endpoint: str) -> dict:
+        """Gets the version of the object a write changes.
+
+        The object set by the module is only used when the write is made to it,
+        other writes use the object read from the longest matching endpoint.
+
+        Args:
+            module (BaseGraphModule): The module making the write
+            endpoint (str): The endpoint of the write
+
+        Returns:
+            dict: The version of the object, empty when the object was not read
+        """
+        target = getattr(module, "plan_object", None) or {}
+        object_endpoint = target.get("endpoint")
+        if object_endpoint and (
+            endpoint == object_endpoint or endpoint.startswith(object_endpoint + "/")
+        ):
+            return target
+
+        path = endpoint.rstrip("/")
+        with self._lock:
+            while "/" in path:
+                if path in self.objects:
+                    return self.objects[path]
+                path = path.rsplit("/", 1)[0]
+
+        return {}
+
+    def record(
+        self,
+        module,
+        method: str,
+        endpoint: str,
+        params: dict = None,
+        data=None,
+        status_code: int = 200,
+    ) -> dict:
+        """Records a write.
+
+        Args:
+            module (BaseGraphModule): The module making the write
+            method (str): The HTTP method
+            endpoint (str): The endpoint of the write
+            params (dict, optional): The query parameters. Defaults to None.
+            data (optional): The body as dict or JSON string. Defaults to None.
+            status_code (int, optional): The expected status code. Defaults to 200.
+
+        Returns:
+            dict: The response used in place of the Graph response
+        """
+        if isinstance(data, (str, bytes)):
+            data = json.loads(data)
+        target = self._get_target(module, endpoint)
+
+        with self._lock:
+            operation_id = len(self.operations) + 1
+            self.operations.append(
+                {
+                    "id": operation_id,
+                    "type": getattr(module, "config_type", None),
+                    "name": target.get("name") or getattr(module, "name", None),
+                    "method": method.upper(),
+                    "endpoint": endpoint,
+                    "params": params or None,
+                    "data": data,
+                    "status_code": status_code,
+                    "object": target or None,
+                }
+            )
+
+        if method.upper() == "POST":
+            response = dict(data) if isinstance(data, dict) else {}
+            response["id"] = f"$plan:{operation_id}"
+            return response
+
+        return {}
+
+    def save(self, path: str) -> None:
+        """Writes the plan as gzip compressed JSON.
+
+        Args:
+            path (str): The path of the plan file
+        """
+        plan = {
+            "format": PLAN_FORMAT,
+            "created": self.created,
+            "operations": self.operations,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(plan, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "ChangePlan":
+        """Reads a plan written with save.
+
+        Args:
+            path (str): The path of the plan file
+
+        Raises:
+            ValueError: When the file is not a plan of a supported format
+
+        Returns:
+            ChangePlan: The plan
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            plan = json.load(f)
+        if plan.get("format") != PLAN_FORMAT:
+            raise ValueError(f"Unsupported plan format {plan.get('format')}")
+
+        return cls(plan["operations"], plan.get("created"))
+
+
+def configure_change_plan(plan: ChangePlan = None) -> ChangePlan:
+    """Configures the plan writes are recorded in, None stops recording.
+
+    Args:
+        plan (ChangePlan, optional): The plan to record in. Defaults to None.
+
+    Returns:
+        ChangePlan: The configured plan
+    """
+    global _plan
+
+    with _lock:
+        _plan = plan
+
+    return _plan
+
+
+def get_change_plan() -> ChangePlan:
+    """Gets the plan writes are recorded in.
+
+    Returns:
+        ChangePlan: The plan, None when no plan is being written
+    """
+    return _plan
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the native diff engine, an alternative to DeepDiff used by the update modules.
+
+The engine follows the list pairing of DeepDiff with ignore_order, but it is not an exact copy.
+Known differences:
+    - Lists that only differ in repeated items, such as [1, 1] and [1], are equal for DeepDiff
+      and reported as changed by the native engine.
+    - When a list item is paired with an item of another type, DeepDiff can report the paired
+      item at the index of the other item and merge it with changes in the nested lists.
+"""
+
+import threading
+
+from .fingerprint import canonical
+
+DIFF_ENGINES = ("deepdiff", "native")
+# The thresholds below are the defaults of DeepDiff
+# Paired list items with a larger distance are reported as added and removed
+CUTOFF_DISTANCE_FOR_PAIRS = 0.3
+# Changed list items are not paired when a larger share of the items changed
+CUTOFF_INTERSECTION_FOR_PAIRS = 0.7
+# Dicts sharing a smaller share of their keys are reported as a single changed value
+THRESHOLD_TO_DIFF_DEEPER = 0.33
+# Above this number of comparisons changed list items are not paired
+MAX_PAIR_COMPARISONS = 10000
+
+_lock = threading.Lock()
+_diff_engine = "deepdiff"
+
+
+class DiffPath(str):
+    """DeepDiff style path such as root['settings'][0]['value'], with the path parts kept.
+
+    Attributes:
+        parts (tuple): The dict keys and list indexes of the path
+    """
+
+    def __new__(cls, parts: tuple):
+        path = "root" + "".join(
+            f"[{part}]" if isinstance(part, int) else f"['{part}']" for part in parts
+        )
+        obj = super().__new__(cls, path)
+        obj.parts = parts
+        return obj
+
+
+class NativeDiff:
+    """Structural diff of two JSON documents, lists are compared ignoring order.
+
+    The result uses the DeepDiff keys consumed by BaseUpdateModule, values_changed,
+    type_changes, iterable_item_added, iterable_item_removed, dictionary_item_added
+    and dictionary_item_removed. Paths are DiffPath instances.
+    """
+
+    def __init__(self, exclude_paths=None):
+        """Initializes the NativeDiff class
+
+        Args:
+            exclude_paths (list, optional): DeepDiff style paths to leave out. Defaults to None.
+        """
+        if isinstance(exclude_paths, str):
+            exclude_paths = [exclude_paths]
+        self.exclude_paths = set(exclude_paths or [])
+        self.result = {}
+
+    def _report(self, report_type: str, parts: tuple, value) -> None:
+        """Adds a change to the result"""
+        self.result.setdefault(report_type, {})[DiffPath(parts)] = value
+
+    def _excluded(self, parts: tuple) -> bool:
+        """Whether the path is excluded"""
+        return bool(self.exclude_paths) and DiffPath(parts) in self.exclude_paths
+
+    def diff(self, old, new, parts: tuple = ()) -> None:
+        """Compares old to new and adds the changes to the result.
+
+        Args:
+            old: The old value
+            new: The new value
+            parts (tuple, optional): The path of the values. Defaults to ().
+        """
+        if self._excluded(parts):
+            return
+
+        if type(old) is not type(new):
+            self._report(
+                "type_changes",
+                parts,
+                {
+                    "old_type": type(old),
+                    "new_type": type(new),
+                    "old_value": old,
+                    "new_value": new,
+                },
+            )
+        elif isinstance(old, dict):
+            self._diff_dict(old, new, parts)
+        elif isinstance(old, list):
+            self._diff_list(old, new, parts)
+        elif old != new:
+            self._report("values_changed", parts, {"new_value": new, "old_value": old})
+
+    def _diff_dict(self, old: dict, new: dict, parts: tuple) -> None:
+        """Compares two dicts"""
+        keys = [
+            key for key in old.keys() | new.keys() if not self._excluded(parts + (key,))
+        ]
+        common = old.keys() & new.keys()
+        if len(keys) > 1 and len(common) / len(keys) < THRESHOLD_TO_DIFF_DEEPER:
+            self._report("values_changed", parts, {"new_value": new, "old_value": old})
+            return
+
+        for key in old:
+            if key not in new:
+                if not self._excluded(parts + (key,)):
+                    self.result.setdefault("dictionary_item_removed", []).append(
+                        DiffPath(parts + (key,))
+                    )
+            else:
+                self.diff(old[key], new[key], parts + (key,))
+        for key in new:
+            if key not in old and not self._excluded(parts + (key,)):
+                self.result.setdefault("dictionary_item_added", []).append(
+                    DiffPath(parts + (key,))
+                )
+
+    def _diff_list(self, old: list, new: list, parts: tuple) -> None:
+        """Compares two lists ignoring order, items are matched on their hash"""
+        old_hashes = {}
+        for index, item in enumerate(old):
+            old_hashes.setdefault(canonical(item), index)
+        new_hashes = {}
+        for index, item in enumerate(new):
+            new_hashes.setdefault(canonical(item), index)
+
+        removed = [
+            index
+            for item_hash, index in old_hashes.items()
+            if item_hash not in new_hashes
+        ]
+        added = [
+            index
+            for item_hash, index in new_hashes.items()
+            if item_hash not in old_hashes
+        ]
+
+        # Pair changed items so the change inside the item is reported
+        pairs = self._get_pairs(old, new, removed, added)
+        paired_old = {old_index for old_index, _ in pairs}
+        paired_new = {new_index for _, new_index in pairs}
+        for old_index, new_index in pairs:
+            self.diff(old[old_index], new[new_index], parts + (old_index,))
+
+        # Like DeepDiff, an item removed and an item added at the same index are a changed value
+        removed = [index for index in removed if index not in paired_old]
+        added = [index for index in added if index not in paired_new]
+        changed = set(removed) & set(added)
+        for index in removed:
+            if index in changed:
+                self._report(
+                    "values_changed",
+                    parts + (index,),
+                    {"new_value": new[index], "old_value": old[index]},
+                )
+            else:
+                self._report("iterable_item_removed", parts + (index,), old[index])
+        for index in added:
+            if index not in changed:
+                self._report("iterable_item_added", parts + (index,), new[index])
+
+    def _get_pairs(self, old: list, new: list, removed: list, added: list) -> list:
+        """Pairs removed and added items that are close to each other.
+
+        Returns:
+            list: Tuples of the old and new index of the paired items
+        """
+        if not removed or not added:
+            return []
+        if len(removed) * len(added) > MAX_PAIR_COMPARISONS:
+            return []
+        changed = (len(removed) + len(added)) / (len(old) + len(new) + 1)
+        if changed > CUTOFF_INTERSECTION_FOR_PAIRS:
+            return []
+
+        old_lengths = {i: _get_rough_length(old[i]) for i in removed}
+        new_lengths = {i: _get_rough_length(new[i]) for i in added}
+        # The removed items close to each added item, grouped by distance
+        candidates = {}
+        for new_index in added:
+            for old_index in removed:
+                if _is_number(old[old_index]) and _is_number(new[new_index]):
+                    distance = _get_numbers_distance(old[old_index], new[new_index])
+                else:
+                    distance = _get_distance(old[old_index], new[new_index]) / (
+                        old_lengths[old_index] + new_lengths[new_index]
+                    )
+                if distance < CUTOFF_DISTANCE_FOR_PAIRS:
+                    candidates.setdefault(distance, {}).setdefault(
+                        new_index, []
+                    ).append(old_index)
+
+        # Pair in the order of DeepDiff, the closest distance first starting with the
+        # last added item. All removed items at that distance are used up and the
+        # first one of them is the pair.
+        pairs = []
+        paired_old = set()
+        paired_new = set()
+        for distance in sorted(candidates):
+            for new_index in reversed(list(candidates[distance])):
+                if new_index in paired_new:
+                    continue
+                pair = None
+                for old_index in reversed(candidates[distance][new_index]):
+                    if old_index not in paired_old:
+                        paired_old.add(old_index)
+                        pair = old_index
+                if pair is not None:
+                    paired_new.add(new_index)
+                    pairs.append((pair, new_index))
+
+        return pairs
+
+
+def _is_number(data) -> bool:
+    """Whether data is a number, booleans included as in DeepDiff"""
+    return isinstance(data, (int, float))
+
+
+def _get_numbers_distance(old, new) -> float:
+    """Gets the distance of two numbers, scaled so that most numbers can be paired"""
+    if old == new:
+        return 0
+    divisor = (float(old) + float(new)) / CUTOFF_DISTANCE_FOR_PAIRS
+    if divisor == 0:
+        return CUTOFF_DISTANCE_FOR_PAIRS
+
+    return min(CUTOFF_DISTANCE_FOR_PAIRS, abs((float(old) - float(new)) / divisor))
+
+
+def _get_rough_length(data) -> int:
+    """Gets the number of values that make up data, keys of dicts included"""
+    if isinstance(data, dict):
+        return 1 + sum(1 + _get_rough_length(value) for value in data.values())
+    if isinstance(data, list):
+        return 1 + sum(_get_rough_length(value) for value in data)
+    return 1
+
+
+def _get_length(data) -> int:
+    """Gets the number of scalar values in data, None is not counted as in DeepDiff"""
+    if isinstance(data, dict):
+        return sum(_get_length(value) for value in data.values())
+    if isinstance(data, list):
+        return sum(_get_length(value) for value in data)
+    return 0 if data is None else 1
+
+
+def _is_converted(change: dict) -> bool:
+    """Whether the new value of a type change is the old value converted to the new type"""
+    try:
+        return change["new_type"](change["old_value"]) == change["new_value"]
+    except Exception:  # pylint: disable=broad-except
+        return False
+
+
+def _get_value(data, parts: tuple):
+    """Gets the value at the path parts of data"""
+    for part in parts:
+        data = data[part]
+    return data
+
+
+def _get_distance(old, new) -> int:
+    """Gets the number of values that have to change to turn old into new"""
+    result = native_diff(old, new)
+    distance = 0
+    for report_type, changes in result.items():
+        for path in changes:
+            if report_type == "dictionary_item_removed":
+                distance += _get_length(_get_value(old, path.parts))
+            elif report_type == "dictionary_item_added":
+                distance += _get_length(_get_value(new, path.parts))
+            elif report_type == "type_changes":
+                distance += 1
+                if not _is_converted(changes[path]):
+                    distance += _get_length(changes[path]["new_value"])
+            elif report_type == "values_changed":
+                distance += _get_length(changes[path]["new_value"])
+            else:
+                distance += _get_length(changes[path])
+
+    return distance
+
+
+def native_diff(old, new, exclude_paths=None) -> dict:
+    """Compares old to new with the native diff engine.
+
+    Args:
+        old: The old value, the data in Intune
+        new: The new value, the data in the repository
+        exclude_paths (list, optional): DeepDiff style paths to leave out. Defaults to None.
+
+    Returns:
+        dict: The changes, empty when old and new are equal
+    """
+    engine = NativeDiff(exclude_paths)
+    engine.diff(old, new)
+
+    return engine.result
+
+
+def configure_diff_engine(diff_engine: str = None) -> str:
+    """Configures the diff engine used by the update modules.
+
+    Args:
+        diff_engine (str, optional): deepdiff or native. Defaults to None, which uses deepdiff.
+
+    Returns:
+        str: The configured diff engine
+    """
+    global _diff_engine
+
+    diff_engine = diff_engine or "deepdiff"
+    if diff_engine not in DIFF_ENGINES:
+        raise ValueError(f"Unknown diff engine {diff_engine}")
+
+    with _lock:
+        _diff_engine = diff_engine
+
+    return _diff_engine
+
+
+def get_diff_engine() -> str:
+    """Gets the diff engine used by the update modules.
+
+    Returns:
+        str: deepdiff or native
+    """
+    return _diff_engine
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the directory cache shared by all modules in a backup or update run.
+"""
+
+import threading
+from urllib.parse import quote
+
+FILTER_ENDPOINT = "https://graph.microsoft.com/beta/deviceManagement/assignmentFilters"
+GROUP_ENDPOINT = "https://graph.microsoft.com/beta/groups"
+SCOPE_TAG_ENDPOINT = "https://graph.microsoft.com/beta/deviceManagement/roleScopeTags"
+NOTIFICATION_TEMPLATE_ENDPOINT = (
+    "https://graph.microsoft.com/beta/deviceManagement/notificationMessageTemplates"
+)
+REUSABLE_SETTING_ENDPOINT = (
+    "https://graph.microsoft.com/beta/deviceManagement/reusablePolicySettings"
+)
+# Maximum number of values Graph accepts in a single in (...) filter
+GROUP_NAME_FILTER_SIZE = 15
+
+_lock = threading.Lock()
+_cache = None
+
+
+class DirectoryCache:
+    """Thread safe cache of groups, filters, scope tags, notification templates and reusable settings.
+
+    Lookups are single-flight, when several modules ask for the same key at the
+    same time only the first one makes the request and the others wait for its
+    result. Missing groups are cached as None so they are not requested again.
+    """
+
+    def __init__(self):
+        """Initializes the DirectoryCache class"""
+        self.groups_by_id = {}
+        self.groups_by_name = {}
+        self.notification_templates = {}
+        # Values loaded with a single request, such as all filters or all scope tags
+        self._directory = {}
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._create_locks = {}
+
+    def _load(self, kind: str, keys: list, store: dict, fetch) -> None:
+        """Loads the keys missing from store, waiting for keys already being loaded.
+
+        Args:
+            kind (str): The kind of key, used to keep the in flight keys apart
+            keys (list): The keys to load
+            store (dict): The dict the loaded values are stored in
+            fetch: Called with the list of keys to load, returns a dict of the loaded values
+        """
+        waits = []
+        missing = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in store:
+                    continue
+                event = self._in_flight.get((kind, key))
+                if event is not None:
+                    waits.append(event)
+                else:
+                    missing.append(key)
+            if missing:
+                loaded = threading.Event()
+                for key in missing:
+                    self._in_flight[(kind, key)] = loaded
+
+        if missing:
+            try:
+                values = fetch(missing)
+                with self._lock:
+                    for key in missing:
+                        store[key] = values.get(key)
+            finally:
+                # Keys are not stored when the request failed, the next lookup retries them
+                with self._lock:
+                    for key in missing:
+                        self._in_flight.pop((kind, key), None)
+                loaded.set()
+
+        for event in waits:
+            event.wait()
+
+    def get_groups(self, module, group_ids: list) -> dict:
+        """Gets the groups by ID, groups not in the cache are requested in one batch.
+
+        Args:
+            module (BaseGraphModule): The module used to make the requests
+            group_ids (list): The group IDs to get
+
+        Returns:
+            dict: The groups keyed by ID, groups that do not exist are left out
+        """
+
+        def fetch(ids):
+            responses = module.batch_request(
+                ids, "groups/", "?$select=displayName,id,groupTypes,membershipRule"
+            )
+            return {group.get("id"): group for group in responses if group}
+
+        self._load("group_id", group_ids, self.groups_by_id, fetch)
+
+        return {
+            g_id: self.groups_by_id[g_id]
+            for g_id in group_ids
+            if self.groups_by_id.get(g_id)
+        }
+
+    def get_group_by_name(self, module, name: str) -> dict:
+        """Gets a group by display name.
+
+        Args:
+            module (BaseGraphModule): The module used to make the request
+            name (str): The display name of the group
+
+        Returns:
+            dict: The group, None if no group with the name exists
+        """
+
+        def fetch(names):
+            name = names[0]
+            escaped = name.replace("'", "''")
+            request = module.make_graph_request(
+                endpoint=GROUP_ENDPOINT,
+                params={"$filter": f"displayName eq '{escaped}'"},
+            )
+            return {name: request["value"][0]} if request.get("value") else {}
+
+        self._load("group_name", [name], self.groups_by_name, fetch)
+
+        return self.groups_by_name.get(name)
+
+    def get_groups_by_name(self, module, names: list) -> dict:
+        """Gets groups by display name, names not in the cache are resolved in bulk.
+
+        The names are combined in displayName in (...) filters, each filter is a
+        sub-request of a $batch request.
+
+        Args:
+            module (BaseGraphModule): The module used to make the requests
+            names (list): The display names of the groups
+
+        Returns:
+            dict: The groups keyed by display name, names without a group are left out
+        """
+
+        def fetch(missing):
+            filters = []
+            for i in range(0, len(missing), GROUP_NAME_FILTER_SIZE):
+                chunk = missing[i : i + GROUP_NAME_FILTER_SIZE]
+                values = ",".join("'" + name.replace("'", "''") + "'" for name in chunk)
+                filters.append(quote(f"displayName in ({values})"))
+
+            responses = module.batch_request(
+                filters, "groups?$select=id,displayName&$filter=", ""
+            )
+            by_name = {}
+            by_folded_name = {}
+            for response in responses:
+                for group in (response or {}).get("value", []):
+                    by_name.setdefault(group["displayName"], group)
+                    by_folded_name.setdefault(group["displayName"].casefold(), group)
+
+            # Graph compares display names case insensitive, prefer an exact match
+            return {
+                name: by_name.get(name) or by_folded_name.get(name.casefold())
+                for name in missing
+            }
+
+        self._load("group_name", names, self.groups_by_name, fetch)
+
+        return {
+            name: self.groups_by_name[name]
+            for name in names
+            if self.groups_by_name.get(name)
+        }
+
+    def add_group(self, group: dict) -> None:
+        """Adds a group created during the run to the cache.
+
+        Args:
+            group (dict): The group returned by Graph
+        """
+        with self._lock:
+            self.groups_by_id[group["id"]] = group
+            self.groups_by_name[group["displayName"]] = group
+
+    def create_group(self, name: str, create) -> dict:
+        """Creates a missing group once, callers creating the same group wait for it.
+
+        Args:
+            name (str): The display name of the group
+            create: Called without arguments to create the group, returns the group
+
+        Returns:
+            dict: The created group, or the group created by another caller
+        """
+        with self._lock:
+            group = self.groups_by_name.get(name)
+            if group:
+                return group
+            lock = self._create_locks.setdefault(name, threading.Lock())
+
+        with lock:
+            group = self.groups_by_name.get(name)
+            if group:
+                return group
+            group = create()
+            if group.get("id"):
+                self.add_group(group)
+
+        return group
+
+    def _get_filters(self, module) -> tuple:
+        """Loads all assignment filters with a single request.
+
+        Args:
+            module (BaseGraphModule): The module used to make the request
+
+        Returns:
+            tuple: The filters keyed by ID and the filters keyed by display name
+        """
+
+        def fetch(_):
+            filters = module.make_graph_request(endpoint=FILTER_ENDPOINT)
+            by_id = {}
+            by_name = {}
+            for intune_filter in filters.get("value", []):
+                by_id[intune_filter["id"]] = intune_filter
+                by_name.setdefault(intune_filter["displayName"], intune_filter)
+            return {"filters": (by_id, by_name)}
+
+        self._load("filters", ["filters"], self._directory, fetch)
+
+        return self._directory.get("filters") or ({}, {})
+
+    def get_filters_by_id(self, module) -> dict:
+        """Gets all assignment filters keyed by ID.
+
+        Args:
+            module (BaseGraphModule): The module used to make the request
+
+        Returns:
+            dict: The filters keyed by ID
+        """
+        return self._get_filters(module)[0]
+
+    def get_filters_by_name(self, module) -> dict:
+        """Gets all assignment filters keyed by display name.
+
+        Args:
+            module (BaseGraphModule): The module used to make the request
+
+        Returns:
+            dict: The filters keyed by display name
+        """
+        return self._get_filters(module)[1]
+
+    def invalidate_filters(self) -> None:
+        """Drops the cached filters, the next lookup requests them again."""
+        with self._lock:
+            self._directory.pop("filters", None)
+
+    def invalidate_scope_tags(self) -> None:
+        """Drops the cached scope tags, the next lookup requests them again."""
+        with self._lock:
+            self._directory.pop("scope_tags", None)
+
+    def get_scope_tags(self, module) -> list:
+        """Gets all scope tags.
+
+        Args:
+            module (BaseGraphModule): The module used to make the request
+
+        Returns:
+            list: The scope tags
+        """
+
+        def fetch(_):
+            data = module.make_graph_request(SCOPE_TAG_ENDPOINT)
+            return {"scope_tags": data["value"]}
+
+        self._load("scope_tags", ["scope_tags"], self._directory, fetch)
+
+        return self._directory.get("scope_tags")
+
+    def get_notification_templates(self, module, template_ids: list) -> dict:
+        """Gets notification templates by ID, templates not in the cache are requested in one batch.
+
+        Args:
+            module (BaseGraphModule): The module used to make the requests
+            template_ids (list): The notification template IDs to get
+
+        Returns:
+            dict: The notification templates keyed by ID, templates that do not exist are left out
+        """
+
+        def fetch(ids):
+            return module.batch_request_by_key(
+                ids, "deviceManagement/notificationMessageTemplates/", ""
+            )
+
+        self._load(
+            "notification_template",
+            template_ids,
+            self.notification_templates,
+            fetch,
+        )
+
+        return {
+            t_id: self.notification_templates[t_id]
+            for t_id in template_ids
+            if self.notification_templates.get(t_id)
+        }
+
+    def get_notification_templates_by_name(self, module) -> dict:
+        """Gets all notification templates keyed by display name.
+
+        Args:
+            module (BaseGraphModule): The module used to make the request
+
+        Returns:
+            dict: The notification templates keyed by display name
+        """
+
+        def fetch(_):
+            data = module.make_graph_request(NOTIFICATION_TEMPLATE_ENDPOINT)
+            return {
+                "notification_templates": {
+                    template["displayName"]: template for template in data["value"]
+                }
+            }
+
+        self._load(
+            "notification_templates",
+            ["notification_templates"],
+            self._directory,
+            fetch,
+        )
+
+        return self._directory.get("notification_templates")
+
+    def invalidate_notification_templates(self) -> None:
+        """Drops the cached notification templates, the next lookup requests them again."""
+        with self._lock:
+            self._directory.pop("notification_templates", None)
+            self.notification_templates = {}
+
+    def get_reusable_settings_by_name(self, module) -> dict:
+        """Gets all reusable policy settings keyed by display name.
+
+        Args:
+            module (BaseGraphModule): The module used to make the request
+
+        Returns:
+            dict: The reusable policy settings with their id and display name keyed by display name
+        """
+
+        def fetch(_):
+            data = module.make_graph_request(
+                REUSABLE_SETTING_ENDPOINT, params={"$select": "id,displayName"}
+            )
+            return {
+                "reusable_settings": {
+                    setting["displayName"]: setting for setting in data["value"]
+                }
+            }
+
+        self._load("reusable_settings", ["reusable_settings"], self._directory, fetch)
+
+        return self._directory.get("reusable_settings")
+
+    def invalidate_reusable_settings(self) -> None:
+        """Drops the cached reusable policy settings, the next lookup requests them again."""
+        with self._lock:
+            self._directory.pop("reusable_settings", None)
+
+
+def get_directory_cache() -> DirectoryCache:
+    """Gets the directory cache of the current run, creating it if needed.
+
+    Returns:
+        DirectoryCache: The shared directory cache
+    """
+    global _cache
+
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = DirectoryCache()
+
+    return _cache
+
+
+def reset_directory_cache() -> DirectoryCache:
+    """Starts a new directory cache, called at the start of every run.
+
+    Returns:
+        DirectoryCache: The new directory cache
+    """
+    global _cache
+
+    with _lock:
+        _cache = DirectoryCache()
+
+    return _cache
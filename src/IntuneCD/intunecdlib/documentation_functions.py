@@ -8,14 +8,14 @@ This module contains all functions for the documentation.
 import base64
 import binascii
 import glob
-import json
 import os
 import platform
 import re
 
-import yaml
 from pytablewriter import MarkdownTableWriter
 
+from .parse_cache import get_parse_cache
+
 
 def md_file(outpath):
     """
@@ -336,13 +336,9 @@ def document_configs(
 
         try:
             # Load data
-            with open(filename, encoding="utf-8") as f:
-                if filename.endswith((".yaml", ".yml")):
-                    repo_data = json.loads(json.dumps(yaml.safe_load(f)))
-                elif filename.endswith(".json"):
-                    repo_data = json.load(f)
-                else:
-                    continue
+            if not filename.endswith((".yaml", ".yml", ".json")):
+                continue
+            repo_data = get_parse_cache().load(filename)
 
             # Prepare assignments table
             assignments_table = assignment_table(repo_data)
@@ -444,87 +440,82 @@ def document_management_intents(configpath, outpath, header, split):
             if filename == ".DS_Store":
                 continue
 
-            # Check which format the file is saved as then open file, load data and set query parameter
-            with open(filename, encoding="utf-8") as f:
-                if filename.endswith(".yaml"):
-                    data = json.dumps(yaml.safe_load(f))
-                    repo_data = json.loads(data)
-                elif filename.endswith(".json"):
-                    f = open(filename, encoding="utf-8")
-                    repo_data = json.load(f)
-
-                # Create assignments table
-                assignments_table = ""
-                assignments_table = assignment_table(repo_data)
-                repo_data.pop("assignments", None)
-
-                intent_settings_list = []
-                for setting in repo_data["settingsDelta"]:
-                    setting_definition = setting["definitionId"].split("_")[1]
-                    setting_definition = (
-                        setting_definition[0].upper() + setting_definition[1:]
-                    )
-                    setting_definition = re.findall("[A-Z][^A-Z]*", setting_definition)
-                    setting_definition = " ".join(setting_definition)
-
-                    vals = []
-                    value = str(remove_characters(setting["valueJson"]))
-                    comma = re.findall("[:][^:]*", value)
-                    for v in value.split(","):
-                        v = v.replace(" ", "")
-                        if comma:
+            if not filename.endswith((".yaml", ".json")):
+                continue
+            repo_data = get_parse_cache().load(filename)
+
+            # Create assignments table
+            assignments_table = ""
+            assignments_table = assignment_table(repo_data)
+            repo_data.pop("assignments", None)
+
+            intent_settings_list = []
+            for setting in repo_data["settingsDelta"]:
+                setting_definition = setting["definitionId"].split("_")[1]
+                setting_definition = (
+                    setting_definition[0].upper() + setting_definition[1:]
+                )
+                setting_definition = re.findall("[A-Z][^A-Z]*", setting_definition)
+                setting_definition = " ".join(setting_definition)
+
+                vals = []
+                value = str(remove_characters(setting["valueJson"]))
+                comma = re.findall("[:][^:]*", value)
+                for v in value.split(","):
+                    v = v.replace(" ", "")
+                    if comma:
+                        v = f'**{v.replace(":", ":** ")}'
+                    vals.append(v)
+                value = ",".join(vals)
+                value = value.replace(",", "<br />")
+
+                intent_settings_list.append([setting_definition, value])
+
+            repo_data.pop("settingsDelta")
+
+            description = ""
+            if "description" in repo_data:
+                if repo_data["description"] is not None:
+                    description = repo_data["description"]
+                    repo_data.pop("description")
+
+            intent_table_list = []
+
+            for key, value in zip(
+                repo_data.keys(), clean_list(repo_data.values(), decode=False)
+            ):
+                key = key[0].upper() + key[1:]
+                key = re.findall("[A-Z][^A-Z]*", key)
+                key = " ".join(key)
+
+                if value and isinstance(value, str):
+                    if len(value.split(",")) > 1:
+                        vals = []
+                        for v in value.split(","):
+                            v = v.replace(" ", "")
                             v = f'**{v.replace(":", ":** ")}'
-                        vals.append(v)
-                    value = ",".join(vals)
-                    value = value.replace(",", "<br />")
-
-                    intent_settings_list.append([setting_definition, value])
-
-                repo_data.pop("settingsDelta")
-
-                description = ""
-                if "description" in repo_data:
-                    if repo_data["description"] is not None:
-                        description = repo_data["description"]
-                        repo_data.pop("description")
-
-                intent_table_list = []
-
-                for key, value in zip(
-                    repo_data.keys(), clean_list(repo_data.values(), decode=False)
-                ):
-                    key = key[0].upper() + key[1:]
-                    key = re.findall("[A-Z][^A-Z]*", key)
-                    key = " ".join(key)
-
-                    if value and isinstance(value, str):
-                        if len(value.split(",")) > 1:
-                            vals = []
-                            for v in value.split(","):
-                                v = v.replace(" ", "")
-                                v = f'**{v.replace(":", ":** ")}'
-                                vals.append(v)
-                            value = ",".join(vals)
-                            value = value.replace(",", "<br />")
-
-                    intent_table_list.append([key, value])
-
-                table = intent_table_list + intent_settings_list
-
-                config_table = write_table(table)
-                # Write data to file
-                with open(outpath, "a", encoding="utf-8") as md:
-                    if "displayName" in repo_data:
-                        md.write("### " + repo_data["displayName"] + "\n")
-                    if "name" in repo_data:
-                        md.write("### " + repo_data["name"] + "\n")
-                    if description:
-                        md.write(f"Description: {escape_markdown(description)} \n")
-                    if assignments_table:
-                        md.write("#### Assignments \n")
-                        md.write(str(assignments_table) + "\n")
-                    md.write("#### Configuration \n")
-                    md.write(str(config_table) + "\n")
+                            vals.append(v)
+                        value = ",".join(vals)
+                        value = value.replace(",", "<br />")
+
+                intent_table_list.append([key, value])
+
+            table = intent_table_list + intent_settings_list
+
+            config_table = write_table(table)
+            # Write data to file
+            with open(outpath, "a", encoding="utf-8") as md:
+                if "displayName" in repo_data:
+                    md.write("### " + repo_data["displayName"] + "\n")
+                if "name" in repo_data:
+                    md.write("### " + repo_data["name"] + "\n")
+                if description:
+                    md.write(f"Description: {escape_markdown(description)} \n")
+                if assignments_table:
+                    md.write("#### Assignments \n")
+                    md.write(str(assignments_table) + "\n")
+                md.write("#### Configuration \n")
+                md.write(str(config_table) + "\n")
 
 
 def split_per_config_index_md(configpath, header):
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module creates order insensitive fingerprints of configurations to skip diffing unchanged data.
+"""
+
+import hashlib
+import json
+import re
+
+EXCLUDE_PATH = re.compile(r"^root((?:\['[^']*'\])+)$")
+EXCLUDE_PATH_KEY = re.compile(r"\['([^']*)'\]")
+
+
+def _get_exclude_tree(exclude_paths) -> dict:
+    """Parses the exclude paths to a tree of dict keys.
+
+    Args:
+        exclude_paths (list): DeepDiff exclude paths such as root['assignments']
+
+    Returns:
+        dict: Nested dict of the excluded keys, True marks a removed key. None if a
+        path can not be represented, for example when it contains a list index.
+    """
+    if isinstance(exclude_paths, str):
+        exclude_paths = [exclude_paths]
+
+    tree = {}
+    for path in exclude_paths or []:
+        match = EXCLUDE_PATH.match(path)
+        if not match:
+            return None
+        keys = EXCLUDE_PATH_KEY.findall(match.group(1))
+        node = tree
+        for key in keys[:-1]:
+            child = node.setdefault(key, {})
+            if child is True:
+                break
+            node = child
+        else:
+            node[keys[-1]] = True
+
+    return tree
+
+
+def canonical(data, exclude: dict = None) -> str:
+    """Serializes data with sorted dict keys and sorted lists.
+
+    Args:
+        data: The data to serialize
+        exclude (dict, optional): Tree of dict keys to leave out. Defaults to None.
+
+    Returns:
+        str: The canonical representation of data
+    """
+    if isinstance(data, dict):
+        items = []
+        for key in sorted(data):
+            if not isinstance(key, str):
+                raise TypeError(f"Unsupported key type {type(key).__name__}")
+            child = exclude.get(key) if exclude else None
+            if child is True:
+                continue
+            items.append(json.dumps(key) + ":" + canonical(data[key], child))
+        return "{" + ",".join(items) + "}"
+
+    if isinstance(data, list):
+        # Order is ignored, the same way DeepDiff is called with ignore_order
+        return "[" + ",".join(sorted(canonical(value) for value in data)) + "]"
+
+    if data is None or isinstance(data, (str, bool, int, float)):
+        return json.dumps(data)
+
+    raise TypeError(f"Unsupported type {type(data).__name__}")
+
+
+def fingerprint(data, exclude_paths=None) -> str:
+    """Creates an order insensitive fingerprint of data.
+
+    Equal fingerprints mean DeepDiff with ignore_order and the same exclude paths
+    finds no differences. Different fingerprints do not guarantee a difference.
+
+    Args:
+        data: The data to fingerprint
+        exclude_paths (list, optional): DeepDiff exclude paths. Defaults to None.
+
+    Returns:
+        str: The fingerprint, None if the data or exclude paths are not supported
+    """
+    exclude = _get_exclude_tree(exclude_paths)
+    if exclude is None:
+        return None
+
+    try:
+        serialized = canonical(data, exclude)
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module holds the shared HTTP session used for all requests to Microsoft Graph and Azure.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Default pool size, matches the default value of --max-workers
+DEFAULT_POOL_SIZE = 10
+
+_lock = threading.Lock()
+_session = None
+_pool_size = DEFAULT_POOL_SIZE
+
+
+def _create_session(pool_size: int) -> requests.Session:
+    """Creates a session with a connection pool mounted for https.
+
+    Args:
+        pool_size (int): The maximum number of connections to keep alive per host
+
+    Returns:
+        requests.Session: The configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+    )
+
+    return session
+
+
+def configure_session(max_workers: int = None) -> requests.Session:
+    """Configures the shared session, the pool size is tied to the number of workers.
+
+    Every worker thread can run a module that in turn runs batch requests,
+    the pool is therefore sized to twice the number of workers to avoid
+    connections being discarded when the pool is full.
+
+    Args:
+        max_workers (int, optional): The maximum number of workers used for the run. Defaults to None.
+
+    Returns:
+        requests.Session: The configured session
+    """
+    global _session, _pool_size
+
+    pool_size = max(int(max_workers or DEFAULT_POOL_SIZE) * 2, DEFAULT_POOL_SIZE)
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _pool_size = pool_size
+        _session = _create_session(pool_size)
+
+    return _session
+
+
+def get_session() -> requests.Session:
+    """Gets the shared session, creating it with the default pool size if needed.
+
+    Returns:
+        requests.Session: The shared session
+    """
+    global _session
+
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _create_session(_pool_size)
+
+    return _session
+
+
+def close_session() -> None:
+    """Closes the shared session and releases the pooled connections."""
+    global _session
+
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the scheduler running update modules in the order of their dependencies.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def check_dependencies(names: list, dependencies: dict) -> dict:
+    """Gets the dependencies of the modules that are part of the run.
+
+    Dependencies on modules that are not part of the run are left out.
+
+    Args:
+        names (list): The names of the modules of the run
+        dependencies (dict): The names of the prerequisites keyed by module name
+
+    Raises:
+        ValueError: When the dependencies contain a cycle
+
+    Returns:
+        dict: The prerequisites of every module of the run
+    """
+    prerequisites = {
+        name: [
+            dep for dep in dependencies.get(name, ()) if dep in names and dep != name
+        ]
+        for name in names
+    }
+
+    # Kahn's algorithm, modules left over are part of a cycle
+    remaining = {name: len(deps) for name, deps in prerequisites.items()}
+    ready = [name for name, count in remaining.items() if count == 0]
+    while ready:
+        name = ready.pop()
+        for other, deps in prerequisites.items():
+            if name in deps:
+                remaining[other] -= 1
+                if remaining[other] == 0:
+                    ready.append(other)
+    cycle = [name for name, count in remaining.items() if count > 0]
+    if cycle:
+        raise ValueError(f"Update modules depend on each other: {', '.join(cycle)}")
+
+    return prerequisites
+
+
+def get_critical_path(timings: dict, prerequisites: dict) -> list:
+    """Gets the chain of modules that determined the duration of the run.
+
+    The chain ends with the module that finished last, each step back is the
+    prerequisite that finished last before the module started.
+
+    Args:
+        timings (dict): Tuples of the start and end time keyed by module name
+        prerequisites (dict): The names of the prerequisites keyed by module name
+
+    Returns:
+        list: The names of the modules on the critical path, first module first
+    """
+    if not timings:
+        return []
+
+    name = max(timings, key=lambda key: timings[key][1])
+    path = [name]
+    while True:
+        deps = [dep for dep in prerequisites.get(name, ()) if dep in timings]
+        if not deps:
+            break
+        name = max(deps, key=lambda key: timings[key][1])
+        path.append(name)
+
+    return list(reversed(path))
+
+
+def format_critical_path(timings: dict, prerequisites: dict) -> str:
+    """Formats the critical path of the run with the time spent in every module.
+
+    Args:
+        timings (dict): Tuples of the start and end time keyed by module name
+        prerequisites (dict): The names of the prerequisites keyed by module name
+
+    Returns:
+        str: The critical path report
+    """
+    path = get_critical_path(timings, prerequisites)
+    if not path:
+        return ""
+
+    steps = " -> ".join(
+        f"{name} ({timings[name][1] - timings[name][0]:.1f}s)" for name in path
+    )
+    total = max(end for _, end in timings.values()) - min(
+        start for start, _ in timings.values()
+    )
+
+    return f"Critical path: {steps}, total {total:.1f}s"
+
+
+class ModuleScheduler:
+    """Runs modules in a thread pool as soon as their prerequisites have finished.
+
+    Modules without a dependency between them run concurrently. A module whose
+    prerequisite failed still runs, like it did before dependencies were declared.
+    """
+
+    def __init__(self, max_workers: int = 10):
+        """Initializes the ModuleScheduler class
+
+        Args:
+            max_workers (int, optional): The maximum number of modules running at once. Defaults to 10.
+        """
+        self.max_workers = max_workers
+        self.modules = {}
+        self.dependencies = {}
+        self.prerequisites = {}
+        self.timings = {}
+
+    def add(self, name: str, run, depends_on: list = None) -> None:
+        """Adds a module to the run.
+
+        Args:
+            name (str): The name of the module
+            run: Called without arguments to run the module, returns its result
+            depends_on (list, optional): The names of the modules that have to finish first. Defaults to None.
+        """
+        self.modules[name] = run
+        self.dependencies[name] = list(depends_on or [])
+
+    def _run_module(self, name: str):
+        """Runs a module and records when it started and finished"""
+        start = time.monotonic()
+        try:
+            return self.modules[name]()
+        finally:
+            self.timings[name] = (start, time.monotonic())
+
+    def run(self) -> list:
+        """Runs all modules.
+
+        Returns:
+            list: Tuples of the module name and the result or exception, in the order the modules finished
+        """
+        self.prerequisites = check_dependencies(list(self.modules), self.dependencies)
+        waiting = {name: set(deps) for name, deps in self.prerequisites.items()}
+        results = []
+
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor:
+            running = {}
+            while waiting or running:
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[executor.submit(self._run_module, name)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results.append((name, future.result()))
+                    except Exception as e:
+                        results.append((name, e))
+                    for deps in waiting.values():
+                        deps.discard(name)
+
+        return results
+
+    def report(self) -> str:
+        """Gets the critical path report of the last run.
+
+        Returns:
+            str: The critical path report
+        """
+        return format_critical_path(self.timings, self.prerequisites)
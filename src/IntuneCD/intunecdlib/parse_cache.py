@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the cache of parsed repository files shared by update, documentation and the assignment report.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import threading
+
+import yaml
+
+# Bumped when the format of the cache entries changes
+CACHE_FORMAT = 1
+
+_lock = threading.Lock()
+_cache = None
+
+
+def parse_file(path: str):
+    """Parses a JSON or YAML repository file.
+
+    Args:
+        path (str): The path of the file
+
+    Raises:
+        ValueError: When the file is not a JSON or YAML file
+
+    Returns:
+        The parsed data
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            # Same as IntuneCDBase.load_file, the data only contains JSON types
+            return json.loads(json.dumps(yaml.safe_load(f)))
+        if path.endswith(".json"):
+            return json.load(f)
+
+    raise ValueError(f"{path} is not a valid file type.")
+
+
+def get_default_cache_dir() -> str:
+    """Gets the directory the parse cache is stored in.
+
+    The parsed files can contain decoded scripts and secret values, they are
+    only stored on disk when INTUNECD_CACHE_DIR is set.
+
+    Returns:
+        str: The parse directory below INTUNECD_CACHE_DIR, None when it is not set
+    """
+    directory = os.environ.get("INTUNECD_CACHE_DIR")
+    if not directory:
+        return None
+
+    return os.path.join(directory, "parse")
+
+
+class ParseCache:
+    """Parsed repository files keyed by path, modification time and size.
+
+    Entries are kept in memory for the run. With a cache directory they are also
+    written to it with marshal, readable only by the owner, so repeat runs skip
+    parsing files that did not change. Every load returns a new copy of the
+    data, callers are free to modify it.
+    """
+
+    def __init__(self, directory: str = None):
+        """Initializes the ParseCache class
+
+        Args:
+            directory (str, optional): The directory to store entries in, None keeps them in memory only. Defaults to None.
+        """
+        self.directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+        if self.directory:
+            try:
+                os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            except OSError:
+                self.directory = None
+
+    def _get_entry_path(self, path: str) -> str:
+        """Gets the path of the cache entry of a file"""
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.bin")
+
+    def _read_entry(self, path: str, key: tuple) -> bytes:
+        """Reads the stored entry of a file, None when missing or outdated"""
+        try:
+            with open(self._get_entry_path(path), "rb") as f:
+                cache_format, entry_key, data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if cache_format != CACHE_FORMAT or tuple(entry_key) != key:
+            return None
+
+        return data
+
+    def _write_entry(self, path: str, key: tuple, data: bytes) -> None:
+        """Stores the entry of a file, replacing the entry of an older version"""
+        entry_path = self._get_entry_path(path)
+        temp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump((CACHE_FORMAT, key, data), f)
+            os.replace(temp_path, entry_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def load(self, path: str):
+        """Loads a JSON or YAML repository file, parsing it only when it changed.
+
+        Args:
+            path (str): The path of the file
+
+        Returns:
+            The parsed data
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            data = self._entries.get(key)
+        if data is None and self.directory:
+            data = self._read_entry(path, key)
+        if data is None:
+            data = marshal.dumps(parse_file(path))
+            if self.directory:
+                self._write_entry(path, key, data)
+        with self._lock:
+            self._entries[key] = data
+
+        return marshal.loads(data)
+
+
+def configure_parse_cache(directory: str = None) -> ParseCache:
+    """Configures the parse cache used by all modules.
+
+    Args:
+        directory (str, optional): The directory to store entries in, None keeps them in memory only. Defaults to None.
+
+    Returns:
+        ParseCache: The configured cache
+    """
+    global _cache
+
+    with _lock:
+        _cache = ParseCache(directory)
+
+    return _cache
+
+
+def get_parse_cache() -> ParseCache:
+    """Gets the parse cache, created on first use in INTUNECD_CACHE_DIR or in memory.
+
+    Returns:
+        ParseCache: The parse cache
+    """
+    global _cache
+
+    with _lock:
+        if _cache is None:
+            _cache = ParseCache(get_default_cache_dir())
+
+    return _cache
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import os
+
+from .BaseGraphModule import BaseGraphModule
+from .directory_cache import get_directory_cache
+
+
+class ProcessGroupNames(BaseGraphModule):
+    """Resolve the group names used in the repository assignments before the update runs."""
+
+    def __init__(
+        self,
+        token: str = None,
+    ):
+        """Initializes the ProcessGroupNames class"""
+        self.token = token
+        self.report = False
+
+    def _get_assignment_group_names(self, data, names: dict) -> None:
+        """Adds the group names of the assignments in data to names.
+
+        Args:
+            data: The repository data to search
+            names (dict): The group names found so far, used as an ordered set
+        """
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if key == "assignments" and isinstance(value, list):
+                    for assignment in value:
+                        target = (
+                            assignment.get("target")
+                            if isinstance(assignment, dict)
+                            else None
+                        )
+                        if isinstance(target, dict) and target.get("groupName"):
+                            names[target["groupName"]] = None
+                else:
+                    self._get_assignment_group_names(value, names)
+        elif isinstance(data, list):
+            for value in data:
+                self._get_assignment_group_names(value, names)
+
+    def get_group_names(self, path: str, repo_changes=None) -> list:
+        """Gets the distinct group names used in the assignments of the repository.
+
+        Args:
+            path (str): The path to the repository
+            repo_changes (RepoChanges, optional): Only read the changed files. Defaults to None.
+
+        Returns:
+            list: The distinct group names
+        """
+        names = {}
+        for root, dirs, files in os.walk(path):
+            # Archived configurations are not updated
+            dirs[:] = [d for d in dirs if d != "__archive__"]
+            for filename in files:
+                repo_file = self.check_file(root, filename)
+                if repo_file is False:
+                    continue
+                if repo_changes is not None and not repo_changes.contains(repo_file):
+                    continue
+                try:
+                    with open(repo_file, encoding="utf-8") as f:
+                        content = f.read()
+                    # Most files have no group assignments, skip parsing them
+                    if "groupName" not in content:
+                        continue
+                    data = self.load_repo_file(repo_file)
+                except Exception as e:
+                    self.log(
+                        tag="warning",
+                        msg=f"Could not read {repo_file} to resolve group names: {e}",
+                    )
+                    continue
+                self._get_assignment_group_names(data, names)
+
+        return list(names)
+
+    def resolve_group_names(self, path: str, repo_changes=None) -> dict:
+        """Resolves all group names of the repository with bulk requests.
+
+        The groups are stored in the directory cache, update_assignment uses the
+        cache instead of requesting each group name on its own. Names without a
+        group are cached as well.
+
+        Args:
+            path (str): The path to the repository
+            repo_changes (RepoChanges, optional): Only read the changed files. Defaults to None.
+
+        Returns:
+            dict: The groups keyed by display name
+        """
+        names = self.get_group_names(path, repo_changes)
+        if not names:
+            return {}
+
+        self.log(msg=f"Resolving {len(names)} group names used in assignments")
+
+        return get_directory_cache().get_groups_by_name(self, names)
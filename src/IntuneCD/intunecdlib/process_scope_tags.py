@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from .BaseGraphModule import BaseGraphModule
+from .directory_cache import get_directory_cache
 
 
 class ProcessScopeTags(BaseGraphModule):
@@ -18,9 +19,7 @@ class ProcessScopeTags(BaseGraphModule):
 
         :param token: Token to use for authenticating the request
         """
-        endpoint = "https://graph.microsoft.com/beta/deviceManagement/roleScopeTags"
-        data = self.make_graph_request(endpoint)
-        return data["value"]
+        return get_directory_cache().get_scope_tags(self)
 
     def get_scope_tags_name(self, data, scope_tags):
         """
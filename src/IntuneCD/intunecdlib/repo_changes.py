@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the changes of the configuration repository used by update --since.
+"""
+
+import json
+import os
+import subprocess
+
+import yaml
+
+
+def _run_git(path: str, *args: str) -> str:
+    """Runs a git command in the repository and returns its output.
+
+    Args:
+        path (str): A path inside the repository
+        *args (str): The arguments of the git command
+
+    Raises:
+        ValueError: When the git command fails
+
+    Returns:
+        str: The output of the command
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", path, *args],
+            capture_output=True,
+            check=True,
+            text=True,
+            encoding="utf-8",
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        error = getattr(e, "stderr", None) or str(e)
+        raise ValueError(f"git {' '.join(args)} failed: {error.strip()}") from e
+
+    return result.stdout
+
+
+def _get_config_names(filename: str, content: str) -> set:
+    """Gets the names of the configuration stored in a repository file.
+
+    Args:
+        filename (str): The name of the file
+        content (str): The content of the file
+
+    Returns:
+        set: The displayName and name of the configuration
+    """
+    try:
+        if filename.endswith(".yaml"):
+            data = yaml.safe_load(content)
+        elif filename.endswith(".json"):
+            data = json.loads(content)
+        else:
+            return set()
+    except ValueError:
+        return set()
+    if not isinstance(data, dict):
+        return set()
+
+    return {data[key] for key in ("displayName", "name") if data.get(key)}
+
+
+class RepoChanges:
+    """The files of the repository that changed since a git revision.
+
+    Paths are kept absolute so they can be compared with the path of an update module.
+    Deleted files keep the names of the configuration they contained, the
+    configuration has to be removed from Intune when --remove is set.
+    """
+
+    def __init__(self, changed: list = None, deleted: dict = None):
+        """Initializes the RepoChanges class
+
+        Args:
+            changed (list, optional): The paths of the added and modified files. Defaults to None.
+            deleted (dict, optional): The names of the configurations keyed by the path of the deleted file. Defaults to None.
+        """
+        self.changed = {os.path.normpath(os.path.abspath(p)) for p in changed or []}
+        self.deleted = {
+            os.path.normpath(os.path.abspath(p)): set(names)
+            for p, names in (deleted or {}).items()
+        }
+
+    @classmethod
+    def from_git(cls, path: str, since: str) -> "RepoChanges":
+        """Gets the files below the path that changed since a git revision.
+
+        Uncommitted and untracked files are included, a pipeline can update
+        from a working copy the same way it does from a commit.
+
+        Args:
+            path (str): The path of the configuration in the repository
+            since (str): The git revision to compare with
+
+        Returns:
+            RepoChanges: The changes below the path
+        """
+        path = os.path.abspath(path)
+        root = _run_git(path, "rev-parse", "--show-toplevel").strip()
+        diff = _run_git(path, "diff", "--name-status", "--no-renames", "-z", since)
+        untracked = _run_git(
+            path, "ls-files", "--others", "--exclude-standard", "--full-name", "-z"
+        )
+
+        def in_path(repo_path: str) -> bool:
+            file_path = os.path.join(root, repo_path)
+            return os.path.commonpath([path, file_path]) == path
+
+        changed = [name for name in untracked.split("\0") if name and in_path(name)]
+        deleted = {}
+        entries = diff.split("\0")
+        for status, repo_path in zip(entries[::2], entries[1::2]):
+            if not repo_path or not in_path(repo_path):
+                continue
+            if status == "D":
+                content = _run_git(path, "show", f"{since}:{repo_path}")
+                deleted[os.path.join(root, repo_path)] = _get_config_names(
+                    repo_path, content
+                )
+            else:
+                changed.append(repo_path)
+
+        return cls([os.path.join(root, name) for name in changed], deleted)
+
+    def _below(self, paths, directory: str) -> list:
+        """Gets the paths below a directory relative to the directory"""
+        directory = os.path.normpath(os.path.abspath(directory))
+        return [
+            os.path.relpath(p, directory)
+            for p in paths
+            if os.path.commonpath([directory, p]) == directory and p != directory
+        ]
+
+    def contains(self, path: str) -> bool:
+        """Checks if a file was added or modified.
+
+        Args:
+            path (str): The path of the file
+
+        Returns:
+            bool: If the file changed
+        """
+        return os.path.normpath(os.path.abspath(path)) in self.changed
+
+    def touches(self, directory: str) -> bool:
+        """Checks if a file below the directory changed or was deleted.
+
+        Args:
+            directory (str): The path of the directory
+
+        Returns:
+            bool: If the directory has changes
+        """
+        return bool(
+            self._below(self.changed, directory) or self._below(self.deleted, directory)
+        )
+
+    def files_in(self, directory: str) -> list:
+        """Gets the names of the changed files in the directory.
+
+        A changed file in a subdirectory, like a script or payload, can belong to
+        any configuration of the directory so all of them have to be compared.
+
+        Args:
+            directory (str): The path of the directory
+
+        Returns:
+            list: The names of the changed files, None when all files of the directory have to be compared
+        """
+        names = self._below(self.changed, directory)
+        if any(os.sep in name for name in names):
+            return None
+
+        return sorted(names)
+
+    def deleted_names(self, directory: str) -> set:
+        """Gets the names of the configurations whose file below the directory was deleted.
+
+        Args:
+            directory (str): The path of the directory
+
+        Returns:
+            set: The names of the deleted configurations
+        """
+        directory = os.path.normpath(os.path.abspath(directory))
+        names = set()
+        for path, config_names in self.deleted.items():
+            if path.startswith(directory + os.sep):
+                names.update(config_names)
+
+        return names
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the tenant wide throttle governor shared by all requests to Microsoft Graph.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# Default maximum of concurrent requests, matches the default value of --max-workers
+DEFAULT_MAX_CONCURRENCY = 10
+
+_lock = threading.Lock()
+_governor = None
+
+
+class ThrottleGovernor:
+    """AIMD concurrency limiter, every Graph request and $batch call acquires a slot from it.
+
+    The limit is increased by one for every limit successful requests (additive increase)
+    and halved when Graph throttles a request (multiplicative decrease). Throttles
+    reported within the same second only decrease the limit once. A Retry-After
+    header pauses all threads, not only the one that was throttled.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+    ):
+        """Initializes the ThrottleGovernor class
+
+        Args:
+            max_concurrency (int, optional): The highest number of requests in flight. Defaults to 10.
+            min_concurrency (int, optional): The lowest number of requests in flight. Defaults to 1.
+        """
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.min_concurrency = max(min(int(min_concurrency), self.max_concurrency), 1)
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.throttle_count = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Waits until a request is allowed to be sent."""
+        with self._condition:
+            while True:
+                wait_time = self.paused_until - time.monotonic()
+                if wait_time <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self._condition.wait(timeout=wait_time if wait_time > 0 else None)
+
+    def release(self) -> None:
+        """Releases the slot taken by acquire."""
+        with self._condition:
+            self.in_flight = max(self.in_flight - 1, 0)
+            self._condition.notify()
+
+    @contextmanager
+    def slot(self):
+        """Context manager acquiring and releasing a slot."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_success(self) -> None:
+        """Additively increases the limit after a full window of successful requests."""
+        with self._condition:
+            self._successes += 1
+            if self._successes >= int(self.limit):
+                self._successes = 0
+                if self.limit < self.max_concurrency:
+                    self.limit = min(self.limit + 1, self.max_concurrency)
+                    self._condition.notify_all()
+
+    def on_throttle(self, retry_after: float = 0) -> None:
+        """Multiplicatively decreases the limit and pauses all requests for retry_after seconds.
+
+        Args:
+            retry_after (float, optional): Seconds to pause all requests. Defaults to 0.
+        """
+        with self._condition:
+            now = time.monotonic()
+            self.throttle_count += 1
+            self._successes = 0
+            if now - self._last_decrease >= 1:
+                self._last_decrease = now
+                self.limit = max(self.limit / 2, self.min_concurrency)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + float(retry_after))
+
+
+def configure_governor(max_concurrency: int = None) -> ThrottleGovernor:
+    """Configures the shared governor, the upper limit is tied to the number of workers.
+
+    Args:
+        max_concurrency (int, optional): The highest number of requests in flight. Defaults to None.
+
+    Returns:
+        ThrottleGovernor: The configured governor
+    """
+    global _governor
+
+    with _lock:
+        _governor = ThrottleGovernor(max_concurrency or DEFAULT_MAX_CONCURRENCY)
+
+    return _governor
+
+
+def get_governor() -> ThrottleGovernor:
+    """Gets the shared governor, creating it with the default limit if needed.
+
+    Returns:
+        ThrottleGovernor: The shared governor
+    """
+    global _governor
+
+    if _governor is None:
+        with _lock:
+            if _governor is None:
+                _governor = ThrottleGovernor()
+
+    return _governor
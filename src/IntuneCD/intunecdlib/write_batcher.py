@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the write batcher used by the update modules to send writes as $batch requests.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .throttle import get_governor
+
+BATCH_PREFIX = "https://graph.microsoft.com/beta/"
+# Maximum number of sub-requests Graph accepts in a single $batch request
+BATCH_SIZE = 20
+MAX_RETRIES = 5
+
+
+class WriteBatcher:
+    """Queues writes of a module and sends them as $batch requests.
+
+    A write can depend on an earlier write, it is sent in the same $batch request
+    with dependsOn so Graph only runs it after the earlier write succeeded.
+    The status of every sub-request is passed to the callback of its write.
+    """
+
+    def __init__(self, module):
+        """Initializes the WriteBatcher class
+
+        Args:
+            module (BaseGraphModule): The module used to send the $batch requests
+        """
+        self.module = module
+        self._lock = threading.Lock()
+        self._writes = {}
+        self._next_id = 1
+
+    def add(
+        self,
+        method: str,
+        endpoint: str,
+        data: dict = None,
+        depends_on: int = None,
+        on_response=None,
+    ) -> int:
+        """Queues a write, it is sent on the next flush.
+
+        Args:
+            method (str): The HTTP method to use
+            endpoint (str): The absolute Graph endpoint
+            data (dict, optional): The body of the request. Defaults to None.
+            depends_on (int, optional): The id of the write that has to succeed first. Defaults to None.
+            on_response (optional): Called with the status and body of the sub-response. Defaults to None.
+
+        Returns:
+            int: The id of the write, None if the write can not be batched and has to be sent on its own
+        """
+        if self.module.report or not endpoint.startswith(BATCH_PREFIX):
+            return None
+
+        with self._lock:
+            write_id = self._next_id
+            self._next_id += 1
+            self._writes[write_id] = {
+                "method": method.upper(),
+                "url": endpoint[len(BATCH_PREFIX) - 1 :],
+                "data": data,
+                "depends_on": depends_on,
+                "on_response": on_response,
+            }
+
+        return write_id
+
+    def _create_request(self, write_id: int, write: dict, pending: dict) -> dict:
+        """Creates the sub-request of a write"""
+        request = {"id": str(write_id), "method": write["method"], "url": write["url"]}
+        if write["data"] is not None:
+            request["body"] = write["data"]
+            request["headers"] = {"Content-Type": "application/json"}
+        # Writes whose dependency succeeded in an earlier round are sent without it
+        if write["depends_on"] in pending:
+            request["dependsOn"] = [str(write["depends_on"])]
+
+        return request
+
+    def _create_batches(self, pending: dict) -> list:
+        """Groups the pending writes in batches, writes are kept with their dependency.
+
+        Args:
+            pending (dict): The pending writes keyed by id
+
+        Returns:
+            list: Lists of sub-requests
+        """
+        groups = {}
+        root_of = {}
+        for write_id, write in pending.items():
+            root = root_of.get(write["depends_on"], write_id)
+            root_of[write_id] = root
+            groups.setdefault(root, []).append(
+                self._create_request(write_id, write, pending)
+            )
+
+        batches = []
+        batch = []
+        for group in groups.values():
+            if batch and len(batch) + len(group) > BATCH_SIZE:
+                batches.append(batch)
+                batch = []
+            batch.extend(group)
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def _send(self, batch: list) -> dict:
+        """Posts a $batch request.
+
+        Args:
+            batch (list): The sub-requests to send
+
+        Returns:
+            dict: The sub-responses keyed by write id
+        """
+        try:
+            responses = self.module.process_batch(batch)
+        except Exception as e:
+            error = {"error": {"message": str(e)}}
+            return {
+                int(req["id"]): {"status": 0, "body": error, "headers": {}}
+                for req in batch
+            }
+
+        return {int(resp["id"]): resp for resp in responses}
+
+    def flush(self) -> None:
+        """Sends the queued writes, throttled writes are retried."""
+        with self._lock:
+            pending = self._writes
+            self._writes = {}
+        if not pending:
+            return
+
+        batches = self._create_batches(pending)
+        self.module.log(
+            function="write_batch",
+            msg=f"Sending {len(pending)} writes in {len(batches)} $batch requests",
+        )
+
+        retry_count = 0
+        while pending:
+            with ThreadPoolExecutor(max_workers=self.module.batch_window) as executor:
+                responses = {}
+                for result in executor.map(self._send, batches):
+                    responses.update(result)
+
+            retry = {}
+            wait_time = 0
+            for write_id, write in pending.items():
+                response = responses.get(write_id, {"status": 0, "headers": {}})
+                status = response["status"]
+                # A write fails with 424 when the write it depends on failed
+                throttled = status in [429, 503] or (
+                    status == 424 and write["depends_on"] in retry
+                )
+                if throttled and retry_count < MAX_RETRIES:
+                    retry[write_id] = write
+                    retry_after = response.get("headers", {}).get("Retry-After")
+                    if retry_after and str(retry_after).isdigit():
+                        wait_time = max(wait_time, int(retry_after))
+                    continue
+                self._handle_response(write, status, response.get("body"))
+
+            pending = retry
+            if pending:
+                retry_count += 1
+                self.module.log(
+                    function="write_batch",
+                    msg=f"Retrying {len(pending)} throttled writes",
+                )
+                get_governor().on_throttle(wait_time or 10)
+                batches = self._create_batches(pending)
+
+    def _handle_response(self, write: dict, status: int, body) -> None:
+        """Passes the sub-response to the callback of the write"""
+        if write["on_response"] is not None:
+            write["on_response"](status, body)
+        elif not 200 <= status < 300:
+            self.module.log(
+                tag="error",
+                msg=f"{write['method']} {write['url']} failed with status {status}: {json.dumps(body)}",
+            )
@@ -11,8 +11,11 @@ from io import StringIO
 from .backup_entra import backup_entra
 from .backup_intune import backup_intune
 from .intunecdlib.archive import move_to_archive
+from .intunecdlib.backup_state import BackupState, configure_backup_state
 from .intunecdlib.get_accesstoken import obtain_azure_token
 from .intunecdlib.get_authparams import getAuth
+from .intunecdlib.graph_session import close_session, configure_session
+from .intunecdlib.throttle import configure_governor
 
 REPO_DIR = os.environ.get("REPO_DIR")
 
@@ -190,7 +193,7 @@ def get_parser(include_help=True):
     )
     parser.add_argument(
         "--max-workers",
-        help="The maximum number of workers to use when running the backup. If hitting rate limits, reduce this number. If not hitting rate limits, increase this number for faster backups.",
+        help="The maximum number of workers to use when running the backup, also the upper limit of concurrent Graph requests. Concurrency is reduced automatically when Graph throttles requests and increased again when it recovers.",
         type=int,
         default=10,
     )
@@ -205,6 +208,11 @@ def get_parser(include_help=True):
         help="When set, the script will not move files to archive. Might require manual cleanup.",
         action="store_true",
     )
+    parser.add_argument(
+        "--incremental",
+        help="When set, configurations that did not change since the previous incremental backup are not written again. The state is stored in .intunecd_backup_state.json in the backup path, a backup with different options writes all configurations.",
+        action="store_true",
+    )
 
     return parser
 
@@ -213,6 +221,17 @@ def start(args=None):
     if args is None:
         args = get_parser(include_help=True).parse_args()
 
+    configure_session(args.max_workers)
+    configure_governor(args.max_workers)
+
+    # The pooled session is shared by all modules, close it even when the run fails
+    try:
+        _start(args)
+    finally:
+        close_session()
+
+
+def _start(args):
     if args.verbose:
         os.environ["VERBOSE"] = "True"
 
@@ -268,6 +287,21 @@ def start(args=None):
         path, output, exclude, token, prefix, append_id, max_workers, platforms
     ):
         results = []
+        state = None
+        if args.incremental:
+            state = BackupState(
+                path,
+                {
+                    "output": output,
+                    "exclude": sorted(exclude),
+                    "prefix": prefix,
+                    "append_id": append_id,
+                    "platforms": sorted(platforms),
+                    "entrabackup": args.entrabackup,
+                    "ignore_omasettings": args.ignore_omasettings,
+                },
+            )
+        configure_backup_state(state)
 
         if args.entrabackup:
             print("***Entra backup***")
@@ -308,6 +342,10 @@ def start(args=None):
         if not args.skip_archive:
             move_to_archive(path, created_files, output)
 
+        if state is not None:
+            state.save()
+            configure_backup_state(None)
+
         return config_count
 
     if args.output == "json" or args.output == "yaml":
@@ -9,8 +9,14 @@ import os
 import sys
 from io import StringIO
 
+from .intunecdlib.apply_change_plan import ApplyChangePlan
+from .intunecdlib.change_plan import ChangePlan, configure_change_plan, get_change_plan
+from .intunecdlib.diff_engine import configure_diff_engine
 from .intunecdlib.get_accesstoken import obtain_azure_token
 from .intunecdlib.get_authparams import getAuth
+from .intunecdlib.graph_session import close_session, configure_session
+from .intunecdlib.repo_changes import RepoChanges
+from .intunecdlib.throttle import configure_governor
 from .update_entra import update_entra
 from .update_intune import update_intune
 
@@ -118,6 +124,21 @@ def get_parser(include_help=True):
         help="When this parameter is set, no updates are pushed to Intune but the change summary is pushed to the frontend",
         action="store_true",
     )
+    parser.add_argument(
+        "--plan",
+        help="When this parameter is set, no updates are pushed to Intune and the pending changes are written to the given plan file",
+        type=str,
+    )
+    parser.add_argument(
+        "--apply",
+        help="When this parameter is set, the changes in the given plan file are pushed to Intune without comparing the configurations again",
+        type=str,
+    )
+    parser.add_argument(
+        "--since",
+        help="When this parameter is set, only the configurations whose files changed since the given git revision of the repository are updated. With --remove, only configurations whose files were deleted are removed",
+        type=str,
+    )
     parser.add_argument(
         "-g",
         "--create-groups",
@@ -161,8 +182,21 @@ def get_parser(include_help=True):
     parser.add_argument(
         "--max-workers",
         help="Maximum number of concurrent threads when updating, default is 10",
+        type=int,
         default=10,
     )
+    parser.add_argument(
+        "--item-workers",
+        help="Maximum number of configurations updated in parallel within a module that supports it, default is 1",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--diff-engine",
+        help="The engine used to compare the repository with Intune. 'deepdiff' uses DeepDiff, 'native' uses the built-in structural diff which is faster on large configurations. Default is deepdiff.",
+        choices=["deepdiff", "native"],
+        default="deepdiff",
+    )
 
     return parser
 
@@ -171,12 +205,34 @@ def start(args=None):
     if args is None:
         args = get_parser(include_help=True).parse_args()
 
+    configure_session(args.max_workers)
+    configure_governor(args.max_workers)
+
+    # The pooled session is shared by all modules, close it even when the run fails
+    try:
+        _start(args)
+    finally:
+        close_session()
+
+
+def _start(args):
     if args.verbose:
         os.environ["VERBOSE"] = "True"
 
     if args.exit_on_error:
         os.environ["EXIT_ON_ERROR"] = "True"
 
+    if args.plan:
+        # A plan is written in report mode, the writes are recorded instead of sent
+        args.report = True
+        configure_change_plan(ChangePlan())
+
+    configure_diff_engine(args.diff_engine)
+
+    args.repo_changes = None
+    if getattr(args, "since", None):
+        args.repo_changes = RepoChanges.from_git(args.path, args.since)
+
     def devtoprod():
         return "devtoprod"
 
@@ -257,6 +313,16 @@ def start(args=None):
 
     if token is None:
         raise Exception("Token is empty, please check os.environ variables")
+    elif args.apply:
+        plan = ChangePlan.load(args.apply)
+        print(
+            f"***Applying {len(plan.operations)} changes from the plan created {plan.created}***"
+        )
+        counts = ApplyChangePlan(token).apply(plan)
+        print(
+            f"***Applied: {counts['applied']}, failed: {counts['failed']}, "
+            f"skipped because changed since the plan was created: {counts['skipped']}***"
+        )
     else:
         if args.exclude:
             exclude = args.exclude
@@ -266,6 +332,12 @@ def start(args=None):
         if args.report:
             print("***Running in report mode, no updates will be pushed to Intune***")
 
+        if args.repo_changes is not None:
+            print(
+                f"***Updating {len(args.repo_changes.changed)} changed and "
+                f"{len(args.repo_changes.deleted)} deleted files since {args.since}***"
+            )
+
         if args.intunecdmonitor:
             # We are running in the IntuneCDMonitor context, instead of using API calls to the frontend, we will output to file
             old_stdout = sys.stdout
@@ -319,6 +391,14 @@ def start(args=None):
                 args.max_workers,
             )
 
+    if args.plan:
+        plan = get_change_plan()
+        configure_change_plan(None)
+        plan.save(args.plan)
+        print(
+            f"***Change plan with {len(plan.operations)} changes written to {args.plan}***"
+        )
+
     if "VERBOSE" in os.environ:
         del os.environ["VERBOSE"]
     if "EXIT_ON_ERROR" in os.environ:
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -40,7 +39,7 @@ class AuthenticationMethodsPolicyUpdateModule(BaseUpdateModule):
                 self.log(tag="error", msg=f"Error getting {self.config_type} data: {e}")
                 return None
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
                     self.name = ""
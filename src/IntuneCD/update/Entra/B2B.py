@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -38,7 +37,7 @@ class B2BUpdateModule(BaseUpdateModule):
                 self.log(tag="error", msg=f"Error getting {self.config_type} data: {e}")
                 return None
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 if not filename.startswith("b2b_policy."):
                     continue
                 repo_data = self.load_repo_data(filename)
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -101,7 +100,7 @@ class AppProtectionUpdateModule(BaseUpdateModule):
                 "/assignments",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.assignment_endpoint = "/deviceAppManagement/"
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
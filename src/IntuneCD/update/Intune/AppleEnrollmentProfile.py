@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -76,7 +75,7 @@ class AppleEnrollmentProfileUpdateModule(BaseUpdateModule):
                 if value is not None
             ]
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.downstream_id = None
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
+from ...intunecdlib.directory_cache import get_directory_cache
 
 
 class ComplianceUpdateModule(BaseUpdateModule):
@@ -128,16 +128,17 @@ class ComplianceUpdateModule(BaseUpdateModule):
         Returns:
             dict[str, any]: The data with the detection script id set
         """
-        # get detection script id
-        script_id = self.make_graph_request(
-            self.endpoint + "/beta/deviceManagement/reusablePolicySettings/",
-            {"$filter": f"displayName eq '{repo_data['detectionScriptName']}'"},
+        # get detection script id, the reusable settings are requested once per run
+        script = (
+            get_directory_cache()
+            .get_reusable_settings_by_name(self)
+            .get(repo_data["detectionScriptName"])
         )
-        if script_id.get("value"):
+        if script:
             script_id_path = self._get_detection_script_id_path(repo_data)
             script_id_path = script_id_path + ["simpleSettingValue", "value"]
             repo_data = self._set_value_from_path(
-                repo_data, script_id["value"][0]["id"], script_id_path
+                repo_data, script["id"], script_id_path
             )
 
             return repo_data
@@ -153,19 +154,24 @@ class ComplianceUpdateModule(BaseUpdateModule):
         Returns:
             dict[str, any]: The Intune data with the scheduled actions for the rule
         """
+        responses = self.batch_request_by_key(
+            [item["id"] for item in intune_data["value"]],
+            "deviceManagement/compliancePolicies/",
+            "/scheduledActionsForRule?$expand=scheduledActionConfigurations",
+        )
         new_intune_data = []
         for item in intune_data["value"]:
-            actions = self.make_graph_request(
-                endpoint=self.endpoint
-                + self.CONFIG_ENDPOINT
-                + item["id"]
-                + "/scheduledActionsForRule",
-                params={"$expand": "scheduledActionConfigurations"},
-            )
-            for action in actions["value"]:
+            actions = responses.get(item["id"])
+            if actions is None:
+                self.log(
+                    tag="warning",
+                    msg=f"Could not get the scheduled actions of Compliance Policy {item.get('name')}",
+                )
+                actions = {}
+            for action in actions.get("value", []):
                 self.remove_keys(action)
 
-            item["scheduledActionsForRule"] = actions["value"]
+            item["scheduledActionsForRule"] = actions.get("value", [])
             new_intune_data.append(item)
 
         return new_intune_data
@@ -248,17 +254,14 @@ class ComplianceUpdateModule(BaseUpdateModule):
         """
         for action in rule["scheduledActionConfigurations"]:
             if action.get("notificationTemplateName"):
-                notification_template = self.make_graph_request(
-                    self.endpoint
-                    + "/beta/deviceManagement/notificationMessageTemplates/",
-                    params={
-                        "$filter": f"displayName eq '{action['notificationTemplateName']}'"
-                    },
+                # The notification templates are requested once per run
+                notification_template = (
+                    get_directory_cache()
+                    .get_notification_templates_by_name(self)
+                    .get(action["notificationTemplateName"])
                 )
-                if notification_template["value"]:
-                    action["notificationTemplateId"] = notification_template["value"][
-                        0
-                    ]["id"]
+                if notification_template:
+                    action["notificationTemplateId"] = notification_template["id"]
                 else:
                     action[
                         "notificationTemplateId"
@@ -283,7 +286,18 @@ class ComplianceUpdateModule(BaseUpdateModule):
                 "/assignments",
             )
 
-            for filename in os.listdir(self.path):
+            # Get the scheduled actions of all policies once, the loop only reads them
+            intune_data["value"] = self._get_scheduledActionsForRule(intune_data)
+            new_intune_data = []
+            for item in intune_data["value"]:
+                item = self._remove_compliance_keys(item)
+                for rule in item["scheduledActionsForRule"]:
+                    for action in rule["scheduledActionConfigurations"]:
+                        self.remove_keys(action)
+                new_intune_data.append(item)
+            intune_data["value"] = new_intune_data
+
+            for filename in self.list_repo_files():
                 # reset params
                 self.params = None
                 self.create_request = None
@@ -306,28 +320,11 @@ class ComplianceUpdateModule(BaseUpdateModule):
                     repo_data = self._detection_script_check(repo_data)
                     if repo_data is False:
                         continue
-                    # Get the scheduled actions for the rule
-                    intune_data["value"] = self._get_scheduledActionsForRule(
-                        intune_data
-                    )
-
                     for rule in repo_data.get("scheduledActionsForRule"):
                         self._get_notification_template_id(rule)
 
-                    # Remove additional keys from the data
-                    new_intune_data = []
-                    for item in intune_data["value"]:
-                        item = self._remove_compliance_keys(item)
-                        new_intune_data.append(item)
-                    intune_data["value"] = new_intune_data
                     repo_data = self._remove_compliance_keys(repo_data)
 
-                    for item in intune_data["value"]:
-                        for action in item["scheduledActionsForRule"][0][
-                            "scheduledActionConfigurations"
-                        ]:
-                            self.remove_keys(action)
-
                     try:
                         self.process_update(
                             downstream_data=intune_data["value"],
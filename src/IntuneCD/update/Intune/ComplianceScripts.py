@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -68,7 +67,7 @@ class ComplianceScriptsUpdateModule(BaseUpdateModule):
                 return None
             # Get details for each script to populate script content
             intune_data["value"] = self._get_script_details(intune_data)
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.notify = True
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import copy
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -43,7 +42,7 @@ class ConditionalAccessUpdateModule(BaseUpdateModule):
                 self.log(tag="error", msg=f"Error getting {self.config_type} data: {e}")
                 return None
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
                     self.get_pop_keys(
@@ -103,7 +103,7 @@ class CustomAttributesUpdateModule(BaseUpdateModule):
                 "",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.notify = True
                 script_data = None
                 repo_data = self.load_repo_data(filename)
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -151,7 +150,7 @@ class DeviceComplianceUpdateModule(BaseUpdateModule):
                 "/assignments",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.config_type = "Compliance Policy"
                 self.notify = True
                 repo_data = self.load_repo_data(filename)
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -10,9 +9,11 @@ class DeviceConfigurationsUpdateModule(BaseUpdateModule):
     Attributes:
         CONFIG_ENDPOINT (str): The endpoint to get the data from
         APP_ENDPOINT (str): The endpoint to get the app data from
+        CUSTOM_WINDOWS_ODATA_TYPE (str): The type of the custom Windows profiles with OMA settings
     """
 
     CONFIG_ENDPOINT = "/beta/deviceManagement/deviceConfigurations/"
+    CUSTOM_WINDOWS_ODATA_TYPE = "#microsoft.graph.windows10CustomConfiguration"
 
     def __init__(self, *args, **kwargs):
         """Initializes the DeviceConfigurationsUpdateModule class
@@ -31,6 +32,8 @@ class DeviceConfigurationsUpdateModule(BaseUpdateModule):
             "root['isEncrypted']",
             "root['omaSettings']",
         ]
+        # Plain text values of the encrypted OMA settings keyed by secretReferenceValueId
+        self.oma_values = {}
 
     def _handle_custom_apple_device_configuration(
         self, intune_data: dict[str, any], repo_data: dict[str, any]
@@ -63,15 +66,17 @@ class DeviceConfigurationsUpdateModule(BaseUpdateModule):
         for setting in intune_data.get("omaSettings"):
             if setting["isEncrypted"]:
                 decoded_oma = {}
-                oma_value = self.make_graph_request(
-                    endpoint=self.endpoint
-                    + self.CONFIG_ENDPOINT
-                    + "/"
-                    + self.downstream_id
-                    + "/getOmaSettingPlainTextValue(secretReferenceValueId='"
-                    + setting["secretReferenceValueId"]
-                    + "')",
-                )
+                oma_value = self.oma_values.get(setting["secretReferenceValueId"])
+                if oma_value is None:
+                    oma_value = self.make_graph_request(
+                        endpoint=self.endpoint
+                        + self.CONFIG_ENDPOINT
+                        + "/"
+                        + self.downstream_id
+                        + "/getOmaSettingPlainTextValue(secretReferenceValueId='"
+                        + setting["secretReferenceValueId"]
+                        + "')",
+                    )
                 decoded_oma["@odata.type"] = setting["@odata.type"]
                 decoded_oma["displayName"] = setting["displayName"]
                 decoded_oma["description"] = setting["description"]
@@ -104,6 +109,29 @@ class DeviceConfigurationsUpdateModule(BaseUpdateModule):
 
             self.update_diff_data(oma_diff)
 
+    def _get_oma_values(self, intune_data: list, repo_items: list) -> None:
+        """Resolves the encrypted OMA settings of the custom Windows profiles in the repository at once
+
+        Args:
+            intune_data (list): The Device Configurations in Intune
+            repo_items (list): The Device Configurations in the repository
+        """
+        names = {
+            repo_data.get("displayName")
+            for repo_data in repo_items
+            if repo_data
+            and repo_data.get("@odata.type") == self.CUSTOM_WINDOWS_ODATA_TYPE
+        }
+        self.oma_values = self.batch_oma_settings(
+            [
+                item
+                for item in intune_data
+                if item.get("@odata.type") == self.CUSTOM_WINDOWS_ODATA_TYPE
+                and item.get("displayName") in names
+            ],
+            "deviceManagement/deviceConfigurations/",
+        )
+
     def _prepare_repo_omas(self, repo_data: dict[str, any]) -> dict[str, any]:
         repo_omas = []
         for repo_omaSetting in repo_data["omaSettings"]:
@@ -137,11 +165,15 @@ class DeviceConfigurationsUpdateModule(BaseUpdateModule):
                 "#microsoft.graph.macOSCustomConfiguration",
             ]
 
-            for filename in os.listdir(self.path):
+            repo_items = [
+                self.load_repo_data(filename) for filename in self.list_repo_files()
+            ]
+            self._get_oma_values(intune_data["value"], repo_items)
+
+            for repo_data in repo_items:
                 self.notify = True
                 self.config_type = "Device Configuration"
 
-                repo_data = self.load_repo_data(filename)
                 if repo_data:
                     if "@odata.type" not in repo_data:
                         continue
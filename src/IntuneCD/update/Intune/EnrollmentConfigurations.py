@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import json
-import os
 import re
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
@@ -109,7 +108,7 @@ class EnrollmentConfigurationsUpdateModule(BaseUpdateModule):
                 != "#microsoft.graph.windows10EnrollmentCompletionPageConfiguration"
             ]
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.downstream_id = None
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
@@ -160,15 +159,15 @@ class EnrollmentConfigurationsUpdateModule(BaseUpdateModule):
                     self.diff_summary.append(diff_data)
                     self.reset_diffs_and_count()
 
-            for item in list(intune_data["value"]):
-                # Remove items that cannot or should be removed
-                if (
-                    item.get("@odata.type")
-                    == "#microsoft.graph.windows10EnrollmentCompletionPageConfiguration"
-                    or item.get("displayName") == "All users and all devices"
-                ):
-                    intune_data["value"].remove(item)
+            # Leave out items that cannot or should not be removed
+            removable = [
+                item
+                for item in intune_data["value"]
+                if item.get("@odata.type")
+                != "#microsoft.graph.windows10EnrollmentCompletionPageConfiguration"
+                and item.get("displayName") != "All users and all devices"
+            ]
 
-            self.remove_downstream_data(self.CONFIG_ENDPOINT, intune_data["value"])
+            self.remove_downstream_data(self.CONFIG_ENDPOINT, removable)
 
         return self.diff_summary
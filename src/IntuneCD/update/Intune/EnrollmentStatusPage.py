@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -78,7 +77,7 @@ class EnrollmentStatusPageUpdateModule(BaseUpdateModule):
                 "/assignments",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
                     self.match_info = {
@@ -109,15 +108,15 @@ class EnrollmentStatusPageUpdateModule(BaseUpdateModule):
                     self.diff_summary.append(diff_data)
                     self.reset_diffs_and_count()
 
-            for item in list(intune_data["value"]):  # Create a copy for iteration
-                # Remove items that cannot or should be removed
-                if (
-                    item.get("@odata.type")
-                    != "#microsoft.graph.windows10EnrollmentCompletionPageConfiguration"
-                    or item.get("displayName") == "All users and all devices"
-                ):
-                    intune_data["value"].remove(item)
+            # Leave out items that cannot or should not be removed
+            removable = [
+                item
+                for item in intune_data["value"]
+                if item.get("@odata.type")
+                == "#microsoft.graph.windows10EnrollmentCompletionPageConfiguration"
+                and item.get("displayName") != "All users and all devices"
+            ]
 
-            self.remove_downstream_data(self.CONFIG_ENDPOINT, intune_data["value"])
+            self.remove_downstream_data(self.CONFIG_ENDPOINT, removable)
 
         return self.diff_summary
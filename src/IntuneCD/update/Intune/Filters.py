@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-import os
 
-from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
+from ...intunecdlib.BaseUpdateModule import BaseUpdateModule, UpdateItem
+from ...intunecdlib.directory_cache import get_directory_cache
 
 
 class FiltersUpdateModule(BaseUpdateModule):
@@ -13,6 +13,8 @@ class FiltersUpdateModule(BaseUpdateModule):
     """
 
     CONFIG_ENDPOINT = "/beta/deviceManagement/assignmentFilters/"
+    parallel_items = True
+    batch_writes = True
 
     def __init__(self, *args, **kwargs):
         """Initializes the FiltersUpdateModule class
@@ -36,35 +38,61 @@ class FiltersUpdateModule(BaseUpdateModule):
                 self.log(tag="error", msg=f"Error getting {self.config_type} data: {e}")
                 return None
 
-            for filename in os.listdir(self.path):
-                repo_data = self.load_repo_data(filename)
-                if repo_data:
-                    self.match_info = {
-                        "displayName": repo_data.get("displayName"),
-                    }
-                    self.name = repo_data.get("displayName")
-                    diff_data = self.create_diff_data(self.name, self.config_type)
-                    repo_data.pop("payloads", None)
-                    update_data = repo_data.copy()
-                    update_data.pop("platform", None)
-
-                    try:
-                        self.process_update(
-                            downstream_data=intune_data["value"],
-                            repo_data=repo_data,
-                            method="patch",
-                            status_code=200,
-                            config_endpoint=self.CONFIG_ENDPOINT,
-                            update_data=update_data,
-                        )
-                    except Exception as e:
-                        self.log(
-                            tag="error",
-                            msg=f"Error updating {self.config_type} {self.name}: {e}",
-                        )
-
-                    self.set_diff_data(diff_data)
-                    self.diff_summary.append(diff_data)
-                    self.reset_diffs_and_count()
+            self.process_items(
+                self.list_repo_files(),
+                lambda filename, item: self.update_item(
+                    filename, intune_data["value"], item
+                ),
+            )
+
+            # Filters may have been created, reload them on the next assignment lookup
+            get_directory_cache().invalidate_filters()
 
         return self.diff_summary
+
+    def update_item(
+        self, filename: str, downstream_data: list, item: UpdateItem
+    ) -> dict:
+        """Updates a single filter from the repository
+
+        Args:
+            filename (str): The filename of the filter
+            downstream_data (list): The filters in Intune
+            item (UpdateItem): The state of the item
+
+        Returns:
+            dict: The diff data of the filter, None if the file was skipped
+        """
+        repo_data = self.load_repo_data(filename)
+        if not repo_data:
+            return None
+
+        item.match_info = {
+            "displayName": repo_data.get("displayName"),
+        }
+        item.name = repo_data.get("displayName")
+        diff_data = self.create_diff_data(item.name, self.config_type)
+        repo_data.pop("payloads", None)
+        update_data = repo_data.copy()
+        update_data.pop("platform", None)
+
+        try:
+            self.process_update(
+                downstream_data=downstream_data,
+                repo_data=repo_data,
+                method="patch",
+                status_code=200,
+                config_endpoint=self.CONFIG_ENDPOINT,
+                item=item,
+                update_data=update_data,
+            )
+        except Exception as e:
+            self.log(
+                tag="error",
+                msg=f"Error updating {self.config_type} {item.name}: {e}",
+            )
+
+        self.set_diff_data(diff_data, item)
+        self.reset_diffs_and_count(item)
+
+        return diff_data
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import json
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -426,7 +425,7 @@ class GroupPolicyConfigurationsUpdateModule(BaseUpdateModule):
 
                 intune_profiles.append(profile)
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
                     self.create_request = None
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 import json
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
+from ...intunecdlib.directory_cache import get_directory_cache
 
 
 class NotificationTemplateUpdateModule(BaseUpdateModule):
@@ -141,7 +141,7 @@ class NotificationTemplateUpdateModule(BaseUpdateModule):
                 if val["displayName"] != "EnrollmentNotificationInternalMEO"
             ]
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 # Reset the paramters
                 self.create_request = None
                 self.config_type = "Notification Template"
@@ -191,4 +191,7 @@ class NotificationTemplateUpdateModule(BaseUpdateModule):
 
             self.remove_downstream_data(self.CONFIG_ENDPOINT, intune_data["value"])
 
+            # Notification templates may have been created or removed, reload them on the next lookup
+            get_directory_cache().invalidate_notification_templates()
+
         return self.diff_summary
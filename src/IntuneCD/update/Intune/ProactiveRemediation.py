@@ -103,7 +103,7 @@ class ProactiveRemediationUpdateModule(BaseUpdateModule):
                 "",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.config_type = "Proactive Remediation"
                 self.notify = True
                 self.exclude_paths = [
@@ -183,9 +183,12 @@ class ProactiveRemediationUpdateModule(BaseUpdateModule):
                     self.diff_summary.append(diff_data)
                     self.reset_diffs_and_count()
 
-            for item in list(remediation_data):
-                if item.get("publisher") == "Microsoft":
-                    remediation_data.remove(item)
-            self.remove_downstream_data(self.CONFIG_ENDPOINT, remediation_data)
+            # Remediations published by Microsoft can not be removed
+            custom_remediations = [
+                item
+                for item in remediation_data
+                if item.get("publisher") != "Microsoft"
+            ]
+            self.remove_downstream_data(self.CONFIG_ENDPOINT, custom_remediations)
 
         return self.diff_summary
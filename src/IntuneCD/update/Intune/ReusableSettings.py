@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
+from ...intunecdlib.directory_cache import get_directory_cache
 
 
 class ReusableSettingsUpdateModule(BaseUpdateModule):
@@ -63,7 +63,7 @@ class ReusableSettingsUpdateModule(BaseUpdateModule):
                 self.log(tag="error", msg=f"Error getting {self.config_type} data: {e}")
                 return None
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.notify = True
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
@@ -102,4 +102,7 @@ class ReusableSettingsUpdateModule(BaseUpdateModule):
 
             self.remove_downstream_data(self.CONFIG_ENDPOINT, intune_data["value"])
 
+            # Reusable settings may have been created or removed, reload them on the next lookup
+            get_directory_cache().invalidate_reusable_settings()
+
         return self.diff_summary
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
+from ...intunecdlib.directory_cache import get_directory_cache
 
 
 class ScopeTagsUpdateModule(BaseUpdateModule):
@@ -47,7 +47,7 @@ class ScopeTagsUpdateModule(BaseUpdateModule):
                 "/assignments",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
                     self.match_info = {
@@ -74,9 +74,20 @@ class ScopeTagsUpdateModule(BaseUpdateModule):
                     self.diff_summary.append(diff_data)
                     self.reset_diffs_and_count()
 
-            for item in intune_data["value"]:
-                if item.get("isBuiltIn") is True:
-                    intune_data["value"].remove(item)
-            self.remove_downstream_data(self.CONFIG_ENDPOINT, intune_data["value"])
+            # Built-in scope tags can not be removed
+            custom_tags = [
+                item
+                for item in intune_data["value"]
+                if item.get("isBuiltIn") is not True
+            ]
+            self.remove_downstream_data(self.CONFIG_ENDPOINT, custom_tags)
+
+            # Modules depending on ScopeTags share this list, give them the created tags
+            if self.scope_tags is not None:
+                get_directory_cache().invalidate_scope_tags()
+                try:
+                    self.scope_tags[:] = get_directory_cache().get_scope_tags(self)
+                except Exception as e:
+                    self.log(tag="warning", msg=f"Could not reload scope tags: {e}")
 
         return self.diff_summary
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
-import os
 
-from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
+from ...intunecdlib.BaseUpdateModule import BaseUpdateModule, UpdateItem
 
 
 class SettingsCatalogUpdateModule(BaseUpdateModule):
@@ -13,6 +12,8 @@ class SettingsCatalogUpdateModule(BaseUpdateModule):
     """
 
     CONFIG_ENDPOINT = "/beta/deviceManagement/configurationPolicies/"
+    parallel_items = True
+    batch_writes = True
 
     def __init__(self, *args, **kwargs):
         """Initializes the SettingsCatalogUpdateModule class
@@ -60,43 +61,63 @@ class SettingsCatalogUpdateModule(BaseUpdateModule):
                 if settings:
                     profile["settings"] = settings
 
-            for filename in os.listdir(self.path):
-                repo_data = self.load_repo_data(filename)
-                if repo_data:
-                    if (
-                        "templateReference" in repo_data
-                        and repo_data["templateReference"].get("templateDisplayName")
-                        == "Endpoint detection and response"
-                    ):
-                        self.log(
-                            msg=f'Skipping "{repo_data["name"]}", Endpoint detection and response is currently not supported...',
-                        )
-                        continue
-                    self.match_info = {
-                        "name": repo_data.get("name"),
-                        "technologies": repo_data.get("technologies"),
-                    }
-                    self.name = repo_data.get("name")
-                    diff_data = self.create_diff_data(self.name, self.config_type)
-
-                    try:
-                        self.process_update(
-                            downstream_data=batch_data,
-                            repo_data=repo_data,
-                            method="put",
-                            status_code=204,
-                            config_endpoint=self.CONFIG_ENDPOINT,
-                        )
-                    except Exception as e:
-                        self.log(
-                            tag="error",
-                            msg=f"Error updating {self.config_type} {self.name}: {e}",
-                        )
-
-                    self.set_diff_data(diff_data)
-                    self.diff_summary.append(diff_data)
-                    self.reset_diffs_and_count()
+            self.process_items(
+                self.list_repo_files(),
+                lambda filename, item: self.update_item(filename, batch_data, item),
+            )
 
             self.remove_downstream_data(self.CONFIG_ENDPOINT, batch_data)
 
         return self.diff_summary
+
+    def update_item(
+        self, filename: str, downstream_data: list, item: UpdateItem
+    ) -> dict:
+        """Updates a single policy from the repository
+
+        Args:
+            filename (str): The filename of the policy
+            downstream_data (list): The policies in Intune
+            item (UpdateItem): The state of the item
+
+        Returns:
+            dict: The diff data of the policy, None if the file was skipped
+        """
+        repo_data = self.load_repo_data(filename)
+        if not repo_data:
+            return None
+        if (
+            "templateReference" in repo_data
+            and repo_data["templateReference"].get("templateDisplayName")
+            == "Endpoint detection and response"
+        ):
+            self.log(
+                msg=f'Skipping "{repo_data["name"]}", Endpoint detection and response is currently not supported...',
+            )
+            return None
+        item.match_info = {
+            "name": repo_data.get("name"),
+            "technologies": repo_data.get("technologies"),
+        }
+        item.name = repo_data.get("name")
+        diff_data = self.create_diff_data(item.name, self.config_type)
+
+        try:
+            self.process_update(
+                downstream_data=downstream_data,
+                repo_data=repo_data,
+                method="put",
+                status_code=204,
+                config_endpoint=self.CONFIG_ENDPOINT,
+                item=item,
+            )
+        except Exception as e:
+            self.log(
+                tag="error",
+                msg=f"Error updating {self.config_type} {item.name}: {e}",
+            )
+
+        self.set_diff_data(diff_data, item)
+        self.reset_diffs_and_count(item)
+
+        return diff_data
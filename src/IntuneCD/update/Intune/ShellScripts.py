@@ -97,7 +97,7 @@ class ShellScriptsUpdateModule(BaseUpdateModule):
                 "",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 self.notify = True
                 script_data = None
                 repo_data = self.load_repo_data(filename)
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import os
 
 from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
 
@@ -51,7 +50,7 @@ class WindowsEnrollmentProfileUpdateModule(BaseUpdateModule):
                 "/assignments",
             )
 
-            for filename in os.listdir(self.path):
+            for filename in self.list_repo_files():
                 repo_data = self.load_repo_data(filename)
                 if repo_data:
                     self.match_info = {
@@ -80,7 +79,8 @@ class WindowsEnrollmentProfileUpdateModule(BaseUpdateModule):
                     self.diff_summary.append(diff_data)
                     self.reset_diffs_and_count()
 
-            for item in intune_data["value"]:
+            # Only the profiles left unmatched are removed
+            for item in self.get_unmatched_data(intune_data["value"]):
                 if self.remove:
                     # Remvoe any assignments before removing the profile
                     endpoint = f"{self.endpoint}{self.CONFIG_ENDPOINT}{item['id']}{self.assignment_extra_url}"
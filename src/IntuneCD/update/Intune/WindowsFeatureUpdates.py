@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
-import os
 
-from ...intunecdlib.BaseUpdateModule import BaseUpdateModule
+from ...intunecdlib.BaseUpdateModule import BaseUpdateModule, UpdateItem
 
 
 class WindowsFeatureUpdatesUpdateModule(BaseUpdateModule):
@@ -13,6 +12,8 @@ class WindowsFeatureUpdatesUpdateModule(BaseUpdateModule):
     """
 
     CONFIG_ENDPOINT = "/beta/deviceManagement/windowsFeatureUpdateProfiles/"
+    parallel_items = True
+    batch_writes = True
 
     def __init__(self, *args, **kwargs):
         """Initializes the WindowsFeatureUpdatesUpdateModule class
@@ -48,44 +49,67 @@ class WindowsFeatureUpdatesUpdateModule(BaseUpdateModule):
                 "/assignments",
             )
 
-            for filename in os.listdir(self.path):
-                repo_data = self.load_repo_data(filename)
-                if repo_data:
-                    self.match_info = {
-                        "displayName": repo_data.get("displayName"),
-                    }
-                    self.name = repo_data.get("displayName")
-                    diff_data = self.create_diff_data(self.name, self.config_type)
-                    create_data = repo_data.copy()
-                    self.get_pop_keys(
-                        repo_data,
-                        [
-                            "deployableContentDisplayName",
-                            "endOfSupportDate",
-                            "installLatestWindows10OnWindows11IneligibleDevice",
-                        ],
-                        "pop",
-                    )
-
-                    try:
-                        self.process_update(
-                            downstream_data=intune_data["value"],
-                            repo_data=repo_data,
-                            method="patch",
-                            status_code=200,
-                            config_endpoint=self.CONFIG_ENDPOINT,
-                            create_data=create_data,
-                        )
-                    except Exception as e:
-                        self.log(
-                            tag="error",
-                            msg=f"Error updating {self.config_type} {self.name}: {e}",
-                        )
-
-                    self.set_diff_data(diff_data)
-                    self.diff_summary.append(diff_data)
-                    self.reset_diffs_and_count()
+            self.process_items(
+                self.list_repo_files(),
+                lambda filename, item: self.update_item(
+                    filename, intune_data["value"], item
+                ),
+            )
 
             self.remove_downstream_data(self.CONFIG_ENDPOINT, intune_data["value"])
 
         return self.diff_summary
+
+    def update_item(
+        self, filename: str, downstream_data: list, item: UpdateItem
+    ) -> dict:
+        """Updates a single profile from the repository
+
+        Args:
+            filename (str): The filename of the profile
+            downstream_data (list): The profiles in Intune
+            item (UpdateItem): The state of the item
+
+        Returns:
+            dict: The diff data of the profile, None if the file was skipped
+        """
+        repo_data = self.load_repo_data(filename)
+        if not repo_data:
+            return None
+
+        item.match_info = {
+            "displayName": repo_data.get("displayName"),
+        }
+        item.name = repo_data.get("displayName")
+        diff_data = self.create_diff_data(item.name, self.config_type)
+        create_data = repo_data.copy()
+        self.get_pop_keys(
+            repo_data,
+            [
+                "deployableContentDisplayName",
+                "endOfSupportDate",
+                "installLatestWindows10OnWindows11IneligibleDevice",
+            ],
+            "pop",
+        )
+
+        try:
+            self.process_update(
+                downstream_data=downstream_data,
+                repo_data=repo_data,
+                method="patch",
+                status_code=200,
+                config_endpoint=self.CONFIG_ENDPOINT,
+                create_data=create_data,
+                item=item,
+            )
+        except Exception as e:
+            self.log(
+                tag="error",
+                msg=f"Error updating {self.config_type} {item.name}: {e}",
+            )
+
+        self.set_diff_data(diff_data, item)
+        self.reset_diffs_and_count(item)
+
+        return diff_data
@@ -14,6 +14,7 @@ def update_entra(diff_summary, path, token, azure_token, report, args, exclude):
         "report": report,
         "exclude": exclude,
         "azure_token": azure_token,
+        "repo_changes": getattr(args, "repo_changes", None),
     }
     if args.interactiveauth:
         from .update.Entra.DeviceRegistration import (
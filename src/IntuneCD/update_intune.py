@@ -1,9 +1,31 @@
 # -*- coding: utf-8 -*-
 import importlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .intunecdlib.process_scope_tags import ProcessScopeTags
 from .decorators import time_command
+from .intunecdlib.directory_cache import reset_directory_cache
+from .intunecdlib.module_scheduler import ModuleScheduler
+from .intunecdlib.process_group_names import ProcessGroupNames
+from .intunecdlib.process_scope_tags import ProcessScopeTags
+
+# Modules referenced by name from most configurations, they run before all other modules
+COMMON_DEPENDENCIES = ["ScopeTags", "Filters"]
+# Modules that have to finish before a module starts, keyed by the exclude key of the module
+UPDATE_DEPENDENCIES = {
+    "Filters": ["ScopeTags"],
+    "DeviceCompliancePolicies": ["NotificationTemplate", "ReusablePolicySettings"],
+    "Compliance": ["NotificationTemplate", "ComplianceScripts"],
+}
+
+
+def get_update_dependencies(name: str) -> list:
+    """
+    Gets the modules that have to finish before the update module starts.
+    """
+    dependencies = list(UPDATE_DEPENDENCIES.get(name, []))
+    if name not in COMMON_DEPENDENCIES:
+        dependencies.extend(COMMON_DEPENDENCIES)
+
+    return dependencies
 
 
 def import_update_module(module_path: str):
@@ -39,11 +61,22 @@ def update_intune(
     Dynamically imports and runs update modules in parallel.
     """
 
+    # Groups, filters and scope tags are shared by all modules of the run
+    reset_directory_cache()
     process_scope_tags = ProcessScopeTags(token)
     scope_tags = None
     if "ScopeTags" not in exclude:
         scope_tags = process_scope_tags.get_scope_tags()
 
+    # Resolve the group names of all assignments in bulk before the modules run
+    if assignment:
+        try:
+            ProcessGroupNames(token).resolve_group_names(
+                path, getattr(args, "repo_changes", None)
+            )
+        except Exception as e:
+            print(f"[WARNING] Could not resolve group names in bulk: {e}")
+
     params = {
         "path": path,
         "token": token,
@@ -53,6 +86,8 @@ def update_intune(
         "create_groups": create_groups,
         "handle_assignment": assignment,
         "scope_tags": scope_tags,
+        "item_workers": getattr(args, "item_workers", 1),
+        "repo_changes": getattr(args, "repo_changes", None),
     }
 
     update_modules = [
@@ -186,23 +221,24 @@ def update_intune(
             "***Device Management Settings is only available with interactive auth***"
         )
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_module = {}
-
-        for exclude_key, module_path, class_name in update_modules:
-            if exclude_key not in exclude:
-                module = import_update_module(module_path)
-                if module:
-                    update_class = getattr(module, class_name)
-                    future = executor.submit(update_class(**params).main)
-                    future_to_module[future] = exclude_key
-
-        # Collect results as tasks complete
-        for future in as_completed(future_to_module):
-            module_name = future_to_module[future]
-            try:
-                result = future.result()
-                if result:
-                    diff_summary.append(result)
-            except Exception as e:
-                print(f"[ERROR] {module_name} failed with exception: {e}")
+    # Modules start as soon as the modules they depend on have finished
+    scheduler = ModuleScheduler(max_workers)
+    for exclude_key, module_path, class_name in update_modules:
+        if exclude_key not in exclude:
+            module = import_update_module(module_path)
+            if module:
+                update_class = getattr(module, class_name)
+                scheduler.add(
+                    exclude_key,
+                    update_class(**params).main,
+                    get_update_dependencies(exclude_key),
+                )
+
+    for module_name, result in scheduler.run():
+        if isinstance(result, Exception):
+            print(f"[ERROR] {module_name} failed with exception: {result}")
+        elif result:
+            diff_summary.append(result)
+    critical_path = scheduler.report()
+    if critical_path:
+        print(f"[INFO] {critical_path}")
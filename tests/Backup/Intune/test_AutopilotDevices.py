@@ -11,30 +11,45 @@ class TestAutopilotDevicesBackupModule(unittest.TestCase):
     def setUp(self):
         self.module = AutopilotDevicesBackupModule()
 
-    @patch.object(AutopilotDevicesBackupModule, "make_graph_request")
+    @patch.object(AutopilotDevicesBackupModule, "iter_graph_pages")
     @patch.object(AutopilotDevicesBackupModule, "process_data")
-    def test_main(self, mock_process_data, mock_make_graph_request):
-        """Test that main calls make_graph_request and process_data."""
-        mock_make_graph_request.return_value = {"value": [{"id": "object"}]}
+    def test_main(self, mock_process_data, mock_iter_graph_pages):
+        """Test that main calls iter_graph_pages and process_data."""
+        mock_iter_graph_pages.return_value = iter([{"value": [{"id": "object"}]}])
 
         self.module.main()
 
-        mock_make_graph_request.assert_called_once_with(
+        mock_iter_graph_pages.assert_called_once_with(
             endpoint=self.module.endpoint + self.module.CONFIG_ENDPOINT,
         )
         mock_process_data.assert_called_once_with(
-            data=mock_make_graph_request.return_value["value"],
+            data=[{"id": "object"}],
             filetype=None,
             path="None/Autopilot Devices/",
             name_key="id",
             log_message=None,
         )
 
-    @patch.object(AutopilotDevicesBackupModule, "make_graph_request")
+    @patch.object(AutopilotDevicesBackupModule, "iter_graph_pages")
+    @patch.object(AutopilotDevicesBackupModule, "process_data")
+    def test_main_processes_each_page(self, mock_process_data, mock_iter_graph_pages):
+        """Test that main processes every page as it is received."""
+        mock_iter_graph_pages.return_value = iter(
+            [{"value": [{"id": "1"}]}, {"value": [{"id": "2"}]}]
+        )
+
+        self.module.main()
+
+        self.assertEqual(mock_process_data.call_count, 2)
+        self.assertEqual(
+            mock_process_data.call_args_list[1].kwargs["data"], [{"id": "2"}]
+        )
+
+    @patch.object(AutopilotDevicesBackupModule, "_graph_request")
     @patch.object(AutopilotDevicesBackupModule, "log")
-    def test_main_logs_exception_graph_data(self, mock_log, mock_make_graph_request):
-        """Test that main logs an exception if make_graph_request raises an exception."""
-        mock_make_graph_request.side_effect = Exception("Test exception")
+    def test_main_logs_exception_graph_data(self, mock_log, mock_graph_request):
+        """Test that main logs an exception if the Graph request raises an exception."""
+        mock_graph_request.side_effect = Exception("Test exception")
 
         self.module.main()
 
@@ -44,13 +59,13 @@ class TestAutopilotDevicesBackupModule(unittest.TestCase):
         )
 
     @patch.object(AutopilotDevicesBackupModule, "process_data")
-    @patch.object(AutopilotDevicesBackupModule, "make_graph_request")
+    @patch.object(AutopilotDevicesBackupModule, "iter_graph_pages")
     @patch.object(AutopilotDevicesBackupModule, "log")
     def test_main_logs_exception_process_data(
-        self, mock_log, mock_make_graph_request, mock_process_data
+        self, mock_log, mock_iter_graph_pages, mock_process_data
     ):
         """Test that main logs an exception if process_data raises an exception."""
-        mock_make_graph_request.return_value = {"value": [{"id": "object"}]}
+        mock_iter_graph_pages.return_value = iter([{"value": [{"id": "object"}]}])
         mock_process_data.side_effect = Exception("Test exception")
 
         self.module.main()
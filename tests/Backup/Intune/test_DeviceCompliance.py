@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+
+from src.IntuneCD.backup.Intune.DeviceCompliance import DeviceComplianceBackupModule
+from src.IntuneCD.intunecdlib.directory_cache import reset_directory_cache
+
+
+class TestDeviceComplianceBackupModule(unittest.TestCase):
+    """Tests for the DeviceComplianceBackupModule class."""
+
+    def setUp(self):
+        reset_directory_cache()
+        self.module = DeviceComplianceBackupModule()
+        self.module.exclude = []
+        self.policies = {
+            "value": [
+                {"id": "policy1", "name": "Policy 1"},
+                {"id": "policy2", "name": "Policy 2"},
+            ]
+        }
+        self.actions = {
+            policy_id: {
+                "value": [
+                    {
+                        "id": "rule",
+                        "scheduledActionConfigurations": [
+                            {"id": "block", "notificationTemplateId": template_id},
+                        ],
+                    }
+                ]
+            }
+            for policy_id, template_id in [
+                ("policy1", "template"),
+                ("policy2", "00000000-0000-0000-0000-000000000000"),
+            ]
+        }
+
+    @patch.object(DeviceComplianceBackupModule, "make_graph_request")
+    @patch.object(DeviceComplianceBackupModule, "batch_request_by_key")
+    @patch.object(DeviceComplianceBackupModule, "process_data")
+    def test_main(
+        self, mock_process_data, mock_batch_request_by_key, mock_make_graph_request
+    ):
+        """Test that main batches the scheduled action and template requests."""
+        mock_make_graph_request.return_value = self.policies
+        mock_batch_request_by_key.side_effect = [
+            self.actions,
+            {"template": {"id": "template", "displayName": "Template"}},
+        ]
+
+        self.module.main()
+
+        mock_make_graph_request.assert_called_once()
+        self.assertEqual(
+            [c.args[0] for c in mock_batch_request_by_key.call_args_list],
+            [["policy1", "policy2"], ["template"]],
+        )
+        data = mock_process_data.call_args.kwargs["data"]
+        actions = [
+            item["scheduledActionsForRule"][0]["scheduledActionConfigurations"][0]
+            for item in data
+        ]
+        self.assertEqual(actions[0]["notificationTemplateName"], "Template")
+        self.assertNotIn("notificationTemplateName", actions[1])
+
+    @patch.object(DeviceComplianceBackupModule, "make_graph_request")
+    @patch.object(DeviceComplianceBackupModule, "batch_request_by_key")
+    @patch.object(DeviceComplianceBackupModule, "process_data")
+    def test_main_templates_requested_once(
+        self, _, mock_batch_request_by_key, mock_make_graph_request
+    ):
+        """Test that notification templates are only requested once per run."""
+        mock_make_graph_request.return_value = self.policies
+        mock_batch_request_by_key.side_effect = [
+            self.actions,
+            {"template": {"id": "template", "displayName": "Template"}},
+            self.actions,
+        ]
+
+        self.module.main()
+        self.module.main()
+
+        self.assertEqual(mock_batch_request_by_key.call_count, 3)
+
+    @patch.object(DeviceComplianceBackupModule, "make_graph_request")
+    @patch.object(DeviceComplianceBackupModule, "log")
+    def test_main_logs_exception_graph_data(self, mock_log, mock_make_graph_request):
+        """Test that main logs an exception if make_graph_request raises an exception."""
+        mock_make_graph_request.side_effect = Exception("Test exception")
+
+        self.module.main()
+
+        mock_log.assert_called_with(
+            tag="error",
+            msg=f"Error getting Compliance Policy data from {self.module.endpoint + self.module.CONFIG_ENDPOINT}: Test exception",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,26 +21,35 @@ class TestGroupPolicyConfigurationsBackupModule(unittest.TestCase):
             }
         ]
 
+    @patch.object(GroupPolicyConfigurationsBackupModule, "batch_request_by_key")
     @patch.object(GroupPolicyConfigurationsBackupModule, "make_graph_request")
     @patch.object(GroupPolicyConfigurationsBackupModule, "process_data")
-    def test_main(self, mock_process_data, mock_make_graph_request):
-        """Test that main calls make_graph_request and process_data."""
-        mock_make_graph_request.side_effect = [
-            {"value": [{"id": "object"}]},
-            {"value": [{"id": "definition"}]},
-            {"value": [{"id": "presentation"}]},
+    def test_main(
+        self, mock_process_data, mock_make_graph_request, mock_batch_request_by_key
+    ):
+        """Test that main batches the definition and presentation requests."""
+        mock_make_graph_request.return_value = {"value": [{"id": "object"}]}
+        mock_batch_request_by_key.side_effect = [
+            {"object": {"value": [{"id": "definition"}]}},
+            {"object/definitionValues/definition": {"value": [{"id": "presentation"}]}},
         ]
 
         self.module.main()
 
-        mock_make_graph_request.assert_has_calls(
+        mock_make_graph_request.assert_called_once_with(
+            endpoint=self.module.endpoint + self.module.CONFIG_ENDPOINT
+        )
+        mock_batch_request_by_key.assert_has_calls(
             [
-                call(endpoint=self.module.endpoint + self.module.CONFIG_ENDPOINT),
                 call(
-                    endpoint=f"{self.module.endpoint}{self.module.CONFIG_ENDPOINT}/object/definitionValues?$expand=definition"
+                    ["object"],
+                    "deviceManagement/groupPolicyConfigurations/",
+                    "/definitionValues?$expand=definition",
                 ),
                 call(
-                    endpoint=f"{self.module.endpoint}{self.module.CONFIG_ENDPOINT}/object/definitionValues/definition/presentationValues?$expand=presentation"
+                    ["object/definitionValues/definition"],
+                    "deviceManagement/groupPolicyConfigurations/",
+                    "/presentationValues?$expand=presentation",
                 ),
             ]
         )
@@ -56,6 +65,37 @@ class TestGroupPolicyConfigurationsBackupModule(unittest.TestCase):
             },
         )
 
+    @patch.object(GroupPolicyConfigurationsBackupModule, "batch_request_by_key")
+    @patch.object(GroupPolicyConfigurationsBackupModule, "make_graph_request")
+    @patch.object(GroupPolicyConfigurationsBackupModule, "process_data")
+    @patch.object(GroupPolicyConfigurationsBackupModule, "log")
+    def test_main_skips_missing_presentation_values(
+        self,
+        mock_log,
+        mock_process_data,
+        mock_make_graph_request,
+        mock_batch_request_by_key,
+    ):
+        """Test that main does not write a configuration missing presentation values."""
+        mock_make_graph_request.return_value = {
+            "value": [{"id": "object"}, {"id": "failed"}]
+        }
+        mock_batch_request_by_key.side_effect = [
+            {
+                "object": {"value": [{"id": "definition"}]},
+                "failed": {"value": [{"id": "definition"}]},
+            },
+            {"object/definitionValues/definition": {"value": [{"id": "presentation"}]}},
+        ]
+
+        self.module.main()
+
+        mock_log.assert_any_call(
+            tag="error",
+            msg="Could not get the presentation values of definition value failed/definitionValues/definition",
+        )
+        self.assertEqual(mock_process_data.call_args.kwargs["data"], self.expected_data)
+
     @patch.object(GroupPolicyConfigurationsBackupModule, "make_graph_request")
     @patch.object(GroupPolicyConfigurationsBackupModule, "log")
     def test_main_logs_exception_graph_data(self, mock_log, mock_make_graph_request):
@@ -69,17 +109,22 @@ class TestGroupPolicyConfigurationsBackupModule(unittest.TestCase):
             msg=f"Error getting Group Policy Configuration data from {self.module.endpoint + self.module.CONFIG_ENDPOINT}: Test exception",
         )
 
+    @patch.object(GroupPolicyConfigurationsBackupModule, "batch_request_by_key")
     @patch.object(GroupPolicyConfigurationsBackupModule, "process_data")
     @patch.object(GroupPolicyConfigurationsBackupModule, "make_graph_request")
     @patch.object(GroupPolicyConfigurationsBackupModule, "log")
     def test_main_logs_exception_process_data(
-        self, mock_log, mock_make_graph_request, mock_process_data
+        self,
+        mock_log,
+        mock_make_graph_request,
+        mock_process_data,
+        mock_batch_request_by_key,
     ):
         """Test that main logs an exception if process_data raises an exception."""
-        mock_make_graph_request.side_effect = [
-            {"value": [{"id": "object"}]},
-            {"value": [{"id": "definition"}]},
-            {"value": [{"id": "presentation"}]},
+        mock_make_graph_request.return_value = {"value": [{"id": "object"}]}
+        mock_batch_request_by_key.side_effect = [
+            {"object": {"value": [{"id": "definition"}]}},
+            {"object/definitionValues/definition": {"value": [{"id": "presentation"}]}},
         ]
         mock_process_data.side_effect = Exception("Test exception")
 
@@ -13,6 +13,7 @@ class TestSettingsCatalogBackupModule(unittest.TestCase):
 
     @patch.object(SettingsCatalogBackupModule, "make_graph_request")
     @patch.object(SettingsCatalogBackupModule, "batch_request")
+    @patch.object(SettingsCatalogBackupModule, "batch_assignment", return_value={})
     @patch.object(SettingsCatalogBackupModule, "make_audit_request")
     @patch.object(SettingsCatalogBackupModule, "get_object_details")
     @patch.object(SettingsCatalogBackupModule, "process_data")
@@ -21,6 +22,7 @@ class TestSettingsCatalogBackupModule(unittest.TestCase):
         mock_process_data,
         mock_get_object_details,
         mock_make_audit_request,
+        mock_batch_assignment,
         mock_batch_request,
         mock_make_graph_request,
     ):
@@ -64,6 +66,7 @@ class TestSettingsCatalogBackupModule(unittest.TestCase):
 
     @patch.object(SettingsCatalogBackupModule, "make_graph_request")
     @patch.object(SettingsCatalogBackupModule, "batch_request")
+    @patch.object(SettingsCatalogBackupModule, "batch_assignment", return_value={})
     @patch.object(SettingsCatalogBackupModule, "make_audit_request")
     @patch.object(SettingsCatalogBackupModule, "get_object_details")
     @patch.object(SettingsCatalogBackupModule, "process_data")
@@ -74,6 +77,7 @@ class TestSettingsCatalogBackupModule(unittest.TestCase):
         mock_process_data,
         mock_get_object_details,
         mock_make_audit_request,
+        mock_batch_assignment,
         mock_batch_request,
         mock_make_graph_request,
     ):
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the batch engine of the BaseGraphModule.
+"""
+
+import json
+import unittest
+from unittest.mock import patch
+
+from src.IntuneCD.intunecdlib.BaseGraphModule import BaseGraphModule
+from src.IntuneCD.intunecdlib.directory_cache import reset_directory_cache
+
+
+class FakeGraph:
+    """Fake $batch endpoint, throttles each sub-request the configured number of times."""
+
+    def __init__(self, throttle_times: int = 0):
+        self.throttle_times = throttle_times
+        self.seen = {}
+        self.batch_calls = 0
+
+    def __call__(self, endpoint, method="GET", data=None, **kwargs):
+        self.batch_calls += 1
+        responses = []
+        for req in json.loads(data)["requests"]:
+            count = self.seen.get(req["url"], 0)
+            self.seen[req["url"]] = count + 1
+            if count < self.throttle_times:
+                responses.append({"id": str(req["id"]), "status": 429, "headers": {}})
+            else:
+                responses.append(
+                    {
+                        "id": str(req["id"]),
+                        "status": 200,
+                        "headers": {},
+                        "body": {"url": req["url"]},
+                    }
+                )
+        # Graph does not guarantee the order of the sub-responses
+        return {"responses": list(reversed(responses))}
+
+
+class PagedGraph:
+    """Fake $batch endpoint returning three pages for every sub-request."""
+
+    def __init__(self):
+        self.urls = []
+
+    def __call__(self, endpoint, method="GET", data=None, **kwargs):
+        responses = []
+        for req in json.loads(data)["requests"]:
+            self.urls.append(req["url"])
+            base, _, page = req["url"].partition("?$skiptoken=")
+            page = int(page or 1)
+            body = {"value": [f"{base}-{page}"]}
+            if page < 3:
+                body[
+                    "@odata.nextLink"
+                ] = f"https://graph.microsoft.com/beta/{base}?$skiptoken={page + 1}"
+            responses.append(
+                {"id": str(req["id"]), "status": 200, "headers": {}, "body": body}
+            )
+        return {"responses": responses}
+
+
+class TestGraphPaging(unittest.TestCase):
+    """Test class for the paging helpers of BaseGraphModule."""
+
+    def setUp(self):
+        self.module = BaseGraphModule()
+        self.module.token = {"access_token": "token"}
+        self.pages = {
+            "https://graph.microsoft.com/beta/objects": {
+                "value": [1, 2],
+                "@odata.nextLink": "https://graph.microsoft.com/beta/objects?page=2",
+            },
+            "https://graph.microsoft.com/beta/objects?page=2": {
+                "value": [3],
+                "@odata.nextLink": "https://graph.microsoft.com/beta/objects?page=3",
+            },
+            "https://graph.microsoft.com/beta/objects?page=3": {"value": [4]},
+        }
+        self.calls = []
+
+        def fake_request(
+            endpoint, params=None, method="GET", status_code=200, data=None
+        ):
+            self.calls.append((endpoint, params))
+            return dict(self.pages[endpoint])
+
+        patch.object(self.module, "_graph_request", side_effect=fake_request).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_iter_graph_pages(self):
+        """Pages should be yielded one at a time without the next link."""
+
+        pages = self.module.iter_graph_pages(
+            "https://graph.microsoft.com/beta/objects", params={"$top": 2}
+        )
+
+        self.assertEqual(next(pages), {"value": [1, 2]})
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(list(pages), [{"value": [3]}, {"value": [4]}])
+        # The query parameters are only sent with the first request
+        self.assertEqual(
+            [params for _, params in self.calls], [{"$top": 2}, None, None]
+        )
+
+    def test_iter_graph_items(self):
+        """Items of every page should be yielded."""
+
+        items = list(
+            self.module.iter_graph_items("https://graph.microsoft.com/beta/objects")
+        )
+
+        self.assertEqual(items, [1, 2, 3, 4])
+
+    def test_make_graph_request_collects_pages(self):
+        """make_graph_request should return all pages merged into the first page."""
+
+        data = self.module.make_graph_request(
+            "https://graph.microsoft.com/beta/objects"
+        )
+
+        self.assertEqual(data, {"value": [1, 2, 3, 4]})
+
+
+class TestBatchRequest(unittest.TestCase):
+    """Test class for BaseGraphModule.batch_request."""
+
+    def setUp(self):
+        self.module = BaseGraphModule()
+        self.module.token = {"access_token": "token"}
+        self.governor = patch(
+            "src.IntuneCD.intunecdlib.BaseGraphModule.get_governor"
+        ).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_batch_request_keeps_order(self):
+        """Responses should be returned in the same order as the data."""
+
+        fake = FakeGraph()
+        ids = [str(i) for i in range(95)]
+        with patch.object(self.module, "make_graph_request", side_effect=fake):
+            responses = self.module.batch_request(ids, "objects/", "/assignments")
+
+        self.assertEqual(
+            [r["url"] for r in responses], [f"objects/{i}/assignments" for i in ids]
+        )
+        self.assertEqual(fake.batch_calls, 5)
+
+    def test_batch_request_retries_throttled_requests(self):
+        """Throttled sub-requests should be retried until they succeed."""
+
+        fake = FakeGraph(throttle_times=2)
+        ids = [str(i) for i in range(30)]
+        with patch.object(self.module, "make_graph_request", side_effect=fake):
+            responses = self.module.batch_request(ids, "objects/", "")
+
+        self.assertEqual([r["url"] for r in responses], [f"objects/{i}" for i in ids])
+        self.governor.return_value.on_throttle.assert_called()
+
+    def test_batch_request_gives_up_after_max_retries(self):
+        """Sub-requests throttled on every attempt should be left out of the responses."""
+
+        fake = FakeGraph(throttle_times=100)
+        with patch.object(
+            self.module, "make_graph_request", side_effect=fake
+        ), patch.object(self.module, "log") as log:
+            responses = self.module.batch_request(["1", "2"], "objects/", "")
+
+        self.assertEqual(responses, [])
+        self.assertEqual(fake.seen["objects/1"], 11)
+        # Every attempt pauses for the default wait as no Retry-After is sent
+        on_throttle = self.governor.return_value.on_throttle
+        self.assertEqual(on_throttle.call_count, 11)
+        on_throttle.assert_called_with(20)
+        self.assertEqual(log.call_args.kwargs["tag"], "error")
+        self.assertIn("objects/1, objects/2", log.call_args.kwargs["msg"])
+
+    def test_handle_responses_default_wait(self):
+        """Throttled sub-responses without a Retry-After should pause for the default wait."""
+
+        wait_time = self.module.handle_responses(
+            [{"id": "1", "status": 429, "headers": {}}], {}, set()
+        )
+
+        self.assertEqual(wait_time, 20)
+        self.governor.return_value.on_throttle.assert_called_once_with(20)
+
+    def test_batch_request_no_data(self):
+        """No requests should be made when there is no data."""
+
+        fake = FakeGraph()
+        with patch.object(self.module, "make_graph_request", side_effect=fake):
+            responses = self.module.batch_request([], "objects/", "")
+
+        self.assertEqual(responses, [])
+        self.assertEqual(fake.batch_calls, 0)
+
+    def test_batch_request_follows_next_link(self):
+        """Paged sub-responses should be merged into the response of the first page."""
+
+        fake = PagedGraph()
+        with patch.object(self.module, "make_graph_request", side_effect=fake):
+            responses = self.module.batch_request(["1", "2"], "objects/", "")
+
+        self.assertEqual(
+            responses,
+            [
+                {"value": ["objects/1-1", "objects/1-2", "objects/1-3"]},
+                {"value": ["objects/2-1", "objects/2-2", "objects/2-3"]},
+            ],
+        )
+        self.assertIn("objects/1?$skiptoken=3", fake.urls)
+
+    def test_batch_oma_settings(self):
+        """Encrypted OMA settings of all configurations should be resolved in one batch."""
+
+        fake = FakeGraph()
+        data = [
+            {
+                "id": f"config{i}",
+                "omaSettings": [
+                    {"isEncrypted": True, "secretReferenceValueId": f"secret{i}"},
+                    {"isEncrypted": False, "value": "plain"},
+                ],
+            }
+            for i in range(2)
+        ]
+        with patch.object(self.module, "make_graph_request", side_effect=fake):
+            values = self.module.batch_oma_settings(data, "configs/")
+
+        self.assertEqual(fake.batch_calls, 1)
+        self.assertEqual(
+            values["secret1"]["url"],
+            "configs/config1/getOmaSettingPlainTextValue(secretReferenceValueId='secret1')",
+        )
+        self.assertEqual(list(values), ["secret0", "secret1"])
+
+    def test_handle_responses_bookkeeping(self):
+        """Responses should be keyed by id and throttled requests tracked as failed."""
+
+        responses = {}
+        failed = {3}
+        request_data = [
+            {"id": "1", "status": 200, "headers": {}, "body": {"id": "a"}},
+            {"id": "2", "status": 429, "headers": {"Retry-After": "5"}},
+            {"id": "3", "status": 404, "headers": {}},
+        ]
+
+        wait_time = self.module.handle_responses(request_data, responses, failed)
+
+        self.assertEqual(responses, {1: {"id": "a"}})
+        self.assertEqual(failed, {2})
+        self.assertEqual(wait_time, 5)
+        self.governor.return_value.on_throttle.assert_called_once_with(5)
+
+
+class TestBatchAssignment(unittest.TestCase):
+    """Test class for the assignment index of BaseGraphModule."""
+
+    def setUp(self):
+        self.module = BaseGraphModule()
+        self.module.token = {"access_token": "token"}
+        self.assignment = {
+            "id": "assignment",
+            "target": {
+                "groupId": "group",
+                "deviceAndAppManagementAssignmentFilterId": None,
+            },
+        }
+        patch.object(self.module, "get_group_names").start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_batch_assignment_keyed_by_object_id(self):
+        """Responses should be keyed by the object ID, not by their position."""
+
+        batch = patch.object(
+            self.module,
+            "batch_responses",
+            return_value={2: {"value": [self.assignment], "@odata.context": "b"}},
+        ).start()
+
+        responses = self.module.batch_assignment(
+            [{"id": "a"}, {"id": "b"}], "objects/", "/assignments"
+        )
+
+        batch.assert_called_once_with(["a", "b"], "objects/", "/assignments", "GET")
+        self.assertEqual(list(responses), ["b"])
+        self.assertEqual(self.module.get_object_assignment("a", responses), [])
+        self.assertEqual(
+            self.module.get_object_assignment("b", responses),
+            [{"target": {"deviceAndAppManagementAssignmentFilterId": None}}],
+        )
+
+    def test_batch_assignment_app_protection(self):
+        """App protection responses should be keyed by the object ID without the platform."""
+
+        self.module.app_protection = True
+        patch.object(
+            self.module,
+            "batch_responses",
+            return_value={1: {"value": [self.assignment], "@odata.context": "a"}},
+        ).start()
+
+        responses = self.module.batch_assignment(
+            [{"id": "a", "@odata.type": "#microsoft.graph.iosManagedAppProtection"}],
+            "deviceAppManagement/",
+            "/assignments",
+        )
+
+        self.assertEqual(list(responses), ["a"])
+
+    def test_get_object_assignment_no_prefix_match(self):
+        """An ID that is a prefix of another ID should not match its assignments."""
+
+        responses = {"ab": {"value": [self.assignment], "@odata.context": "ab"}}
+
+        self.assertEqual(self.module.get_object_assignment("a", responses), [])
+
+
+class TestNameResolution(unittest.TestCase):
+    """Test class for the group and filter name resolution of BaseGraphModule."""
+
+    def setUp(self):
+        reset_directory_cache()
+        self.module = BaseGraphModule()
+        self.responses = [
+            {
+                "value": [
+                    {
+                        "target": {
+                            "groupId": f"group{i % 2}",
+                            "deviceAndAppManagementAssignmentFilterId": f"filter{i % 2}",
+                        }
+                    }
+                    for i in range(4)
+                ]
+            }
+        ]
+
+    def test_get_group_names(self):
+        """Group IDs should be deduplicated and resolved to names."""
+
+        groups = [
+            {"id": "group0", "displayName": "Group 0", "groupTypes": []},
+            {
+                "id": "group1",
+                "displayName": "Group 1",
+                "groupTypes": ["DynamicMembership"],
+                "membershipRule": "rule",
+            },
+        ]
+        with patch.object(
+            self.module, "batch_request", return_value=groups
+        ) as batch_request:
+            self.module.get_group_names(
+                self.responses,
+                [a["target"]["groupId"] for a in self.responses[0]["value"]],
+            )
+
+        self.assertEqual(batch_request.call_args.args[0], ["group0", "group1"])
+        targets = [a["target"] for a in self.responses[0]["value"]]
+        self.assertEqual(targets[0]["groupName"], "Group 0")
+        self.assertEqual(targets[0]["groupType"], "StaticMembership")
+        self.assertEqual(targets[3]["groupName"], "Group 1")
+        self.assertEqual(targets[3]["membershipRule"], "rule")
+
+    def test_get_filter_names(self):
+        """Filter IDs should be replaced with the filter names of the cached filters."""
+
+        filters = {
+            "value": [
+                {"id": "filter0", "displayName": "Filter 0"},
+                {"id": "filter1", "displayName": "Filter 1"},
+            ]
+        }
+        with patch.object(
+            self.module, "make_graph_request", return_value=filters
+        ) as make_graph_request:
+            self.module.get_filter_names(self.responses, ["filter0", "filter1"])
+            self.module.get_filter_names([], ["filter0"])
+
+        make_graph_request.assert_called_once()
+        self.assertEqual(
+            [
+                a["target"]["deviceAndAppManagementAssignmentFilterId"]
+                for a in self.responses[0]["value"]
+            ],
+            ["Filter 0", "Filter 1", "Filter 0", "Filter 1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
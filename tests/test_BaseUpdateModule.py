@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the BaseUpdateModule.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.IntuneCD.intunecdlib.BaseUpdateModule import BaseUpdateModule, UpdateItem
+from src.IntuneCD.intunecdlib.change_plan import ChangePlan, configure_change_plan
+
+
+class TestGetMatchData(unittest.TestCase):
+    """Test class for BaseUpdateModule.get_match_data."""
+
+    def setUp(self):
+        self.module = BaseUpdateModule()
+        self.intune_data = [
+            {"id": "1", "displayName": "a", "@odata.type": "#type1"},
+            {"id": "2", "displayName": "a", "@odata.type": "#type2"},
+            {"id": "3", "displayName": "b", "@odata.type": "#type1"},
+            {"id": "4", "displayName": "b", "@odata.type": "#type1"},
+        ]
+
+    def test_get_match_data(self):
+        """The item matching all match info keys should be returned."""
+
+        item, item_id = self.module.get_match_data(
+            self.intune_data, {"displayName": "a", "@odata.type": "#type2"}
+        )
+
+        self.assertEqual(item_id, "2")
+        self.assertEqual(item, self.intune_data[1])
+        self.assertIsNot(item, self.intune_data[1])
+
+    def test_get_match_data_no_match(self):
+        """None should be returned when no item matches."""
+
+        self.assertEqual(
+            self.module.get_match_data(self.intune_data, {"displayName": "c"}),
+            (None, None),
+        )
+
+    def test_get_match_data_consumes_items(self):
+        """A matched item should not be matched again, duplicates match in order."""
+
+        match_info = {"displayName": "b", "@odata.type": "#type1"}
+
+        matches = [
+            self.module.get_match_data(self.intune_data, match_info) for _ in range(3)
+        ]
+
+        self.assertEqual([item_id for _, item_id in matches], ["3", "4", None])
+
+    def test_get_match_data_builds_index_once(self):
+        """The index should be reused for lookups on the same list."""
+
+        with patch.object(
+            self.module, "_get_match_value", wraps=self.module._get_match_value
+        ) as get_match_value:
+            self.module.get_match_data(self.intune_data, {"displayName": "a"})
+            first = get_match_value.call_count
+            self.module.get_match_data(self.intune_data, {"displayName": "b"})
+
+        self.assertEqual(first, len(self.intune_data) + 1)
+        self.assertEqual(get_match_value.call_count, first + 1)
+
+    def test_get_match_data_rebuilds_changed_list(self):
+        """Items added to the list after the index was built should be found."""
+
+        self.module.get_match_data(self.intune_data, {"displayName": "a"})
+        self.intune_data.append({"id": "5", "displayName": "c"})
+
+        self.assertEqual(
+            self.module.get_match_data(self.intune_data, {"displayName": "c"})[1], "5"
+        )
+
+    def test_get_match_data_unhashable_values(self):
+        """List values should be matched on their content."""
+
+        self.intune_data.append({"id": "5", "displayName": "c", "platforms": ["a"]})
+
+        self.assertEqual(
+            self.module.get_match_data(
+                self.intune_data, {"displayName": "c", "platforms": ["a"]}
+            )[1],
+            "5",
+        )
+
+    def test_remove_downstream_data_skips_matched_items(self):
+        """Only items that were not matched should be removed."""
+
+        self.module.remove = True
+        self.module.get_match_data(self.intune_data, {"displayName": "a"})
+        self.module.get_match_data(self.intune_data, {"displayName": "b"})
+
+        with patch.object(self.module, "process_batch", return_value=[]) as batch:
+            self.module.remove_downstream_data("/beta/objects/", self.intune_data)
+
+        self.assertEqual(
+            [(r["method"], r["url"]) for r in batch.call_args.args[0]],
+            [("DELETE", "/objects/2"), ("DELETE", "/objects/4")],
+        )
+
+
+class TestGetDiffs(unittest.TestCase):
+    """Test class for BaseUpdateModule.get_diffs."""
+
+    def setUp(self):
+        self.module = BaseUpdateModule()
+        self.module.notify = False
+        self.module.name = "Test"
+        self.intune_data = {"displayName": "a", "settings": [1, 2], "id": "1"}
+
+    def test_get_diffs_skips_deepdiff_for_equal_data(self):
+        """DeepDiff should not run when only the order or excluded keys differ."""
+
+        with patch("src.IntuneCD.intunecdlib.BaseUpdateModule.DeepDiff") as deep_diff:
+            diffs = self.module.get_diffs(
+                {"settings": [2, 1], "displayName": "a", "id": "2"},
+                self.intune_data,
+                ["root['id']"],
+            )
+
+        self.assertEqual(diffs, [])
+        deep_diff.assert_not_called()
+
+    def test_get_diffs_changed_data(self):
+        """Changes should be returned by DeepDiff."""
+
+        diffs = self.module.get_diffs(
+            {"displayName": "b", "settings": [1, 2], "id": "1"}, self.intune_data
+        )
+
+        self.assertEqual(len(diffs), 1)
+
+
+class TestProcessItems(unittest.TestCase):
+    """Test class for BaseUpdateModule.process_items."""
+
+    def setUp(self):
+        self.module = BaseUpdateModule(item_workers=4)
+        self.module.parallel_items = True
+        self.module.config_type = "Test"
+        self.intune_data = [{"id": str(i), "displayName": str(i)} for i in range(8)]
+        self.threads = set()
+        self.items = []
+
+        def update_item(filename, item):
+            self.threads.add(threading.get_ident())
+            self.items.append(item)
+            item.name = filename
+            item.match_info = {"displayName": filename}
+            _, item.downstream_id = self.module.get_match_data(
+                self.intune_data, item.match_info
+            )
+            diff_data = self.module.create_diff_data(item.name, self.module.config_type)
+            # Give the other threads a chance to overwrite the item state
+            time.sleep(0.01)
+            self.module.update_diff_data([{"setting": item.downstream_id}], item)
+            self.module.set_diff_data(diff_data, item)
+            self.module.reset_diffs_and_count(item)
+            return diff_data
+
+        self.update_item = update_item
+
+    def test_process_items_parallel(self):
+        """Items should keep their own state and be summarized in filename order."""
+
+        filenames = [str(i) for i in reversed(range(8))]
+
+        self.module.process_items(filenames, self.update_item)
+
+        self.assertGreater(len(self.threads), 1)
+        self.assertTrue(all(isinstance(item, UpdateItem) for item in self.items))
+        self.assertEqual(
+            [diff_data["name"] for diff_data in self.module.diff_summary], filenames
+        )
+        self.assertEqual(
+            [diff_data["diffs"] for diff_data in self.module.diff_summary],
+            [[{"setting": filename}] for filename in filenames],
+        )
+        self.assertEqual(self.module.get_unmatched_data(self.intune_data), [])
+
+    def test_process_items_sequential(self):
+        """Modules without parallel_items should update items one at a time."""
+
+        self.module.parallel_items = False
+
+        self.module.process_items(["0", "1", "x"], self.update_item)
+
+        self.assertEqual(self.threads, {threading.get_ident()})
+        self.assertEqual(self.items, [self.module] * 3)
+        self.assertEqual(len(self.module.diff_summary), 3)
+
+    def test_process_items_change_plan(self):
+        """Items should be updated one at a time while a change plan is recorded."""
+
+        configure_change_plan(ChangePlan())
+        self.addCleanup(configure_change_plan, None)
+
+        self.module.process_items(["0", "1"], self.update_item)
+
+        self.assertEqual(self.threads, {threading.get_ident()})
+
+    def test_module_state_is_shared_between_threads(self):
+        """State set when the module is created should be kept on other threads."""
+
+        self.module.name = ""
+        names = []
+        thread = threading.Thread(target=lambda: names.append(self.module.name))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(names, [""])
+
+
+if __name__ == "__main__":
+    unittest.main()
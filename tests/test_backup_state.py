@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the state of the incremental backup.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.IntuneCD.intunecdlib.backup_state import BackupState, configure_backup_state
+from src.IntuneCD.intunecdlib.BaseBackupModule import BaseBackupModule
+
+
+class TestBackupState(unittest.TestCase):
+    """Test class for BackupState."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        self.items = [
+            {"id": "1", "displayName": "a", "lastModifiedDateTime": "2024-01-01"},
+            {"id": "2", "displayName": "b", "lastModifiedDateTime": "2024-01-01"},
+        ]
+
+    def tearDown(self):
+        configure_backup_state(None)
+        self.directory.cleanup()
+
+    def backup(self, items, options=None):
+        state = configure_backup_state(BackupState(self.path, options))
+        module = BaseBackupModule(
+            path=self.path, filetype="json", exclude=["assignments"]
+        )
+        with patch.object(
+            BaseBackupModule, "save_to_file", wraps=module.save_to_file
+        ) as save_to_file:
+            results = module.process_data(
+                data=[dict(item) for item in items],
+                filetype="json",
+                path=f"{self.path}/",
+                name_key="displayName",
+            )
+        state.save()
+
+        return results, [c.args[3] for c in save_to_file.call_args_list]
+
+    def test_unchanged_items_are_not_written(self):
+        """Unchanged objects should keep their outputs without being written."""
+
+        self.backup(self.items)
+        self.items[1]["lastModifiedDateTime"] = "2024-02-01"
+
+        results, written = self.backup(self.items)
+
+        self.assertEqual(written, ["b"])
+        self.assertEqual(results["config_count"], 2)
+        self.assertEqual(results["outputs"], ["a", "b"])
+
+    def test_missing_file_is_written(self):
+        """An unchanged object whose file was removed should be written again."""
+
+        self.backup(self.items)
+        os.remove(os.path.join(self.path, "a.json"))
+
+        _, written = self.backup(self.items)
+
+        self.assertEqual(written, ["a"])
+
+    def test_changed_options_write_all_items(self):
+        """A backup with different options should write all objects."""
+
+        self.backup(self.items, {"output": "json"})
+
+        _, written = self.backup(self.items, {"output": "yaml"})
+
+        self.assertEqual(written, ["a", "b"])
+
+    def test_get_changed_items(self):
+        """Removed objects should be dropped and new objects reported as changed."""
+
+        self.backup(self.items)
+        items = self.items[1:] + [
+            {"id": "3", "displayName": "c", "lastModifiedDateTime": "2024-01-01"}
+        ]
+        self.backup(items)
+        configure_backup_state(BackupState(self.path))
+        module = BaseBackupModule(
+            path=f"{self.path}/", filetype="json", exclude=["assignments"]
+        )
+
+        self.assertEqual(module.get_changed_items(self.items), [self.items[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests writing and applying change plans.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.IntuneCD.intunecdlib.apply_change_plan import ApplyChangePlan
+from src.IntuneCD.intunecdlib.BaseUpdateModule import BaseUpdateModule
+from src.IntuneCD.intunecdlib.change_plan import ChangePlan, configure_change_plan
+
+ENDPOINT = "https://graph.microsoft.com/beta/deviceManagement/objects/"
+
+
+class TestChangePlan(unittest.TestCase):
+    """Test class for recording a change plan in report mode."""
+
+    def setUp(self):
+        self.plan = configure_change_plan(ChangePlan())
+        self.module = BaseUpdateModule(report=True, exclude=[])
+        self.module.config_type = "Test"
+        self.module.name = "Config"
+
+    def tearDown(self):
+        configure_change_plan(None)
+
+    def test_record_writes(self):
+        """Writes should be recorded, a created object should get a placeholder id."""
+
+        created = self.module.make_graph_request(
+            ENDPOINT, method="POST", status_code=201, data=json.dumps({"a": 1})
+        )
+        self.module.make_graph_request(
+            ENDPOINT + created["id"] + "/assign",
+            method="POST",
+            data=json.dumps({"assignments": []}),
+        )
+
+        self.assertEqual(created, {"a": 1, "id": "$plan:1"})
+        self.assertEqual(
+            [(op["method"], op["endpoint"]) for op in self.plan.operations],
+            [("POST", ENDPOINT), ("POST", ENDPOINT + "$plan:1/assign")],
+        )
+        self.assertEqual(self.plan.operations[0]["data"], {"a": 1})
+        self.assertEqual(self.plan.operations[0]["status_code"], 201)
+
+    def test_record_object_version(self):
+        """Updates should record the version of the object they change."""
+
+        self.module.match_info = {"displayName": "Config"}
+        downstream = [
+            {
+                "id": "1",
+                "displayName": "Config",
+                "lastModifiedDateTime": "2024-01-01T00:00:00Z",
+                "value": 1,
+            }
+        ]
+
+        self.module.process_update(
+            downstream,
+            {"displayName": "Config", "value": 2},
+            "patch",
+            200,
+            "/beta/deviceManagement/objects/",
+        )
+
+        self.assertEqual(
+            self.plan.operations[0]["object"],
+            {
+                "endpoint": ENDPOINT + "1",
+                "name": "Config",
+                "lastModifiedDateTime": "2024-01-01T00:00:00Z",
+            },
+        )
+
+    def test_record_read_object_version(self):
+        """Writes outside process_update should record the version of the object read."""
+
+        self.module.plan_object = {"endpoint": ENDPOINT + "9", "version": 1}
+        with patch.object(
+            self.module,
+            "iter_graph_pages",
+            return_value=iter(
+                [{"value": [{"id": "1", "displayName": "Intent", "version": 3}]}]
+            ),
+        ):
+            self.module.get_downstream_data("/beta/deviceManagement/objects")
+        self.module.make_graph_request(
+            ENDPOINT + "1/updateSettings", method="POST", data=json.dumps({})
+        )
+
+        self.assertEqual(
+            self.plan.operations[0]["object"],
+            {"endpoint": ENDPOINT + "1", "name": "Intent", "version": 3},
+        )
+
+    def test_save_and_load(self):
+        """A saved plan should load with the same operations."""
+
+        self.module.make_graph_request(ENDPOINT + "1", method="DELETE")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.plan")
+            self.plan.save(path)
+            loaded = ChangePlan.load(path)
+
+        self.assertEqual(loaded.operations, self.plan.operations)
+        self.assertEqual(loaded.created, self.plan.created)
+
+
+class TestApplyChangePlan(unittest.TestCase):
+    """Test class for ApplyChangePlan."""
+
+    def setUp(self):
+        self.module = ApplyChangePlan({"access_token": "token"})
+        patch("src.IntuneCD.intunecdlib.write_batcher.get_governor").start()
+        self.plan = ChangePlan(
+            [
+                {
+                    "id": 1,
+                    "type": "Test",
+                    "name": "New",
+                    "method": "POST",
+                    "endpoint": ENDPOINT,
+                    "params": None,
+                    "data": {"displayName": "New"},
+                    "status_code": 201,
+                    "object": None,
+                },
+                {
+                    "id": 2,
+                    "type": "Test",
+                    "name": "New",
+                    "method": "POST",
+                    "endpoint": ENDPOINT + "$plan:1/assign",
+                    "params": None,
+                    "data": {"assignments": []},
+                    "status_code": 200,
+                    "object": None,
+                },
+                {
+                    "id": 3,
+                    "type": "Test",
+                    "name": "Changed",
+                    "method": "PATCH",
+                    "endpoint": ENDPOINT + "2",
+                    "params": None,
+                    "data": {"value": 2},
+                    "status_code": 200,
+                    "object": {
+                        "endpoint": ENDPOINT + "2",
+                        "name": "Changed",
+                        "version": 1,
+                    },
+                },
+                {
+                    "id": 4,
+                    "type": "Test",
+                    "name": "Unchanged",
+                    "method": "DELETE",
+                    "endpoint": ENDPOINT + "3",
+                    "params": None,
+                    "data": None,
+                    "status_code": 200,
+                    "object": {
+                        "endpoint": ENDPOINT + "3",
+                        "name": "Unchanged",
+                        "version": 1,
+                    },
+                },
+            ]
+        )
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_apply(self):
+        """Operations should be applied with the created ids, changed objects skipped."""
+
+        versions = {
+            "deviceManagement/objects/2": {"version": 2},
+            "deviceManagement/objects/3": {"version": 1},
+        }
+        with patch.object(
+            self.module, "batch_request_by_key", return_value=versions
+        ), patch.object(
+            self.module, "make_graph_request", return_value={"id": "new-id"}
+        ) as make_graph_request, patch.object(
+            self.module,
+            "process_batch",
+            side_effect=lambda batch: [
+                {"id": req["id"], "status": 204, "headers": {}} for req in batch
+            ],
+        ) as process_batch:
+            counts = self.module.apply(self.plan)
+
+        self.assertEqual(counts, {"applied": 3, "failed": 0, "skipped": 1})
+        make_graph_request.assert_called_once()
+        self.assertEqual(make_graph_request.call_args.kwargs["method"], "POST")
+        self.assertEqual(
+            [(req["method"], req["url"]) for req in process_batch.call_args.args[0]],
+            [
+                ("POST", "/deviceManagement/objects/new-id/assign"),
+                ("DELETE", "/deviceManagement/objects/3"),
+            ],
+        )
+
+    def test_apply_failed_create(self):
+        """Operations using the id of a failed create should fail."""
+
+        self.plan.operations = self.plan.operations[:2]
+        with patch.object(
+            self.module, "make_graph_request", side_effect=Exception("failed")
+        ), patch.object(self.module, "process_batch") as process_batch:
+            counts = self.module.apply(self.plan)
+
+        self.assertEqual(counts, {"applied": 0, "failed": 2, "skipped": 0})
+        process_batch.assert_not_called()
+
+    def test_apply_keeps_plan_order(self):
+        """Queued operations should be sent before an operation run on its own."""
+
+        calls = []
+        self.plan.operations = [
+            {
+                "id": 1,
+                "type": "Test",
+                "name": "Changed",
+                "method": "PATCH",
+                "endpoint": ENDPOINT + "2",
+                "params": None,
+                "data": {"value": 2},
+                "status_code": 200,
+                "object": {"endpoint": ENDPOINT + "2", "name": "Changed"},
+            },
+            {
+                "id": 2,
+                "type": "Test",
+                "name": "Changed",
+                "method": "POST",
+                "endpoint": ENDPOINT + "2/assign",
+                "params": None,
+                "data": {"assignments": []},
+                "status_code": 200,
+                "object": {"endpoint": ENDPOINT + "2", "name": "Changed"},
+            },
+        ] + self.plan.operations[:2]
+        self.plan.operations[2]["id"] = 3
+        self.plan.operations[3]["id"] = 4
+        self.plan.operations[3]["endpoint"] = ENDPOINT + "$plan:3/assign"
+        self.plan.operations[3]["params"] = {"$filter": "id eq '$plan:3'"}
+
+        def process_batch(batch):
+            calls.append([(req["url"], req.get("dependsOn")) for req in batch])
+            return [{"id": req["id"], "status": 204, "headers": {}} for req in batch]
+
+        def make_graph_request(endpoint, params, method, status_code, data):
+            calls.append((method, endpoint, params))
+            return {"id": "new-id"}
+
+        with patch.object(
+            self.module, "process_batch", side_effect=process_batch
+        ), patch.object(
+            self.module, "make_graph_request", side_effect=make_graph_request
+        ):
+            counts = self.module.apply(self.plan)
+
+        self.assertEqual(counts, {"applied": 4, "failed": 0, "skipped": 0})
+        self.assertEqual(
+            calls,
+            [
+                [
+                    ("/deviceManagement/objects/2", None),
+                    ("/deviceManagement/objects/2/assign", ["1"]),
+                ],
+                ("POST", ENDPOINT, None),
+                ("POST", ENDPOINT + "new-id/assign", {"$filter": "id eq 'new-id'"}),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the native diff engine.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from deepdiff import DeepDiff
+
+from src.IntuneCD.intunecdlib import diff_engine
+from src.IntuneCD.intunecdlib.BaseUpdateModule import BaseUpdateModule
+from src.IntuneCD.intunecdlib.diff_engine import DiffPath, native_diff
+
+
+def _setting(definition: str, value) -> dict:
+    return {
+        "id": definition,
+        "settingInstance": {
+            "@odata.type": "#microsoft.graph.deviceManagementConfigurationChoiceSettingInstance",
+            "settingDefinitionId": definition,
+            "choiceSettingValue": {"value": value, "children": []},
+        },
+    }
+
+
+def _records(diffs: list) -> list:
+    return sorted(
+        str({key: value for key, value in diff.items() if key != "change_date"})
+        for diff in diffs
+    )
+
+
+class TestNativeDiff(unittest.TestCase):
+    """Test class for native_diff."""
+
+    def setUp(self):
+        self.intune = {
+            "name": "Policy",
+            "description": "",
+            "settings": [_setting(f"setting_{i}", f"value_{i}") for i in range(20)],
+        }
+        self.repo = {
+            "name": "Policy",
+            "description": "",
+            "settings": list(reversed(self.intune["settings"])),
+        }
+
+    def assert_same_changes(self, old, new, exclude_paths=None):
+        """The native diff should report the same changes as DeepDiff."""
+        native = native_diff(old, new, exclude_paths)
+        deep = DeepDiff(old, new, ignore_order=True, exclude_paths=exclude_paths)
+        self.assertEqual(
+            {key: sorted(native[key]) for key in native},
+            {key: sorted(deep[key]) for key in deep},
+        )
+        for key in ("values_changed", "type_changes", "iterable_item_added"):
+            for path in native.get(key, {}):
+                self.assertEqual(native[key][path], deep[key][path])
+
+        module = BaseUpdateModule()
+        module.name = "Test"
+        module.config_type = "Test"
+        with patch.object(module, "log"):
+            self.assertEqual(
+                _records(module._process_diffs(native)),
+                _records(module._process_diffs(deep)),
+            )
+        return native
+
+    def test_equal(self):
+        """Lists in a different order should not be reported."""
+
+        self.assertEqual(self.assert_same_changes(self.intune, self.repo), {})
+
+    def test_values_changed(self):
+        """A changed setting value should be reported at the path of the value."""
+
+        self.repo["settings"][0] = _setting("setting_19", "changed")
+        self.repo["description"] = "changed"
+
+        diff = self.assert_same_changes(self.intune, self.repo)
+
+        self.assertEqual(
+            diff["values_changed"]["root['description']"],
+            {"new_value": "changed", "old_value": ""},
+        )
+
+    def test_iterable_items(self):
+        """Added and removed list items should be reported."""
+
+        self.repo["settings"].append(_setting("new", "value"))
+        diff = self.assert_same_changes(self.intune, self.repo)
+        self.assertEqual(list(diff), ["iterable_item_added"])
+
+        self.repo["settings"] = self.repo["settings"][2:]
+        diff = self.assert_same_changes(self.intune, self.repo)
+        self.assertEqual(len(diff["iterable_item_removed"]), 1)
+
+    def test_paired_items(self):
+        """A changed list item should be paired with the item it replaces."""
+
+        self.repo["settings"][5] = {"id": "setting_14", "settingInstance": {}}
+
+        self.assert_same_changes(self.intune, self.repo)
+
+    def test_items_changed_at_the_same_index(self):
+        """An item removed and an item added at the same index should be a changed value."""
+
+        self.intune["settings"] = [2, {"b": None, "c": 1}, True, "x", "y"]
+        self.repo["settings"] = ["value", {"a": 1}, 1.5, "x", "y"]
+
+        diff = self.assert_same_changes(self.intune, self.repo)
+
+        self.assertEqual(
+            diff["values_changed"]["root['settings'][1]"],
+            {"new_value": {"a": 1}, "old_value": {"b": None, "c": 1}},
+        )
+
+    def test_paired_numbers(self):
+        """Numbers should be paired with the closest number."""
+
+        self.intune["settings"] = [2, True, "x", "y"]
+        self.repo["settings"] = [1.5, "x", "y"]
+
+        diff = self.assert_same_changes(self.intune, self.repo)
+
+        self.assertEqual(diff["type_changes"]["root['settings'][0]"]["new_value"], 1.5)
+        self.assertEqual(diff["iterable_item_removed"]["root['settings'][1]"], True)
+
+    def test_type_and_dictionary_changes(self):
+        """Type changes and added or removed keys should be reported."""
+
+        self.repo["description"] = None
+        self.repo["extra"] = 1
+        del self.repo["name"]
+
+        self.assert_same_changes(self.intune, self.repo)
+
+    def test_exclude_paths(self):
+        """Excluded paths should not be reported."""
+
+        self.repo["description"] = "changed"
+
+        self.assertEqual(
+            self.assert_same_changes(self.intune, self.repo, ["root['description']"]),
+            {},
+        )
+
+    def test_structured_paths(self):
+        """Paths should keep their parts."""
+
+        path = DiffPath(("settings", 0, "id"))
+
+        self.assertEqual(path, "root['settings'][0]['id']")
+        self.assertEqual(path.parts, ("settings", 0, "id"))
+
+
+class TestNativeDiffEngine(unittest.TestCase):
+    """Test class for selecting the native diff engine in BaseUpdateModule."""
+
+    def setUp(self):
+        diff_engine.configure_diff_engine("native")
+        self.module = BaseUpdateModule()
+        self.module.name = "Test"
+        self.module.config_type = "Test"
+
+    def tearDown(self):
+        diff_engine.configure_diff_engine()
+
+    def test_get_diffs(self):
+        """The native diff should produce the same diff summary as DeepDiff."""
+
+        intune = {"a": "1", "b": ["x", "y"], "c": {"d": 1}}
+        repo = {"a": "2", "b": ["y", "z"], "c": {"d": "1"}}
+
+        with patch("src.IntuneCD.intunecdlib.BaseUpdateModule.DeepDiff") as deep_diff:
+            native = self.module.get_diffs(repo, intune)
+        deep_diff.assert_not_called()
+
+        diff_engine.configure_diff_engine("deepdiff")
+        deep = self.module.get_diffs(repo, intune)
+
+        def strip(diffs):
+            return sorted(
+                (d["setting"], str(d["new_val"]), str(d["old_val"])) for d in diffs
+            )
+
+        self.assertEqual(strip(native), strip(deep))
+
+    def test_unknown_engine(self):
+        """An unknown engine should raise a ValueError."""
+
+        with self.assertRaises(ValueError):
+            diff_engine.configure_diff_engine("other")
+
+
+if __name__ == "__main__":
+    unittest.main()
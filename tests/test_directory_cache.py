@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the directory cache shared by the modules of a run.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.IntuneCD.intunecdlib.directory_cache import (
+    DirectoryCache,
+    get_directory_cache,
+    reset_directory_cache,
+)
+
+
+class TestDirectoryCache(unittest.TestCase):
+    """Test class for the DirectoryCache."""
+
+    def setUp(self):
+        self.cache = DirectoryCache()
+        self.module = MagicMock()
+        self.module.batch_request.side_effect = lambda ids, url, extra_url: [
+            {"id": g_id, "displayName": f"Group {g_id}"} for g_id in ids if g_id != "x"
+        ]
+
+    def test_get_groups_requests_missing_groups_once(self):
+        """Only groups that are not in the cache should be requested."""
+
+        self.cache.get_groups(self.module, ["a", "b", "a"])
+        groups = self.cache.get_groups(self.module, ["b", "c", "x"])
+
+        self.assertEqual(list(groups), ["b", "c"])
+        self.assertEqual(
+            [c.args[0] for c in self.module.batch_request.call_args_list],
+            [["a", "b"], ["c", "x"]],
+        )
+
+    def test_get_groups_caches_missing_groups(self):
+        """Groups that do not exist should not be requested again."""
+
+        self.cache.get_groups(self.module, ["x"])
+        self.cache.get_groups(self.module, ["x"])
+
+        self.module.batch_request.assert_called_once()
+
+    def test_get_groups_single_flight(self):
+        """Concurrent lookups of the same group should make a single request."""
+
+        def slow_batch(ids, url, extra_url):
+            time.sleep(0.1)
+            return [{"id": g_id, "displayName": g_id} for g_id in ids]
+
+        self.module.batch_request.side_effect = slow_batch
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.cache.get_groups(self.module, ["a"]))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.module.batch_request.assert_called_once()
+        self.assertEqual(results, [{"a": {"id": "a", "displayName": "a"}}] * 5)
+
+    def test_get_group_by_name(self):
+        """Group names should be resolved once, including names that do not exist."""
+
+        self.module.make_graph_request.side_effect = [
+            {"value": [{"id": "1", "displayName": "Group's"}]},
+            {"value": []},
+        ]
+
+        group = self.cache.get_group_by_name(self.module, "Group's")
+
+        self.assertEqual(group["id"], "1")
+        self.assertIsNone(self.cache.get_group_by_name(self.module, "Missing"))
+        self.assertIsNone(self.cache.get_group_by_name(self.module, "Missing"))
+        self.assertEqual(self.module.make_graph_request.call_count, 2)
+        self.assertEqual(
+            self.module.make_graph_request.call_args_list[0].kwargs["params"],
+            {"$filter": "displayName eq 'Group''s'"},
+        )
+
+    def test_get_groups_by_name(self):
+        """Group names should be resolved in bulk with in (...) filters."""
+
+        names = [f"Group {i}" for i in range(20)] + ["Missing"]
+        self.module.batch_request.side_effect = lambda filters, url, extra_url: [
+            {"value": [{"id": str(i), "displayName": f"group {i}"}]} for i in range(20)
+        ]
+
+        groups = self.cache.get_groups_by_name(self.module, names)
+        self.cache.get_group_by_name(self.module, "Missing")
+
+        filters = self.module.batch_request.call_args.args[0]
+        self.assertEqual(len(filters), 2)
+        self.assertIn("displayName%20in%20%28%27Group%200%27", filters[0])
+        self.assertEqual(groups["Group 19"]["id"], "19")
+        self.assertNotIn("Missing", groups)
+        self.module.batch_request.assert_called_once()
+        self.module.make_graph_request.assert_not_called()
+
+    def test_add_group(self):
+        """Created groups should be found by name without a request."""
+
+        self.cache.add_group({"id": "1", "displayName": "New"})
+
+        group = self.cache.get_group_by_name(self.module, "New")
+
+        self.assertEqual(group["id"], "1")
+        self.module.make_graph_request.assert_not_called()
+
+    def test_create_group_once(self):
+        """A group missed by several concurrent callers should be created once."""
+
+        self.module.make_graph_request.return_value = {"value": []}
+        self.assertIsNone(self.cache.get_group_by_name(self.module, "New"))
+
+        def create():
+            time.sleep(0.1)
+            return {"id": "1", "displayName": "New"}
+
+        create_group = MagicMock(side_effect=create)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.cache.create_group("New", create_group)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        create_group.assert_called_once()
+        self.assertEqual(results, [{"id": "1", "displayName": "New"}] * 5)
+        self.assertEqual(self.cache.get_group_by_name(self.module, "New")["id"], "1")
+
+    def test_filters(self):
+        """Filters should be requested once and indexed by ID and name."""
+
+        self.module.make_graph_request.return_value = {
+            "value": [{"id": "1", "displayName": "Filter"}]
+        }
+
+        filters_by_id = self.cache.get_filters_by_id(self.module)
+        filters_by_name = self.cache.get_filters_by_name(self.module)
+
+        self.assertEqual(filters_by_id, {"1": {"id": "1", "displayName": "Filter"}})
+        self.assertEqual(filters_by_name["Filter"]["id"], "1")
+        self.module.make_graph_request.assert_called_once()
+
+        self.cache.invalidate_filters()
+        self.cache.get_filters_by_name(self.module)
+        self.assertEqual(self.module.make_graph_request.call_count, 2)
+
+    def test_failed_request_is_not_cached(self):
+        """A failed request should be retried on the next lookup."""
+
+        self.module.make_graph_request.side_effect = [
+            Exception("Test exception"),
+            {"value": [{"id": "tag"}]},
+        ]
+
+        with self.assertRaises(Exception):
+            self.cache.get_scope_tags(self.module)
+
+        self.assertEqual(self.cache.get_scope_tags(self.module), [{"id": "tag"}])
+
+    def test_get_notification_templates(self):
+        """Notification templates should be requested once in a batch."""
+
+        self.module.batch_request_by_key.side_effect = lambda ids, url, extra_url: {
+            t_id: {"id": t_id, "displayName": f"Template {t_id}"}
+            for t_id in ids
+            if t_id != "x"
+        }
+
+        self.cache.get_notification_templates(self.module, ["a", "x"])
+        templates = self.cache.get_notification_templates(self.module, ["a", "x"])
+
+        self.assertEqual(list(templates), ["a"])
+        self.module.batch_request_by_key.assert_called_once_with(
+            ["a", "x"], "deviceManagement/notificationMessageTemplates/", ""
+        )
+
+    def test_get_by_name_lookups(self):
+        """Templates and reusable settings should be requested once until invalidated."""
+
+        self.module.make_graph_request.side_effect = lambda endpoint, **kwargs: {
+            "value": [{"id": endpoint[-1], "displayName": "Name"}]
+        }
+
+        for _ in range(2):
+            templates = self.cache.get_notification_templates_by_name(self.module)
+            settings = self.cache.get_reusable_settings_by_name(self.module)
+
+        self.assertEqual(templates["Name"]["id"], "s")
+        self.assertEqual(settings["Name"]["id"], "s")
+        self.assertEqual(self.module.make_graph_request.call_count, 2)
+
+        self.cache.invalidate_notification_templates()
+        self.cache.invalidate_reusable_settings()
+        self.cache.get_notification_templates_by_name(self.module)
+        self.cache.get_reusable_settings_by_name(self.module)
+        self.assertEqual(self.module.make_graph_request.call_count, 4)
+
+    def test_reset_directory_cache(self):
+        """A reset should start a new cache for the next run."""
+
+        cache = get_directory_cache()
+
+        self.assertIsNot(reset_directory_cache(), cache)
+        self.assertIs(get_directory_cache(), get_directory_cache())
+
+
+if __name__ == "__main__":
+    unittest.main()
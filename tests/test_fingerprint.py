@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the configuration fingerprints.
+"""
+
+import unittest
+
+from deepdiff import DeepDiff
+
+from src.IntuneCD.intunecdlib.fingerprint import fingerprint
+
+
+class TestFingerprint(unittest.TestCase):
+    """Test class for fingerprint."""
+
+    def setUp(self):
+        self.data = {
+            "displayName": "Policy",
+            "settings": [{"id": "1", "value": [1, 2]}, {"id": "2", "value": None}],
+            "assignments": [{"target": {"groupName": "Group"}}],
+        }
+
+    def assert_matches_deepdiff(self, a, b, exclude_paths=None):
+        """Equal fingerprints should only be returned when DeepDiff finds no changes."""
+        equal = fingerprint(a, exclude_paths) == fingerprint(b, exclude_paths)
+        diff = DeepDiff(a, b, ignore_order=True, exclude_paths=exclude_paths)
+        self.assertEqual(equal, not diff)
+
+    def test_order_insensitive(self):
+        """Key and list order should not change the fingerprint."""
+
+        reordered = {
+            "assignments": [{"target": {"groupName": "Group"}}],
+            "settings": [{"value": None, "id": "2"}, {"id": "1", "value": [2, 1]}],
+            "displayName": "Policy",
+        }
+
+        self.assert_matches_deepdiff(self.data, reordered)
+        self.assertEqual(fingerprint(self.data), fingerprint(reordered))
+
+    def test_changes(self):
+        """Changed values and types should change the fingerprint."""
+
+        for change in [
+            {"displayName": "Other"},
+            {"settings": [{"id": "1", "value": [1, 2]}]},
+            {"settings": [{"id": "1", "value": [1, 2.0]}, {"id": "2", "value": None}]},
+            {"settings": [{"id": "1", "value": [1, "2"]}, {"id": "2", "value": None}]},
+            {"settings": [{"id": "1", "value": [1, 2]}, {"id": "2", "value": False}]},
+            {"extra": None},
+        ]:
+            with self.subTest(change=change):
+                self.assert_matches_deepdiff(self.data, {**self.data, **change})
+
+    def test_exclude_paths(self):
+        """Excluded keys should not change the fingerprint."""
+
+        changed = {**self.data, "assignments": [], "displayName": "Other"}
+        exclude_paths = ["root['assignments']", "root['displayName']"]
+
+        self.assert_matches_deepdiff(self.data, changed, exclude_paths)
+        self.assertEqual(
+            fingerprint(self.data, exclude_paths), fingerprint(changed, exclude_paths)
+        )
+
+    def test_nested_exclude_path(self):
+        """Nested dict keys should be excluded."""
+
+        a = {"conditions": {"users": ["a"], "apps": ["b"]}}
+        b = {"conditions": {"users": ["c"], "apps": ["b"]}}
+
+        self.assert_matches_deepdiff(a, b, "root['conditions']['users']")
+        self.assert_matches_deepdiff(a, {"conditions": {"users": ["a"], "apps": []}})
+
+    def test_unsupported(self):
+        """No fingerprint should be returned for list index paths or unknown types."""
+
+        self.assertIsNone(fingerprint(self.data, ["root['settings'][0]['id']"]))
+        self.assertIsNone(fingerprint({"value": object()}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the shared Graph session.
+"""
+
+import unittest
+
+from src.IntuneCD.intunecdlib import graph_session
+
+
+class TestGraphSession(unittest.TestCase):
+    """Test class for the shared Graph session."""
+
+    def tearDown(self):
+        graph_session.close_session()
+
+    def test_get_session_is_shared(self):
+        """The same session should be returned on every call."""
+
+        self.assertIs(graph_session.get_session(), graph_session.get_session())
+
+    def test_configure_session_pool_size(self):
+        """The pool size should be tied to the number of workers."""
+
+        session = graph_session.configure_session(20)
+        adapter = session.get_adapter("https://graph.microsoft.com")
+
+        self.assertEqual(adapter._pool_maxsize, 40)
+        self.assertIs(session, graph_session.get_session())
+
+    def test_configure_session_minimum_pool_size(self):
+        """The pool size should never be lower than the default."""
+
+        session = graph_session.configure_session(1)
+        adapter = session.get_adapter("https://graph.microsoft.com")
+
+        self.assertEqual(adapter._pool_maxsize, graph_session.DEFAULT_POOL_SIZE)
+
+    def test_session_accepts_compressed_responses(self):
+        """The session should ask for gzip and deflate encoded responses."""
+
+        session = graph_session.get_session()
+
+        self.assertEqual(session.headers["Accept-Encoding"], "gzip, deflate")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the module scheduler.
+"""
+
+import threading
+import time
+import unittest
+
+from src.IntuneCD.intunecdlib.module_scheduler import (
+    ModuleScheduler,
+    check_dependencies,
+    get_critical_path,
+)
+from src.IntuneCD.update_intune import get_update_dependencies
+
+
+class TestModuleScheduler(unittest.TestCase):
+    """Test class for ModuleScheduler."""
+
+    def setUp(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def module(self, name, duration=0.01, error=None):
+        def run():
+            with self.lock:
+                self.events.append(("start", name))
+            time.sleep(duration)
+            with self.lock:
+                self.events.append(("end", name))
+            if error:
+                raise error
+            return [name]
+
+        return run
+
+    def test_dependencies_finish_first(self):
+        """A module should only start after its prerequisites have finished."""
+
+        scheduler = ModuleScheduler(max_workers=4)
+        scheduler.add("Policies", self.module("Policies"), ["ScopeTags", "Filters"])
+        scheduler.add("Filters", self.module("Filters"), ["ScopeTags"])
+        scheduler.add("ScopeTags", self.module("ScopeTags"))
+
+        results = scheduler.run()
+
+        self.assertEqual(
+            [name for name, _ in results], ["ScopeTags", "Filters", "Policies"]
+        )
+        self.assertLess(
+            self.events.index(("end", "Filters")),
+            self.events.index(("start", "Policies")),
+        )
+        self.assertEqual(scheduler.report().split(",")[0].count("->"), 2)
+
+    def test_independent_modules_run_concurrently(self):
+        """Modules without a dependency between them should overlap."""
+
+        scheduler = ModuleScheduler(max_workers=4)
+        scheduler.add("A", self.module("A", 0.05))
+        scheduler.add("B", self.module("B", 0.05))
+
+        scheduler.run()
+
+        self.assertEqual(
+            [kind for kind, _ in self.events], ["start", "start", "end", "end"]
+        )
+
+    def test_failed_prerequisite(self):
+        """A failed prerequisite should be returned and its dependents still run."""
+
+        scheduler = ModuleScheduler()
+        scheduler.add("A", self.module("A", error=Exception("failed")))
+        scheduler.add("B", self.module("B"), ["A", "Excluded"])
+
+        results = dict(scheduler.run())
+
+        self.assertIsInstance(results["A"], Exception)
+        self.assertEqual(results["B"], ["B"])
+
+    def test_cycle(self):
+        """Dependencies that form a cycle should raise a ValueError."""
+
+        with self.assertRaises(ValueError):
+            check_dependencies(["A", "B"], {"A": ["B"], "B": ["A"]})
+
+    def test_critical_path(self):
+        """The critical path should follow the prerequisite that finished last."""
+
+        timings = {"A": (0, 1), "B": (0, 3), "C": (3, 4), "D": (0, 2)}
+        prerequisites = {"C": ["A", "B"], "A": [], "B": [], "D": []}
+
+        self.assertEqual(get_critical_path(timings, prerequisites), ["B", "C"])
+
+    def test_update_dependencies(self):
+        """Scope tags and filters should run before the other update modules."""
+
+        self.assertEqual(get_update_dependencies("ScopeTags"), [])
+        self.assertEqual(get_update_dependencies("Filters"), ["ScopeTags"])
+        self.assertIn("NotificationTemplate", get_update_dependencies("Compliance"))
+        self.assertIn("Filters", get_update_dependencies("ConfigurationPolicies"))
+
+
+if __name__ == "__main__":
+    unittest.main()
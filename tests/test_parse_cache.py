@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the parse cache.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.IntuneCD.intunecdlib.parse_cache import ParseCache, get_default_cache_dir
+
+
+class TestParseCache(unittest.TestCase):
+    """Test class for ParseCache."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.directory.name, "cache")
+        self.path = os.path.join(self.directory.name, "config.yaml")
+        self.write("displayName: test\nsettings:\n  - a\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_load(self):
+        """The file should be parsed once and every load should return a copy."""
+
+        cache = ParseCache(self.cache_dir)
+        with patch(
+            "src.IntuneCD.intunecdlib.parse_cache.parse_file",
+            wraps=lambda path: {"displayName": "test", "settings": ["a"]},
+        ) as parse_file:
+            data = cache.load(self.path)
+            data["settings"].append("b")
+            second = cache.load(self.path)
+
+        self.assertEqual(second, {"displayName": "test", "settings": ["a"]})
+        parse_file.assert_called_once()
+
+    def test_load_from_disk(self):
+        """A new cache should load the stored entry without parsing the file."""
+
+        ParseCache(self.cache_dir).load(self.path)
+        with patch("src.IntuneCD.intunecdlib.parse_cache.parse_file") as parse_file:
+            data = ParseCache(self.cache_dir).load(self.path)
+
+        self.assertEqual(data, {"displayName": "test", "settings": ["a"]})
+        parse_file.assert_not_called()
+
+    def test_changed_file_is_parsed(self):
+        """A file whose size or modification time changed should be parsed again."""
+
+        cache = ParseCache(self.cache_dir)
+        cache.load(self.path)
+        self.write("displayName: changed\n")
+        os.utime(self.path, ns=(0, 1))
+
+        self.assertEqual(
+            ParseCache(self.cache_dir).load(self.path), {"displayName": "changed"}
+        )
+
+    def test_memory_only(self):
+        """Without a directory the cache should not write entries."""
+
+        cache = ParseCache()
+
+        self.assertEqual(cache.load(self.path)["displayName"], "test")
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_entries_are_private(self):
+        """Stored entries should only be readable by the owner."""
+
+        ParseCache(self.cache_dir).load(self.path)
+
+        for name in os.listdir(self.cache_dir):
+            mode = os.stat(os.path.join(self.cache_dir, name)).st_mode
+            self.assertEqual(mode & 0o777, 0o600)
+
+    def test_default_cache_dir(self):
+        """Entries should only be stored on disk when INTUNECD_CACHE_DIR is set."""
+
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(get_default_cache_dir())
+        with patch.dict(os.environ, {"INTUNECD_CACHE_DIR": self.cache_dir}):
+            self.assertEqual(
+                get_default_cache_dir(), os.path.join(self.cache_dir, "parse")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
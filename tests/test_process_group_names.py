@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests resolving the group names of the repository assignments.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import urllib.parse
+from unittest.mock import patch
+
+from src.IntuneCD.intunecdlib.directory_cache import reset_directory_cache
+from src.IntuneCD.intunecdlib.process_group_names import ProcessGroupNames
+
+
+class TestProcessGroupNames(unittest.TestCase):
+    """Test class for ProcessGroupNames."""
+
+    def setUp(self):
+        reset_directory_cache()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        self.process_group_names = ProcessGroupNames({"access_token": "token"})
+
+        def assignment(name):
+            return {"target": {"groupName": name, "groupType": "StaticMembership"}}
+
+        os.makedirs(os.path.join(self.path, "Profiles"))
+        os.makedirs(os.path.join(self.path, "Intents", "Template"))
+        with open(
+            os.path.join(self.path, "Profiles", "a.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump({"assignments": [assignment("A"), assignment("B")]}, f)
+        with open(
+            os.path.join(self.path, "Intents", "Template", "b.yaml"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            f.write(
+                "assignments:\n"
+                "- target:\n    groupName: B\n"
+                "- target:\n    groupName: C\n"
+            )
+        with open(
+            os.path.join(self.path, "Profiles", "c.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump({"assignments": []}, f)
+        os.makedirs(os.path.join(self.path, "__archive__", "Profiles"))
+        with open(
+            os.path.join(self.path, "__archive__", "Profiles", "d.json"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            json.dump({"assignments": [assignment("D")]}, f)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_group_names(self):
+        """All distinct group names of the repository should be returned."""
+
+        names = self.process_group_names.get_group_names(self.path)
+
+        self.assertEqual(sorted(names), ["A", "B", "C"])
+
+    def test_resolve_group_names(self):
+        """The group names should be resolved with a single batch request."""
+
+        with patch.object(
+            self.process_group_names,
+            "batch_request",
+            return_value=[
+                {
+                    "value": [
+                        {"id": "1", "displayName": "A"},
+                        {"id": "2", "displayName": "B"},
+                    ]
+                }
+            ],
+        ) as batch_request:
+            groups = self.process_group_names.resolve_group_names(self.path)
+
+        batch_request.assert_called_once()
+        self.assertEqual(
+            {name: group["id"] for name, group in groups.items()}, {"A": "1", "B": "2"}
+        )
+
+    def test_resolve_group_names_batch(self):
+        """The group names should be resolved through a real $batch request."""
+
+        requests = []
+
+        def graph_request(endpoint, params, method, status_code, data):
+            batch = json.loads(data)["requests"]
+            requests.append((method, endpoint, batch))
+            return {
+                "responses": [
+                    {
+                        "id": request["id"],
+                        "status": 200,
+                        "headers": {},
+                        "body": {
+                            "value": [
+                                {"id": name, "displayName": name}
+                                for name in ("A", "B", "C")
+                                if f"'{name}'" in urllib.parse.unquote(request["url"])
+                            ]
+                        },
+                    }
+                    for request in batch
+                ]
+            }
+
+        with patch.object(
+            self.process_group_names, "_graph_request", side_effect=graph_request
+        ):
+            groups = self.process_group_names.resolve_group_names(self.path)
+
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0][0], "POST")
+        self.assertTrue(requests[0][1].endswith("/$batch"))
+        self.assertEqual(sorted(groups), ["A", "B", "C"])
+
+
+if __name__ == "__main__":
+    unittest.main()
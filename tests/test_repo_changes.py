@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests updating only the changed files of the repository.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+
+from src.IntuneCD.intunecdlib.BaseUpdateModule import BaseUpdateModule
+from src.IntuneCD.intunecdlib.repo_changes import RepoChanges
+
+
+def git(path, *args):
+    subprocess.run(
+        ["git", "-C", path, "-c", "user.name=test", "-c", "user.email=test@test"]
+        + list(args),
+        check=True,
+        capture_output=True,
+    )
+
+
+class TestRepoChanges(unittest.TestCase):
+    """Test class for RepoChanges."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.repo = self.directory.name
+        self.path = os.path.join(self.repo, "prod")
+        self.filters = os.path.join(self.path, "Filters")
+        self.scripts = os.path.join(self.path, "Scripts")
+        for name in ["a", "b", "c"]:
+            path = os.path.join(self.filters, f"{name}.json")
+            self.write(path, {"displayName": name})
+        self.write(os.path.join(self.scripts, "script.json"), {"displayName": "s"})
+        self.write(os.path.join(self.repo, "other", "d.json"), {"displayName": "d"})
+        git(self.repo, "init", "-q")
+        git(self.repo, "add", ".")
+        git(self.repo, "commit", "-q", "-m", "initial")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def test_from_git(self):
+        """Changed, untracked and deleted files below the path should be found."""
+
+        self.write(os.path.join(self.filters, "a.json"), {"displayName": "a2"})
+        self.write(os.path.join(self.filters, "e.json"), {"displayName": "e"})
+        self.write(os.path.join(self.repo, "other", "d.json"), {"displayName": "d2"})
+        os.remove(os.path.join(self.filters, "b.json"))
+
+        changes = RepoChanges.from_git(self.path, "HEAD")
+
+        self.assertEqual(changes.files_in(self.filters), ["a.json", "e.json"])
+        self.assertEqual(changes.deleted_names(self.filters), {"b"})
+        self.assertTrue(changes.touches(self.filters))
+        self.assertFalse(changes.touches(self.scripts))
+        self.assertFalse(changes.touches(os.path.join(self.repo, "other")))
+
+    def test_nested_change_lists_all_files(self):
+        """A changed file in a subdirectory should compare all files."""
+
+        changes = RepoChanges([os.path.join(self.scripts, "Script Data", "s.ps1")])
+
+        self.assertIsNone(changes.files_in(self.scripts))
+        self.assertTrue(changes.touches(self.scripts))
+
+    def test_nested_deletion(self):
+        """Deleted files in a subdirectory should be found for the directory."""
+
+        intents = os.path.join(self.path, "Management Intents")
+        self.write(os.path.join(intents, "Template", "i.json"), {"displayName": "i"})
+        git(self.repo, "add", ".")
+        git(self.repo, "commit", "-q", "-m", "intents")
+        os.remove(os.path.join(intents, "Template", "i.json"))
+
+        changes = RepoChanges.from_git(self.path, "HEAD")
+
+        self.assertEqual(changes.deleted_names(intents), {"i"})
+        self.assertEqual(changes.deleted_names(intents + "s"), set())
+
+    def test_update_module(self):
+        """An update module should only list changed files and remove deleted ones."""
+
+        changes = RepoChanges(
+            [os.path.join(self.filters, "a.json")],
+            {os.path.join(self.filters, "z.json"): {"z"}},
+        )
+        module = BaseUpdateModule(path=self.filters, repo_changes=changes)
+        scripts = BaseUpdateModule(path=self.scripts, repo_changes=changes)
+        intune_data = [
+            {"id": "1", "displayName": "c"},
+            {"id": "2", "displayName": "z"},
+        ]
+
+        self.assertTrue(module.path_exists())
+        self.assertFalse(scripts.path_exists())
+        self.assertEqual(module.list_repo_files(), ["a.json"])
+        self.assertEqual(module.get_unmatched_data(intune_data), [intune_data[1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
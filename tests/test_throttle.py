@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the throttle governor.
+"""
+
+import threading
+import time
+import unittest
+
+from src.IntuneCD.intunecdlib.throttle import ThrottleGovernor
+
+
+class TestThrottleGovernor(unittest.TestCase):
+    """Test class for the ThrottleGovernor."""
+
+    def setUp(self):
+        self.governor = ThrottleGovernor(max_concurrency=8, min_concurrency=1)
+
+    def test_throttle_halves_limit(self):
+        """The limit should be halved when throttled, but not below the minimum."""
+
+        self.governor.on_throttle()
+        self.assertEqual(self.governor.limit, 4)
+
+        for _ in range(5):
+            self.governor._last_decrease = 0
+            self.governor.on_throttle()
+        self.assertEqual(self.governor.limit, 1)
+
+    def test_simultaneous_throttles_decrease_once(self):
+        """Throttles reported at the same time should only decrease the limit once."""
+
+        for _ in range(5):
+            self.governor.on_throttle()
+
+        self.assertEqual(self.governor.limit, 4)
+
+    def test_success_increases_limit(self):
+        """The limit should grow by one after a full window of successful requests."""
+
+        self.governor.on_throttle()
+        for _ in range(4):
+            self.governor.on_success()
+
+        self.assertEqual(self.governor.limit, 5)
+
+    def test_success_does_not_exceed_max(self):
+        """The limit should never grow above the maximum."""
+
+        for _ in range(100):
+            self.governor.on_success()
+
+        self.assertEqual(self.governor.limit, 8)
+
+    def test_retry_after_pauses_acquire(self):
+        """Acquire should wait for the Retry-After pause to end."""
+
+        self.governor.on_throttle(0.2)
+        start = time.monotonic()
+        with self.governor.slot():
+            pass
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_limit_caps_in_flight(self):
+        """No more requests than the limit should be in flight."""
+
+        governor = ThrottleGovernor(max_concurrency=2)
+        peak = []
+
+        def work():
+            with governor.slot():
+                peak.append(governor.in_flight)
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(governor.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
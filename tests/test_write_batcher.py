@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module tests the write batcher.
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+from src.IntuneCD.intunecdlib.BaseUpdateModule import BaseUpdateModule
+from src.IntuneCD.intunecdlib.write_batcher import WriteBatcher
+
+ENDPOINT = "https://graph.microsoft.com/beta/deviceManagement/objects/"
+
+
+class FakeBatch:
+    """Fake $batch endpoint, throttles the configured urls once."""
+
+    def __init__(self, throttle_urls: set = None, fail_urls: set = None):
+        self.throttle_urls = set(throttle_urls or [])
+        self.fail_urls = set(fail_urls or [])
+        self.batches = []
+
+    def __call__(self, batch):
+        self.batches.append(batch)
+        failed = set()
+        responses = []
+        for req in batch:
+            if req["url"] in self.throttle_urls:
+                self.throttle_urls.discard(req["url"])
+                failed.add(req["id"])
+                status = 429
+            elif req["url"] in self.fail_urls:
+                failed.add(req["id"])
+                status = 400
+            elif set(req.get("dependsOn", [])) & failed:
+                failed.add(req["id"])
+                status = 424
+            else:
+                status = 204
+            responses.append(
+                {
+                    "id": req["id"],
+                    "status": status,
+                    "headers": {},
+                    "body": {"error": {"message": "failed"}} if status >= 400 else {},
+                }
+            )
+        return responses
+
+
+class TestWriteBatcher(unittest.TestCase):
+    """Test class for WriteBatcher."""
+
+    def setUp(self):
+        self.module = BaseUpdateModule()
+        self.module.config_type = "Test"
+        self.batcher = WriteBatcher(self.module)
+        self.governor = patch(
+            "src.IntuneCD.intunecdlib.write_batcher.get_governor"
+        ).start()
+        self.statuses = {}
+
+    def tearDown(self):
+        patch.stopall()
+
+    def callback(self, key):
+        def on_response(status, body):
+            self.statuses[key] = status
+
+        return on_response
+
+    def test_writes_are_batched(self):
+        """Writes should be sent in batches of 20 and reported to their callback."""
+
+        fake = FakeBatch()
+        for i in range(45):
+            self.batcher.add(
+                "DELETE", ENDPOINT + str(i), on_response=self.callback(str(i))
+            )
+
+        with patch.object(self.module, "process_batch", side_effect=fake):
+            self.batcher.flush()
+
+        self.assertEqual([len(batch) for batch in fake.batches], [20, 20, 5])
+        self.assertEqual(fake.batches[0][0]["url"], "/deviceManagement/objects/0")
+        self.assertEqual(set(self.statuses.values()), {204})
+        self.assertEqual(len(self.statuses), 45)
+
+    def test_depends_on(self):
+        """A write should be sent in the same batch as the write it depends on."""
+
+        fake = FakeBatch()
+        for i in range(19):
+            self.batcher.add("DELETE", ENDPOINT + str(i))
+        update_id = self.batcher.add("PATCH", ENDPOINT + "a", {"displayName": "a"})
+        self.batcher.add(
+            "POST", ENDPOINT + "a/assign", {"assignments": []}, depends_on=update_id
+        )
+
+        with patch.object(self.module, "process_batch", side_effect=fake):
+            self.batcher.flush()
+
+        self.assertEqual([len(batch) for batch in fake.batches], [19, 2])
+        self.assertEqual(fake.batches[1][1]["dependsOn"], [str(update_id)])
+        self.assertEqual(fake.batches[1][0]["body"], {"displayName": "a"})
+
+    def test_throttled_writes_are_retried(self):
+        """Throttled writes and the writes depending on them should be retried."""
+
+        fake = FakeBatch(throttle_urls={"/deviceManagement/objects/a"})
+        update_id = self.batcher.add(
+            "PATCH", ENDPOINT + "a", {}, on_response=self.callback("update")
+        )
+        self.batcher.add(
+            "POST",
+            ENDPOINT + "a/assign",
+            {},
+            depends_on=update_id,
+            on_response=self.callback("assign"),
+        )
+
+        with patch.object(self.module, "process_batch", side_effect=fake):
+            self.batcher.flush()
+
+        self.assertEqual(len(fake.batches), 2)
+        self.assertEqual(self.statuses, {"update": 204, "assign": 204})
+        self.governor.return_value.on_throttle.assert_called_once()
+
+    def test_report_mode(self):
+        """Writes should not be queued in report mode."""
+
+        self.module.report = True
+
+        self.assertIsNone(self.batcher.add("DELETE", ENDPOINT + "1"))
+
+    def test_failed_write_marks_diffs(self):
+        """A failed update should be recorded on the diffs of the configuration."""
+
+        self.module.batch_writes = True
+        self.module.name = "Config"
+        self.module.diffs = [{"setting": "a", "new_val": "1", "old_val": "2"}]
+        fake = FakeBatch(fail_urls={"/deviceManagement/objects/1"})
+
+        self.module.update_downstream_data(ENDPOINT + "1", "patch", 200, {})
+        with patch.object(self.module, "process_batch", side_effect=fake):
+            self.module.write_batcher.flush()
+
+        self.assertEqual(self.module.diffs[0]["error"], "400 - failed")
+
+    def test_failed_assignment_and_removal_are_summarized(self):
+        """Failed assignments and removals should be added to the diff summary."""
+
+        self.module.name = "Config"
+        self.module.batch_writes = True
+        self.module.write_batcher.add(
+            "POST",
+            ENDPOINT + "1/assign",
+            {},
+            on_response=self.module._get_write_callback("assign", "Config"),
+        )
+        self.module.write_batcher.add(
+            "DELETE",
+            ENDPOINT + "2",
+            on_response=self.module._get_write_callback("remove", "Old"),
+        )
+        fake = FakeBatch(
+            fail_urls={
+                "/deviceManagement/objects/1/assign",
+                "/deviceManagement/objects/2",
+            }
+        )
+
+        with patch.object(self.module, "process_batch", side_effect=fake):
+            self.module.flush_writes()
+
+        self.assertEqual(
+            [
+                (summary["name"], summary["diffs"][0]["setting"])
+                for summary in self.module.diff_summary
+            ],
+            [("Config", "assign"), ("Old", "remove")],
+        )
+        self.assertEqual(
+            self.module.diff_summary[0]["diffs"][0]["error"], "400 - failed"
+        )
+        self.assertEqual(self.module.write_errors, [])
+
+    def test_failed_write_exits_on_error(self):
+        """A failed update should stop the run after the flush with EXIT_ON_ERROR."""
+
+        self.module.batch_writes = True
+        self.module.name = "Config"
+        self.module.update_downstream_data(ENDPOINT + "1", "patch", 200, {})
+        self.module.update_downstream_data(ENDPOINT + "2", "patch", 200, {})
+        fake = FakeBatch(fail_urls={"/deviceManagement/objects/1"})
+
+        with patch.dict(os.environ, {"EXIT_ON_ERROR": "True"}), patch.object(
+            self.module, "process_batch", side_effect=fake
+        ), self.assertRaises(SystemExit):
+            self.module.flush_writes()
+
+        self.assertEqual(len(fake.batches[0]), 2)
+
+    def test_failed_removal_does_not_exit(self):
+        """A failed removal should not stop the run, as before batching."""
+
+        self.module.write_batcher.add(
+            "DELETE",
+            ENDPOINT + "1",
+            on_response=self.module._get_write_callback("remove", "Old"),
+        )
+        fake = FakeBatch(fail_urls={"/deviceManagement/objects/1"})
+
+        with patch.dict(os.environ, {"EXIT_ON_ERROR": "True"}), patch.object(
+            self.module, "process_batch", side_effect=fake
+        ):
+            self.module.flush_writes()
+
+        self.assertEqual(len(self.module.diff_summary), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()